@@ -0,0 +1,39 @@
+import os
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from app.core.query_diagnostics import slow_query_log
+
+router = APIRouter()
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Admin endpoints are disabled unless ADMIN_API_TOKEN is set, and then require it."""
+    expected = os.getenv("ADMIN_API_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@router.get("/slow-queries", dependencies=[Depends(require_admin)])
+async def get_slow_queries():
+    """
+    Statements slower than SLOW_QUERY_THRESHOLD_MS, aggregated by statement and
+    ordered by total time, with their latest EXPLAIN plan and any sequential
+    scans; plus the most recent individual captures.
+    """
+    return {
+        "thresholdMs": slow_query_log.threshold_ms,
+        "explainSampleRate": slow_query_log.sample_rate,
+        "statements": slow_query_log.statements(),
+        "recent": slow_query_log.recent_queries(),
+    }
+
+
+@router.delete("/slow-queries", dependencies=[Depends(require_admin)])
+async def clear_slow_queries():
+    slow_query_log.clear()
+    return {"message": "Slow query log cleared"}
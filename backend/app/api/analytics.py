@@ -6,8 +6,6 @@ from app.models.db_models import JournalEntry as JournalEntryDB, EmotionCategory
 from datetime import datetime, timedelta
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
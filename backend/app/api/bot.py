@@ -1,49 +1,175 @@
-# from fastapi import APIRouter, HTTPException
-# from sqlalchemy.orm import Session
-# from app.database import get_db
-# from typing import List
-# from pydantic import BaseModel
-
-# router = APIRouter()
-
-# class Message(BaseModel):
-#     role: str
-#     content: str
-
-# class ChatRequest(BaseModel):
-#     messages: List[Message]
-
-# class ChatResponse(BaseModel):
-#     message: str
-
-# @router.post("", response_model=ChatResponse)
-# async def chat(
-#     request: ChatRequest,
-#     db: Session = Depends(get_db)
-# ):
-#     """
-#     AI-powered emotional support chat.
-
-#     Implementation Status: Frontend-only with OpenAI integration
-#     Priority: Low
-#     Requirements:
-#     - OpenAI API integration
-#     - Conversation history storage
-#     - Context management
-#     - Sentiment analysis
-#     - Rate limiting
-
-#     TODO:
-#     1. Implement OpenAI API integration
-#     2. Add conversation history storage
-#     3. Implement context management
-#     4. Add sentiment analysis
-#     5. Implement rate limiting
-#     """
-#     try:
-#         # TODO: Implement OpenAI integration
-#         return ChatResponse(
-#             message="I understand that presentations can be nerve-wracking. What specific aspects of the presentation are causing you the most anxiety?"
-#         )
-#     except Exception as e:
-#         raise HTTPException(status_code=500, detail=str(e))
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.database import get_db
+from app.core.ids import new_id
+from app.models.db_models import ChatSession, ChatMessage, User
+from app.schemas.chat import (
+    ChatSessionCreate,
+    ChatSessionResponse,
+    ChatMessageCreate,
+    ChatMessageResponse,
+    ChatReplyResponse
+)
+from app.core.llm import llm_client, LLMError, LLMUnavailableError
+from app.core.conversation import (
+    FEELORA_SYSTEM_PROMPT,
+    split_for_summary,
+    summarize_messages,
+    trim_to_token_window
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+def _session_response(session: ChatSession) -> ChatSessionResponse:
+    return ChatSessionResponse(
+        id=session.id,
+        userId=session.user_id,
+        summary=session.summary,
+        messageCount=session.message_count,
+        createdAt=session.created_at,
+        updatedAt=session.updated_at
+    )
+
+def _message_response(message: ChatMessage) -> ChatMessageResponse:
+    return ChatMessageResponse(
+        seq=message.seq,
+        role=message.role,
+        content=message.content,
+        createdAt=message.created_at
+    )
+
+def _get_session(db: Session, session_id: str, user_id: str) -> ChatSession:
+    # Another user's session is reported as missing rather than forbidden
+    session = db.query(ChatSession)\
+        .filter(ChatSession.id == session_id, ChatSession.user_id == user_id)\
+        .first()
+    if session is None:
+        raise HTTPException(status_code=404, detail="Chat session not found")
+    return session
+
+def _unsummarized_messages(db: Session, session: ChatSession, through: Optional[int] = None) -> List[ChatMessage]:
+    # Single range scan on (session_id, seq)
+    query = db.query(ChatMessage)\
+        .filter(ChatMessage.session_id == session.id, ChatMessage.seq > session.summarized_through)
+    if through is not None:
+        query = query.filter(ChatMessage.seq <= through)
+    return query.order_by(ChatMessage.seq).all()
+
+@router.post("/sessions", response_model=ChatSessionResponse)
+async def create_chat_session(request: ChatSessionCreate, db: Session = Depends(get_db)):
+    """
+    Start a new conversation with Feelora.
+    """
+    if db.query(User.id).filter(User.id == request.userId).first() is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    session = ChatSession(id=new_id(), user_id=request.userId, summarized_through=0, message_count=0)
+    db.add(session)
+    db.commit()
+    db.refresh(session)
+    return _session_response(session)
+
+@router.get("/sessions/{session_id}", response_model=ChatSessionResponse)
+async def get_chat_session(session_id: str, user_id: str, db: Session = Depends(get_db)):
+    return _session_response(_get_session(db, session_id, user_id))
+
+@router.get("/sessions/{session_id}/messages", response_model=List[ChatMessageResponse])
+async def get_chat_messages(
+    session_id: str,
+    user_id: str,
+    before: Optional[int] = Query(None, description="Return messages with seq lower than this (for paging back)"),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    """
+    Page through a session's message log, newest page first, oldest-to-newest within the page.
+    """
+    # Joined to the session so another user's session reads as empty, in one query
+    query = db.query(ChatMessage)\
+        .join(ChatSession, ChatMessage.session_id == ChatSession.id)\
+        .filter(ChatMessage.session_id == session_id, ChatSession.user_id == user_id)
+    if before is not None:
+        query = query.filter(ChatMessage.seq < before)
+    messages = query.order_by(ChatMessage.seq.desc()).limit(limit).all()
+    return [_message_response(m) for m in reversed(messages)]
+
+@router.post("/sessions/{session_id}/messages", response_model=ChatReplyResponse)
+async def send_chat_message(
+    session_id: str,
+    user_id: str,
+    request: ChatMessageCreate,
+    db: Session = Depends(get_db)
+):
+    """
+    Send one new user message and get Feelora's reply.
+
+    Only the new message is sent; the prompt is built from the session's
+    rolling summary plus the unsummarized tail of the log, so its size stays
+    bounded however long the session runs.
+    """
+    session = _get_session(db, session_id, user_id)
+    summary = session.summary
+    tail = [{"role": m.role, "content": m.content} for m in _unsummarized_messages(db, session)]
+    # End the read transaction so no connection is held while the LLM answers
+    db.rollback()
+    user_message = {"role": "user", "content": request.content}
+
+    prompt = [{"role": "system", "content": FEELORA_SYSTEM_PROMPT}]
+    if summary:
+        prompt.append({"role": "system", "content": f"Summary of the conversation so far: {summary}"})
+    prompt += trim_to_token_window(tail + [user_message])
+
+    try:
+        reply = await llm_client.chat(prompt, temperature=0.7, max_tokens=100)
+    except LLMUnavailableError as e:
+        logger.warning("Chat short-circuited: %s", e)
+        raise HTTPException(
+            status_code=503,
+            detail="Feelora is taking a short break. Please try again in a moment.",
+            headers={"Retry-After": str(int(llm_client.breaker.reset_timeout))}
+        )
+    except LLMError as e:
+        logger.error("Error generating chat reply: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to generate response")
+    reply = reply or "I'm sorry, I couldn't process that. Could we try again?"
+
+    # Assign sequence numbers under a row lock taken only after the upstream
+    # call, so concurrent sends to one session never collide on seq
+    session = db.query(ChatSession).filter(ChatSession.id == session_id)\
+        .with_for_update().populate_existing().one()
+    base = session.message_count
+    # Re-read the tail under the lock: every seq up to base is committed, so
+    # the fold below covers a contiguous range even if other sends got in first
+    summary, summarized_through = session.summary, session.summarized_through
+    tail_rows = _unsummarized_messages(db, session, through=base)
+    tail = [{"role": m.role, "content": m.content} for m in tail_rows]
+    tail_seqs = [m.seq for m in tail_rows]
+    stored_user = ChatMessage(session_id=session_id, seq=base + 1, role="user", content=request.content)
+    stored_reply = ChatMessage(session_id=session_id, seq=base + 2, role="assistant", content=reply)
+    db.add_all([stored_user, stored_reply])
+    session.message_count = base + 2
+    db.commit()
+    db.refresh(stored_reply)
+    reply_response = _message_response(stored_reply)
+    db.rollback()
+
+    # Fold the oldest turns into the summary once the tail outgrows the window
+    tail += [user_message, {"role": "assistant", "content": reply}]
+    tail_seqs += [base + 1, base + 2]
+    to_fold, _ = split_for_summary(tail)
+    if to_fold:
+        new_summary = await summarize_messages(summary, to_fold)
+        # Compare-and-set so a concurrent fold of the same range is not applied twice
+        db.execute(
+            update(ChatSession)
+            .where(ChatSession.id == session_id, ChatSession.summarized_through == summarized_through)
+            .values(summary=new_summary, summarized_through=tail_seqs[len(to_fold) - 1])
+        )
+        db.commit()
+
+    return ChatReplyResponse(sessionId=session_id, message=reply_response)
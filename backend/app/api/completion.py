@@ -1,18 +1,26 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from typing import List, Optional
-import openai
-import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+import logging
+from app.core.llm import llm_client, LLMUnavailableError
+from app.core.conversation import (
+    FEELORA_SYSTEM_PROMPT,
+    completion_cache,
+    completion_cache_key,
+    conversation_store,
+    trim_to_token_window
+)
+from app.core.result_cache import off_loop
 
-# Initialize OpenAI client
-openai.api_key = os.getenv("OPENAI_API_KEY")
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+COMPLETION_MODEL = "gpt-4o"  # Using GPT-4.5 Preview
+COMPLETION_TEMPERATURE = 0.7
+COMPLETION_MAX_TOKENS = 100  # Reduced from 500 to limit response length
+
+
 class Message(BaseModel):
     role: str = Field(..., example="user", description="The role of the message sender (user/assistant)")
     content: str = Field(..., example="I feel anxious about my presentation tomorrow", description="The content of the message")
@@ -23,10 +31,12 @@ class CompletionRequest(BaseModel):
             "role": "user",
             "content": "I feel anxious about my presentation tomorrow"
         }
-    ], description="List of messages in the conversation")
+    ], description="New messages in the conversation. When conversationId is set, send only the new turn")
+    conversationId: Optional[str] = Field(None, example="3f2b8c1e-7a4d-4e4b-9a55-2c1f0d6b9e10", description="Conversation to continue; omit to start a new one. Unknown or expired ids start a new conversation under a new id")
 
 class CompletionResponse(BaseModel):
     message: str = Field(..., example="I understand that presentations can be nerve-wracking. What specific aspects of the presentation are causing you the most anxiety?", description="The AI's response message")
+    conversationId: Optional[str] = Field(..., example="3f2b8c1e-7a4d-4e4b-9a55-2c1f0d6b9e10", description="Pass back on the next turn to continue the conversation. Null when the server keeps no history; send the whole conversation each turn then")
 
 @router.post(
     "/completion",
@@ -49,9 +59,16 @@ class CompletionResponse(BaseModel):
     Example Response:
     ```json
     {
-        "message": "I understand that presentations can be nerve-wracking. What specific aspects of the presentation are causing you the most anxiety?"
+        "message": "I understand that presentations can be nerve-wracking. What specific aspects of the presentation are causing you the most anxiety?",
+        "conversationId": "3f2b8c1e-7a4d-4e4b-9a55-2c1f0d6b9e10"
     }
     ```
+
+    To continue the conversation, send only the new user message together with
+    the returned `conversationId`; the server keeps the history and trims it to
+    a token window. A null `conversationId` means the server keeps no history
+    (several processes without a shared store); send the whole conversation on
+    every turn then. Identical conversations are answered from a short-lived cache.
     """
 )
 async def create_completion(request: CompletionRequest):
@@ -59,42 +76,47 @@ async def create_completion(request: CompletionRequest):
         if not request.messages:
             raise HTTPException(status_code=400, detail="Messages array is required")
 
-        # Add system message for Feelora's personality
-        messages = [
-            {
-                "role": "system",
-                "content": """You are Feelora, an empathetic AI companion focused on emotional well-being.
-
-                Your purpose is to:
-                - Help users understand and process their emotions
-                - Provide a safe, non-judgmental space for reflection
-                - Offer gentle guidance based on emotional intelligence principles
-                - Encourage healthy emotional expression and self-awareness
-
-                Guidelines:
-                - Be warm, compassionate, and conversational
-                - Ask thoughtful questions to deepen understanding
-                - Validate emotions without judgment
-                - Keep responses to 1-3 sentences maximum
-                - Focus on emotional awareness rather than problem-solving
-                - Never diagnose or provide medical/therapeutic advice
-                - If users are in crisis, gently suggest professional help
-
-                Remember that you're a supportive companion, not a therapist or medical professional."""
-            }
-        ] + [msg.dict() for msg in request.messages]
+        new_messages = [msg.dict() for msg in request.messages]
 
-        response = await openai.ChatCompletion.acreate(
-            model="gpt-4o",  # Using GPT-4.5 Preview
-            messages=messages,
-            temperature=0.7,
-            max_tokens=100  # Reduced from 500 to limit response length
+        # Clients holding a conversationId send only the new turn; the server
+        # keeps the history and trims it to the token window
+        conversation_id, history = await off_loop(
+            conversation_store.backend, conversation_store.load, request.conversationId
         )
+        history = trim_to_token_window(history + new_messages)
 
-        return CompletionResponse(
-            message=response.choices[0].message.content if response.choices else "I'm sorry, I couldn't process that. Could we try again?"
+        # Add system message for Feelora's personality
+        messages = [{"role": "system", "content": FEELORA_SYSTEM_PROMPT}] + history
+
+        cache_key = completion_cache_key(history, COMPLETION_MODEL, COMPLETION_TEMPERATURE, COMPLETION_MAX_TOKENS)
+        content = completion_cache.get(cache_key)
+        if content is None:
+            content = await llm_client.chat(
+                messages,
+                model=COMPLETION_MODEL,
+                temperature=COMPLETION_TEMPERATURE,
+                max_tokens=COMPLETION_MAX_TOKENS
+            )
+            if content:
+                completion_cache.set(cache_key, content)
+
+        message = content or "I'm sorry, I couldn't process that. Could we try again?"
+        await off_loop(
+            conversation_store.backend, conversation_store.save,
+            conversation_id, history + [{"role": "assistant", "content": message}],
         )
 
+        return CompletionResponse(message=message, conversationId=conversation_id)
+
+    except HTTPException:
+        raise
+    except LLMUnavailableError as e:
+        logger.warning("Completion short-circuited: %s", e)
+        raise HTTPException(
+            status_code=503,
+            detail="Feelora is taking a short break. Please try again in a moment.",
+            headers={"Retry-After": str(int(llm_client.breaker.reset_timeout))}
+        )
     except Exception as e:
-        print(f"Error in completion: {str(e)}")
+        logger.error("Error in completion: %s", e)
         raise HTTPException(status_code=500, detail="Failed to generate response")
@@ -1,25 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.models.db_models import EmotionCategory, SubEmotion
 from typing import List, Optional
-from app.schemas.emotion import EmotionCategoryResponse, SubEmotionResponse
+from app.schemas.emotion import EmotionCategoryResponse, SubEmotionResponse, EmotionCatalogResponse
+from app.core.catalog import taxonomy_catalog
+from app.core.http_cache import cached_json_response
 from fastapi import Depends
 
 
 router = APIRouter()
 
 @router.get("/categories", response_model=List[EmotionCategoryResponse])
-async def get_emotion_categories(db: Session = Depends(get_db)):
+async def get_emotion_categories(request: Request, db: Session = Depends(get_db)):
     try:
-        categories = db.query(EmotionCategory).all()
-        return categories
+        # Served from the precomputed catalog; conditional requests get a 304
+        # without touching the database once the catalog is loaded
+        taxonomy_catalog.ensure_loaded(db)
+        return cached_json_response(request, taxonomy_catalog.payload("categories"))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/catalog", response_model=EmotionCatalogResponse)
+async def get_emotion_catalog(request: Request, db: Session = Depends(get_db)):
+    """
+    Categories, sub-emotions and active prompts in one response, for clients
+    that load the whole taxonomy on start-up.
+    """
+    try:
+        taxonomy_catalog.ensure_loaded(db)
+        return cached_json_response(request, taxonomy_catalog.payload("catalog"))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/sub-emotions", response_model=List[SubEmotionResponse])
 
 async def get_sub_emotions(
+    request: Request,
     category: Optional[str] = Query(None, description="Filter by emotion category. Valid categories: happy, sad, angry, anxious, calm. Example sub-emotions by category:\n"
                                                     "- Happy: Joyful, Grateful, Excited, Content, Proud, Peaceful, Hopeful, Inspired, Loved, Cheerful\n"
                                                     "- Sad: Lonely, Disappointed, Hurt, Grief, Regretful, Hopeless, Melancholic, Empty, Heartbroken, Vulnerable\n"
@@ -30,10 +46,7 @@ async def get_sub_emotions(
 ):
 
     try:
-        query = db.query(SubEmotion)
-        if category:
-            query = query.join(EmotionCategory).filter(EmotionCategory.name == category)
-        sub_emotions = query.all()
-        return sub_emotions
+        taxonomy_catalog.ensure_loaded(db)
+        return cached_json_response(request, taxonomy_catalog.payload("sub-emotions", category))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,65 @@
+"""
+Liveness and readiness probes.
+
+``/health`` only proves the event loop answers; it never touches the
+database, so a database outage does not get healthy workers restarted.
+``/ready`` is what load balancers should route on: it fails until warm-up has
+finished, once shutdown has begun (so traffic drains away before the worker
+exits), and while the primary does not answer ``SELECT 1`` within
+``READY_DB_TIMEOUT_SECONDS``.
+"""
+import asyncio
+import os
+import time
+
+from fastapi import APIRouter
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+
+from app.core.serialization import ORJSONResponse
+from app.core.startup import readiness
+from app.database import engine
+
+router = APIRouter()
+
+READY_DB_TIMEOUT_SECONDS = float(os.getenv("READY_DB_TIMEOUT_SECONDS", "2"))
+
+
+def pool_status(engine: Engine) -> dict:
+    pool = engine.pool
+    stats = {}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        value = getattr(pool, name, None)
+        if callable(value):
+            stats[name] = value()
+    return stats
+
+
+def ping(engine: Engine) -> float:
+    started = time.perf_counter()
+    with engine.connect() as connection:
+        connection.exec_driver_sql("SELECT 1")
+    return (time.perf_counter() - started) * 1000
+
+
+async def check_database(engine: Engine, timeout: float) -> dict:
+    try:
+        latency_ms = await asyncio.wait_for(run_in_threadpool(ping, engine), timeout)
+    except Exception as e:
+        return {"ok": False, "error": repr(e), "pool": pool_status(engine)}
+    return {"ok": True, "latencyMs": round(latency_ms, 2), "pool": pool_status(engine)}
+
+
+@router.get("/health", include_in_schema=False)
+async def health():
+    return {"status": "ok"}
+
+
+@router.get("/ready", include_in_schema=False)
+async def ready():
+    if not readiness.accepting:
+        status = "draining" if readiness.draining else "starting"
+        return ORJSONResponse({"status": status}, status_code=503)
+    database = await check_database(engine, READY_DB_TIMEOUT_SECONDS)
+    body = {"status": "ready" if database["ok"] else "unavailable", "database": database}
+    return ORJSONResponse(body, status_code=200 if database["ok"] else 503)
@@ -0,0 +1,47 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.conversation import completion_cache
+from app.core.llm import llm_client
+from app.core.metrics import metrics_registry
+from app.core.result_cache import result_cache
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LLM_COUNTERS = {"calls", "successes", "failures", "retries", "timeouts", "short_circuits", "latency_seconds_total"}
+
+
+def llm_samples():
+    for name, value in llm_client.metrics.snapshot().items():
+        kind = "counter" if name in LLM_COUNTERS else "gauge"
+        yield f"llm_{name}", kind, f"Upstream LLM {name.replace('_', ' ')}.", value
+    yield "llm_circuit_open", "gauge", "1 while the LLM circuit breaker is open.", int(llm_client.breaker.state == llm_client.breaker.OPEN)
+
+
+def completion_cache_samples():
+    for name, value in completion_cache.stats().items():
+        kind = "counter" if name in ("hits", "misses", "evictions") else "gauge"
+        yield f"completion_cache_{name}", kind, f"Completion cache {name.replace('_', ' ')}.", value
+
+
+def result_cache_samples():
+    for name, value in result_cache.stats().items():
+        kind = "counter" if name in ("hits", "misses", "invalidations", "errors") else "gauge"
+        yield f"result_cache_{name}", kind, f"Per-user result cache {name.replace('_', ' ')}.", value
+
+
+metrics_registry.add_collector(llm_samples)
+metrics_registry.add_collector(completion_cache_samples)
+metrics_registry.add_collector(result_cache_samples)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    """
+    Request latency, SQL count and SQL time histograms per route, plus LLM,
+    completion cache and result cache counters, in the Prometheus text
+    exposition format.
+    """
+    return PlainTextResponse(metrics_registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.models.db_models import Prompt, EmotionCategory
 from typing import List, Optional
 from app.schemas.prompt import PromptResponse
+from app.core.prompt_index import prompt_index, recent_prompt_texts
+from app.core.catalog import taxonomy_catalog
+from app.core.http_cache import cached_json_response
 from fastapi import Depends
 
 router = APIRouter()
@@ -11,15 +13,32 @@ router = APIRouter()
 @router.get("", response_model=List[PromptResponse])
 
 async def get_prompts(
+    request: Request,
     category: Optional[str] = Query(None, description="Filter by emotion category"),
     db: Session = Depends(get_db)
 ):
 
     try:
-        query = db.query(Prompt)
-        if category:
-            query = query.join(EmotionCategory).filter(EmotionCategory.name == category)
-        prompts = query.all()
-        return prompts
+        taxonomy_catalog.ensure_loaded(db)
+        return cached_json_response(request, taxonomy_catalog.payload("prompts", category))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/next", response_model=PromptResponse)
+async def get_next_prompt(
+    category: Optional[str] = Query(None, description="Emotion category to draw from"),
+    user_id: Optional[str] = Query(None, description="Avoid prompts this user answered recently"),
+    db: Session = Depends(get_db)
+):
+    """
+    Serve one random active prompt, avoiding ones the user answered in their latest entries.
+    """
+    try:
+        prompt_index.ensure_loaded(db)
+        recent = recent_prompt_texts(db, user_id) if user_id else set()
+        prompt = prompt_index.pick(category, recent)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if prompt is None:
+        raise HTTPException(status_code=404, detail="No active prompts found")
+    return prompt
@@ -1,21 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, sessionmaker
 from app.database import get_db
-from app.models.db_models import User as UserDB
-from app.schemas.user import UserCreate, UserResponse, UserUpdate
-import bcrypt
+from app.core.ids import new_id
+from app.models.db_models import User as UserDB, UserErasure
+from app.schemas.user import UserCreate, UserErasureResponse, UserResponse, UserUpdate
+from app.services import erasure_service
 import logging
 import time
-import uuid
 from datetime import datetime
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 def get_password_hash(password: str) -> str:
+    import bcrypt  # deferred: only account writes need it
+
     # Use a lower number of rounds for testing
     return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=4)).decode('utf-8')
 
@@ -37,7 +37,7 @@ async def create_user(
 
         # Create new user
         db_user = UserDB(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             email=user.email,
             username=user.username,
             hashed_password=get_password_hash(user.password),
@@ -90,18 +90,47 @@ async def update_user(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.delete("/{user_id}")
+def _erasure_response(user_id: str, erasure: UserErasure) -> UserErasureResponse:
+    return UserErasureResponse(
+        user_id=user_id,
+        status=erasure.status,
+        deleted=erasure.deleted or {},
+        images_removed=erasure.images_removed,
+        error=erasure.error,
+        requested_at=erasure.requested_at,
+        finished_at=erasure.finished_at,
+        status_url=f"/api/users/{user_id}/erasure",
+    )
+
+@router.delete("/{user_id}", status_code=202, response_model=UserErasureResponse)
 async def delete_user(
     user_id: str,
     db: Session = Depends(get_db)
 ):
+    """
+    Queue the erasure of the user and everything they wrote, and start it in
+    the background. Poll the returned ``statusUrl`` for progress.
+    """
     try:
         db_user = db.query(UserDB).filter(UserDB.id == user_id).first()
-        if not db_user:
+        if not db_user and db.get(UserErasure, user_id) is None:
             raise HTTPException(status_code=404, detail="User not found")
 
-        db.delete(db_user)
-        db.commit()
-        return {"message": "User deleted successfully"}
+        erasure = erasure_service.request_erasure(db, user_id)
+        if erasure.status != erasure_service.DONE:
+            erasure_service.start_erasure(sessionmaker(bind=db.get_bind()), user_id)
+        return _erasure_response(user_id, erasure)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/{user_id}/erasure", response_model=UserErasureResponse)
+async def get_erasure(
+    user_id: str,
+    db: Session = Depends(get_db)
+):
+    erasure = db.get(UserErasure, user_id)
+    if erasure is None:
+        raise HTTPException(status_code=404, detail="No erasure requested for this user")
+    return _erasure_response(user_id, erasure)
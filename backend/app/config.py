@@ -1,14 +1,22 @@
-from pydantic_settings import BaseSettings
-from typing import List
-import os
-from dotenv import load_dotenv
+"""
+Process settings, loaded once.
+
+``.env`` is read here and nowhere else, before any other ``app`` module reads
+``os.environ``: ``app.main`` and ``app.database`` import this module first.
+Use ``get_settings()`` (cached) rather than building ``Settings`` yourself.
+"""
+from functools import lru_cache
 from pathlib import Path
+from typing import List, Optional
+
+from dotenv import load_dotenv
+from pydantic_settings import BaseSettings
 
 BASE_DIR = Path(__file__).resolve().parents[2]
 load_dotenv(dotenv_path=BASE_DIR / ".env")
-
 load_dotenv()
 
+
 class Settings(BaseSettings):
     # API Settings
     API_V1_STR: str = "/api"
@@ -17,8 +25,23 @@ class Settings(BaseSettings):
     # CORS
     CORS_ORIGINS: List[str] = ["*"]  # Allow all origins in production
 
-    DATABASE_URL: str = os.environ["DATABASE_URL"]
-    SECRET_KEY: str = os.environ["SECRET_KEY"]
+    DATABASE_URL: str
+    DATABASE_SCHEMA: str = "feel-write"
+    # Connection pool (PostgreSQL); DB_POOL_WARM_CONNECTIONS are opened at startup
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_WARM_CONNECTIONS: int = 2
+    # Connections this deployment may hold on each database (max_connections minus
+    # reserved and other clients); shared by WEB_CONCURRENCY workers on APP_INSTANCES hosts
+    DB_MAX_CONNECTIONS: Optional[int] = None
+    WEB_CONCURRENCY: int = 1
+    APP_INSTANCES: int = 1
+    # Comma-separated read replica URLs for read-only handlers; empty = primary only
+    DATABASE_REPLICA_URLS: str = ""
+    # How long a writer's reads stay on the primary (read-your-writes)
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    SECRET_KEY: Optional[str] = None
 
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
@@ -26,4 +49,10 @@ class Settings(BaseSettings):
     class Config:
         case_sensitive = True
 
-settings = Settings()
+
+@lru_cache
+def get_settings() -> Settings:
+    return Settings()
+
+
+settings = get_settings()
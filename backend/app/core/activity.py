@@ -0,0 +1,67 @@
+"""
+Per-user-year activity bitmaps for calendar heatmaps.
+
+A year of activity is one integer with bit ``i`` set when the user wrote an
+entry on day ``i + 1`` of the year (local to their timezone), stored as
+``YEAR_BYTES`` little-endian bytes. Counts and runs are bitwise operations on
+that integer rather than grouping entries by date.
+"""
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Set
+
+YEAR_DAYS = 366
+YEAR_BYTES = (YEAR_DAYS + 7) // 8
+
+
+def day_bit(day: date) -> int:
+    return 1 << (day.timetuple().tm_yday - 1)
+
+
+def to_bytes(bits: int) -> bytes:
+    return bits.to_bytes(YEAR_BYTES, "little")
+
+
+def from_bytes(data) -> int:
+    return int.from_bytes(data or b"", "little")
+
+
+def year_bitmaps(days: Iterable[date]) -> Dict[int, int]:
+    """Bitmaps keyed by year for a set of active days."""
+    years: Dict[int, int] = {}
+    for day in days:
+        years[day.year] = years.get(day.year, 0) | day_bit(day)
+    return years
+
+
+def active_count(bits: int) -> int:
+    return bits.bit_count()
+
+
+def longest_run(bits: int) -> int:
+    """Longest run of consecutive set bits: each ``bits & bits >> 1`` shortens every run by one."""
+    length = 0
+    while bits:
+        bits &= bits >> 1
+        length += 1
+    return length
+
+
+def active_dates(year: int, bits: int) -> List[date]:
+    """The days set in ``bits``, in order."""
+    first = date(year, 1, 1)
+    dates = []
+    while bits:
+        low = bits & -bits
+        dates.append(first + timedelta(days=low.bit_length() - 1))
+        bits ^= low
+    return dates
+
+
+def days_between(years: Dict[int, int], start: date, end: date) -> Set[date]:
+    """Active days in ``[start, end]`` from bitmaps keyed by year."""
+    return {
+        day
+        for year, bits in years.items()
+        for day in active_dates(year, bits)
+        if start <= day <= end
+    }
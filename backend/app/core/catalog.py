@@ -0,0 +1,101 @@
+"""
+Precomputed emotion taxonomy: categories, sub-emotions and active prompts.
+
+The taxonomy is seed data, so every representation the catalog endpoints
+serve is serialized once per load and stored as bytes together with a strong
+ETag. The taxonomy version is a content hash, so reloading unchanged data
+keeps every ETag stable and clients keep getting 304s.
+"""
+import hashlib
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.http_cache import StaticPayload
+from app.core.prompt_index import prompt_index
+from app.core.serialization import dumps
+from app.models.db_models import EmotionCategory, SubEmotion
+from app.schemas.emotion import EmotionCategoryResponse, SubEmotionResponse
+
+
+class TaxonomyCatalog:
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self.version: Optional[str] = None
+        self._payloads: Dict[Tuple[str, Optional[str]], StaticPayload] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    def invalidate(self):
+        """Force a reload on next access; call after changing taxonomy rows."""
+        with self._lock:
+            self._loaded_at = None
+        prompt_index.invalidate()
+
+    def ensure_loaded(self, db: Session):
+        if self.is_loaded:
+            return
+        with self._lock:
+            if self.is_loaded:
+                return
+            self._load(db)
+
+    def _load(self, db: Session):
+        categories = db.query(EmotionCategory).order_by(EmotionCategory.id).all()
+        sub_emotions = db.query(SubEmotion).order_by(SubEmotion.id).all()
+        prompt_index.ensure_loaded(db)
+
+        category_names = {c.id: c.name for c in categories}
+        categories_json = [EmotionCategoryResponse.model_validate(c).model_dump(mode="json") for c in categories]
+        sub_emotions_json: Dict[Optional[str], List[dict]] = {None: []}
+        for sub_emotion in sub_emotions:
+            item = SubEmotionResponse.model_validate(sub_emotion).model_dump(mode="json")
+            sub_emotions_json[None].append(item)
+            name = category_names.get(sub_emotion.category_id)
+            if name:
+                sub_emotions_json.setdefault(name, []).append(item)
+        prompt_categories = [None] + [c.name for c in categories]
+        prompts_json = {
+            name: [p.model_dump(mode="json") for p in prompt_index.prompts(name)]
+            for name in prompt_categories
+        }
+
+        bundle = {
+            "categories": categories_json,
+            "subEmotions": sub_emotions_json[None],
+            "prompts": prompts_json[None],
+        }
+        version = hashlib.sha256(dumps(bundle)).hexdigest()[:16]
+
+        payloads = {}
+
+        def add(resource: str, category: Optional[str], value):
+            payloads[(resource, category)] = StaticPayload(f'"{version}-{resource}-{category or "all"}"', dumps(value))
+
+        add("categories", None, categories_json)
+        for name, items in sub_emotions_json.items():
+            add("sub-emotions", name, items)
+        for name, items in prompts_json.items():
+            add("prompts", name, items)
+        add("catalog", None, {"version": version, **bundle})
+
+        self._payloads = payloads
+        self.version = version
+        self._loaded_at = time.monotonic()
+
+    def payload(self, resource: str, category: Optional[str] = None) -> StaticPayload:
+        found = self._payloads.get((resource, category))
+        if found is None:
+            # Unknown category: an empty list, still versioned with the taxonomy
+            found = StaticPayload(f'"{self.version}-{resource}-none"', b"[]")
+        return found
+
+
+taxonomy_catalog = TaxonomyCatalog(ttl=float(os.getenv("TAXONOMY_CACHE_TTL_SECONDS", "300")))
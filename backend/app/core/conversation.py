@@ -0,0 +1,194 @@
+"""
+Conversation helpers for the Feelora companion: server-side history storage,
+token-window trimming, rolling summaries and completion cache keys.
+"""
+import hashlib
+import json
+import logging
+import os
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from app.core.cache import TTLCache
+from app.core.llm import llm_client, LLMError
+from app.core.result_cache import CacheBackend, InMemoryCacheBackend, RedisCacheBackend, serving_processes
+
+logger = logging.getLogger(__name__)
+
+Message = Dict[str, str]
+
+FEELORA_SYSTEM_PROMPT = """You are Feelora, an empathetic AI companion focused on emotional well-being.
+
+Your purpose is to:
+- Help users understand and process their emotions
+- Provide a safe, non-judgmental space for reflection
+- Offer gentle guidance based on emotional intelligence principles
+- Encourage healthy emotional expression and self-awareness
+
+Guidelines:
+- Be warm, compassionate, and conversational
+- Ask thoughtful questions to deepen understanding
+- Validate emotions without judgment
+- Keep responses to 1-3 sentences maximum
+- Focus on emotional awareness rather than problem-solving
+- Never diagnose or provide medical/therapeutic advice
+- If users are in crisis, gently suggest professional help
+
+Remember that you're a supportive companion, not a therapist or medical professional."""
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You maintain a running summary of a supportive conversation between a user and Feelora. "
+    "Merge the previous summary with the new messages into at most five sentences. "
+    "Keep the user's feelings, key events and anything Feelora promised to follow up on."
+)
+
+# Rough OpenAI tokenizer ratio for English text; good enough for budgeting
+CHARS_PER_TOKEN = 4
+# Per-message overhead the chat format adds around role/content
+MESSAGE_TOKEN_OVERHEAD = 4
+
+HISTORY_TOKEN_WINDOW = int(os.getenv("COMPLETION_HISTORY_TOKENS", "1500"))
+# Upper bound on the rolling summary so prompts stay constant-size
+SUMMARY_MAX_CHARS = 1200
+
+
+def estimate_tokens(message: Message) -> int:
+    return len(message.get("content", "")) // CHARS_PER_TOKEN + MESSAGE_TOKEN_OVERHEAD
+
+
+def normalize_messages(messages: List[Message]) -> List[Message]:
+    """Lower-case roles and collapse whitespace so equivalent turns compare equal."""
+    return [
+        {"role": m["role"].strip().lower(), "content": " ".join(m["content"].split())}
+        for m in messages
+    ]
+
+
+def trim_to_token_window(messages: List[Message], max_tokens: Optional[int] = None) -> List[Message]:
+    """
+    Keep the most recent messages that fit in ``max_tokens`` (default
+    ``HISTORY_TOKEN_WINDOW``).
+
+    The newest message is always kept, even if it alone exceeds the budget.
+    """
+    if max_tokens is None:
+        max_tokens = HISTORY_TOKEN_WINDOW
+    kept: List[Message] = []
+    used = 0
+    for message in reversed(messages):
+        cost = estimate_tokens(message)
+        if kept and used + cost > max_tokens:
+            break
+        kept.append(message)
+        used += cost
+    kept.reverse()
+    return kept
+
+
+def split_for_summary(messages: List[Message], max_tokens: Optional[int] = None) -> Tuple[List[Message], List[Message]]:
+    """
+    Split ``messages`` into ``(to_fold, to_keep)`` once they exceed ``max_tokens``.
+
+    The oldest messages are folded until the rest fit in half the window, so
+    summarization runs once per half-window of new conversation rather than
+    on every turn.
+    """
+    if max_tokens is None:
+        max_tokens = HISTORY_TOKEN_WINDOW
+    if sum(estimate_tokens(m) for m in messages) <= max_tokens:
+        return [], messages
+    keep = trim_to_token_window(messages, max_tokens // 2)
+    return messages[:len(messages) - len(keep)], keep
+
+
+async def summarize_messages(previous_summary: Optional[str], messages: List[Message]) -> str:
+    """Fold ``messages`` into ``previous_summary``, falling back to an extract if the LLM fails."""
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+    try:
+        summary = await llm_client.chat(
+            [
+                {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                {"role": "user", "content": f"Previous summary:\n{previous_summary or '(none)'}\n\nNew messages:\n{transcript}"}
+            ],
+            model="gpt-3.5-turbo",
+            temperature=0.3,
+            max_tokens=200
+        )
+    except LLMError as e:
+        logger.warning("Summarization failed, using extractive fallback: %s", e)
+        said = " ".join(m["content"] for m in messages if m["role"] == "user")
+        summary = f"{previous_summary or ''} The user shared: {said}".strip()
+    # Keep the most recent part if the summary outgrows its budget
+    return summary[-SUMMARY_MAX_CHARS:]
+
+
+def completion_cache_key(messages: List[Message], model: str, temperature: float, max_tokens: int) -> str:
+    payload = json.dumps(
+        {"m": normalize_messages(messages), "model": model, "t": temperature, "n": max_tokens},
+        separators=(",", ":"),
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ConversationStore:
+    """
+    Conversation history keyed by conversation id, in a ``CacheBackend``.
+
+    Idle conversations expire after ``ttl`` seconds. Without a backend
+    (several processes and no Redis, where a turn may land on a process that
+    never saw the conversation) no history is kept and no id is handed out,
+    so clients send the whole conversation instead of losing it.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend], ttl: float = 3600.0):
+        self.backend = backend
+        self.ttl = ttl
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def load(self, conversation_id: Optional[str]) -> Tuple[Optional[str], List[Message]]:
+        """
+        Return ``(conversation_id, history)``. An unknown or expired id starts
+        a new conversation under a fresh random id: the id is all it takes to
+        read a history, so it is never one the client chose. The id is None
+        when the store is disabled.
+        """
+        if not self.enabled:
+            return None, []
+        if conversation_id:
+            history = self.backend.get(f"conversation:{conversation_id}")
+            if history is not None:
+                return conversation_id, json.loads(history)
+        return str(uuid.uuid4()), []
+
+    def save(self, conversation_id: Optional[str], history: List[Message]):
+        if self.enabled and conversation_id:
+            self.backend.set(f"conversation:{conversation_id}", json.dumps(history).encode("utf-8"), self.ttl)
+
+
+def create_conversation_backend() -> Optional[CacheBackend]:
+    redis_url = os.getenv("CONVERSATION_REDIS_URL")
+    if redis_url:
+        return RedisCacheBackend.from_url(redis_url, prefix="")
+    processes = serving_processes()
+    if processes > 1:
+        logger.info("Server-side conversation history disabled: %d processes and no CONVERSATION_REDIS_URL", processes)
+        return None
+    return InMemoryCacheBackend(
+        max_entries=int(os.getenv("CONVERSATION_ENTRIES", "10000")),
+        max_bytes=int(os.getenv("CONVERSATION_BYTES", str(32 * 1024 * 1024))),
+    )
+
+
+completion_cache = TTLCache(
+    max_entries=int(os.getenv("COMPLETION_CACHE_ENTRIES", "2048")),
+    max_bytes=int(os.getenv("COMPLETION_CACHE_BYTES", str(4 * 1024 * 1024))),
+    ttl=float(os.getenv("COMPLETION_CACHE_TTL_SECONDS", "600")),
+)
+
+conversation_store = ConversationStore(
+    create_conversation_backend(), ttl=float(os.getenv("CONVERSATION_TTL_SECONDS", "3600"))
+)
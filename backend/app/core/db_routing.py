@@ -0,0 +1,166 @@
+"""
+Read-replica routing with read-your-writes.
+
+Read-only handlers take their session from ``app.database.get_read_db``,
+which hands out replica sessions round-robin. A reader who wrote in the last
+``READ_YOUR_WRITES_SECONDS`` stays on the primary, so replication lag never
+hides their own writes. That is checked two ways:
+
+- by user: ``RecentWrites`` remembers, per process, the user ids touched by
+  each committed transaction, and matches the handler's ``user_id``;
+- by client: ``ReadYourWritesMiddleware`` sets a short-lived cookie on
+  responses to requests that committed a write, which carries the pin to
+  other workers.
+
+Without replica URLs every session is the primary one.
+"""
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, Optional, Sequence, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.ids import to_uuid
+
+PRIMARY_COOKIE = "db_primary_until"
+
+
+class RecentWrites:
+    """
+    User ids that committed a write within the last ``window`` seconds, in
+    their stored uuid form, so ``user-1`` and its uuid match.
+    """
+
+    def __init__(self, window: float, clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self.clock = clock
+        self._until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, user_ids: Iterable[str]):
+        until = self.clock() + self.window
+        with self._lock:
+            for user_id in user_ids:
+                self._until[to_uuid(str(user_id)).hex] = until
+            # Stale entries go on writes, so the map stays bounded by recent writers
+            if len(self._until) > 1024:
+                now = self.clock()
+                self._until = {k: v for k, v in self._until.items() if v > now}
+
+    def wrote_recently(self, user_id: str) -> bool:
+        return self._until.get(to_uuid(str(user_id)).hex, 0.0) > self.clock()
+
+
+class ReplicaRouter:
+    def __init__(self, replicas: Sequence[Callable[[], Session]], recent_writes: RecentWrites):
+        self.replicas = list(replicas)
+        self.recent_writes = recent_writes
+        self._turn = itertools.count()
+
+    def use_primary(self, user_id: Optional[str], primary_until: Optional[str] = None) -> bool:
+        if not self.replicas:
+            return True
+        if user_id and self.recent_writes.wrote_recently(user_id):
+            return True
+        try:
+            return float(primary_until or 0) > time.time()
+        except ValueError:
+            return False
+
+    def replica_session(self) -> Session:
+        session = self.replicas[next(self._turn) % len(self.replicas)]()
+        session.info["replica"] = True
+        return session
+
+
+def is_replica(session: Session) -> bool:
+    """Whether ``session`` reads from a replica, which may lag behind recent writes."""
+    return session.info.get("replica", False)
+
+
+class _RequestWrites:
+    __slots__ = ("committed",)
+
+    def __init__(self):
+        self.committed = False
+
+
+# Shared by reference with threadpool workers, which run in a copy of the context
+_current_request_writes: ContextVar[Optional[_RequestWrites]] = ContextVar("current_request_writes", default=None)
+
+
+def note_request_write():
+    """Mark the current request as having committed a write, if there is one."""
+    writes = _current_request_writes.get()
+    if writes is not None:
+        writes.committed = True
+
+
+def _written_user_id(instance):
+    # Rows carry their owner in user_id; a users row is its own owner
+    if getattr(instance, "__tablename__", None) == "users":
+        return instance.id
+    return getattr(instance, "user_id", None)
+
+
+def install_write_tracking(session_factory: sessionmaker, recent_writes: RecentWrites,
+                           on_commit: Optional[Callable[[Set[str]], None]] = None):
+    """
+    Record the users each committed transaction of ``session_factory`` wrote
+    for, and pass them to ``on_commit`` if given.
+    """
+
+    @event.listens_for(session_factory, "before_flush")
+    def collect_written_users(session, flush_context, instances):
+        written = session.info.setdefault("written_user_ids", set())
+        for instance in itertools.chain(session.new, session.dirty, session.deleted):
+            user_id = _written_user_id(instance)
+            if user_id is not None:
+                written.add(user_id)
+
+    @event.listens_for(session_factory, "after_commit")
+    def pin_writers_to_primary(session):
+        written = session.info.pop("written_user_ids", None)
+        if written:
+            recent_writes.mark(written)
+            note_request_write()
+            if on_commit is not None:
+                on_commit(written)
+
+    @event.listens_for(session_factory, "after_rollback")
+    def forget_rolled_back_writes(session):
+        session.info.pop("written_user_ids", None)
+
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware pinning a client to the primary for ``window`` seconds after it writes."""
+
+    def __init__(self, app, window: float, enabled: bool = True):
+        self.app = app
+        self.window = window
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        writes = _RequestWrites()
+        token = _current_request_writes.set(writes)
+
+        async def pin_send(message):
+            if message["type"] == "http.response.start" and writes.committed:
+                cookie = (
+                    f"{PRIMARY_COOKIE}={time.time() + self.window:.3f}; Max-Age={int(self.window) + 1}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"set-cookie", cookie.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, pin_send)
+        finally:
+            _current_request_writes.reset(token)
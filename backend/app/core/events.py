@@ -0,0 +1,43 @@
+"""
+In-process domain events.
+
+Code that commits a change publishes what happened once the transaction is
+committed; subscribers (such as the result cache) react without the writer
+knowing about them. Handlers run synchronously in the publisher's thread, and
+a failing handler is logged without affecting the others or the publisher.
+"""
+import logging
+from collections import defaultdict
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Payload: user_id, entry_id
+JOURNAL_ENTRY_CREATED = "journal_entry.created"
+JOURNAL_ENTRY_UPDATED = "journal_entry.updated"
+# Payload: user_id
+USER_DELETED = "user.deleted"
+
+Handler = Callable[..., Any]
+
+
+class EventBus:
+    def __init__(self):
+        self._handlers: Dict[str, List[Handler]] = defaultdict(list)
+
+    def subscribe(self, event: str, handler: Handler):
+        self._handlers[event].append(handler)
+
+    def unsubscribe(self, event: str, handler: Handler):
+        if handler in self._handlers.get(event, ()):
+            self._handlers[event].remove(handler)
+
+    def publish(self, event: str, **payload: Any):
+        for handler in list(self._handlers.get(event, ())):
+            try:
+                handler(**payload)
+            except Exception:
+                logger.exception("Handler %r for event %s failed", handler, event)
+
+
+event_bus = EventBus()
@@ -0,0 +1,79 @@
+"""
+HTTP caching helpers: ETag validation and Cache-Control for static JSON payloads.
+"""
+from typing import Dict, Iterable, Optional
+
+from fastapi import Request, Response
+
+from app.core.serialization import choose_encoding, precompress
+
+CATALOG_CACHE_CONTROL = "public, max-age=300, stale-while-revalidate=86400"
+
+
+class StaticPayload:
+    """
+    A pre-serialized JSON body with its strong ETag and pre-compressed variants.
+
+    Each content-coding is a different representation, so compressed variants
+    get their own ETag (``"<etag>-gzip"``, ``"<etag>-br"``).
+    """
+
+    __slots__ = ("etag", "variants")
+
+    def __init__(self, etag: str, body: bytes):
+        self.etag = etag
+        self.variants: Dict[str, bytes] = precompress(body)
+
+    @property
+    def body(self) -> bytes:
+        return self.variants["identity"]
+
+    def etag_for(self, encoding: str) -> str:
+        if encoding == "identity":
+            return self.etag
+        return f'{self.etag[:-1]}-{encoding}"'
+
+    def all_etags(self) -> Iterable[str]:
+        return [self.etag_for(encoding) for encoding in self.variants]
+
+
+def etag_matches(if_none_match: Optional[str], etags: Iterable[str]) -> bool:
+    """Weak comparison as required for If-None-Match (RFC 9110, 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = {etag[2:] if etag.startswith("W/") else etag for etag in etags}
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in opaque:
+            return True
+    return False
+
+
+def cached_json_response(
+    request: Request,
+    payload: StaticPayload,
+    cache_control: str = CATALOG_CACHE_CONTROL,
+) -> Response:
+    """
+    Serve a static payload with validators, or 304 when the client copy is current.
+
+    Picks a pre-compressed variant matching Accept-Encoding, so nothing is
+    serialized or compressed per request.
+    """
+    encoding = choose_encoding(request.headers.get("accept-encoding"))
+    if encoding not in payload.variants:
+        encoding = "identity"
+    headers = {
+        "ETag": payload.etag_for(encoding),
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(request.headers.get("if-none-match"), payload.all_etags()):
+        return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=payload.variants[encoding], media_type="application/json", headers=headers)
@@ -0,0 +1,88 @@
+"""
+Row ids: strings at the API boundary, native ``uuid`` in the database.
+
+New ids are UUIDv7: a millisecond timestamp followed by random bits, so rows
+inserted close together land next to each other in primary-key B-trees
+instead of on random pages. Ids that are not UUIDs at all (seed data such as
+``user-1``) map to ``md5(id)::uuid``, the same conversion migration
+``0006_native_uuid_keys`` applied to existing rows, so they keep working.
+That migration also kept each original value in ``legacy_ids``, and
+``to_api_id`` turns the stored uuid back into it, so clients get ``user-1``
+back rather than its hash.
+"""
+import hashlib
+import os
+import re
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, Union
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# What both uuid.UUID() and PostgreSQL's uuid input accept, and migration 0006 casts
+UUID_PATTERN = "^[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}$"
+_UUID = re.compile(UUID_PATTERN)
+
+
+def uuid7() -> uuid.UUID:
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & (1 << 48) - 1) << 80 | int.from_bytes(os.urandom(10), "big")
+    # Version 7 in bits 76-79, RFC 4122 variant in bits 62-63
+    value = value & ~(0xF << 76) | 0x7 << 76
+    value = value & ~(0x3 << 62) | 0x2 << 62
+    return uuid.UUID(int=value)
+
+
+def new_id() -> str:
+    return str(uuid7())
+
+
+def to_uuid(value: Union[str, uuid.UUID]) -> uuid.UUID:
+    if isinstance(value, uuid.UUID):
+        return value
+    if _UUID.fullmatch(value):
+        return uuid.UUID(value)
+    return uuid.UUID(hashlib.md5(value.encode("utf-8")).hexdigest())
+
+
+class LegacyIds:
+    """
+    Original values of the non-UUID ids in the database, by the uuid they are
+    stored as. New ids are always UUIDs, so the table only changes when
+    migration 0006 runs and is read once per process.
+    """
+
+    def __init__(self):
+        self._originals: Dict[uuid.UUID, str] = {}
+        self.loaded = False
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Read the table again on next access."""
+        with self._lock:
+            self.loaded = False
+
+    def ensure_loaded(self, db: Session):
+        if self.loaded:
+            return
+        with self._lock:
+            if self.loaded:
+                return
+            self.load(db.execute(text("SELECT legacy_id FROM legacy_ids")).scalars())
+
+    def load(self, values: Iterable[str]):
+        self._originals = {to_uuid(value): value for value in values}
+        self.loaded = True
+
+    def original(self, value: uuid.UUID) -> str:
+        return self._originals.get(value) or str(value)
+
+
+legacy_ids = LegacyIds()
+
+
+def to_api_id(value: uuid.UUID) -> str:
+    """The id clients know: the original value for legacy ids, the UUID string otherwise."""
+    return legacy_ids.original(value)
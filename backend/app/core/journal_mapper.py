@@ -0,0 +1,85 @@
+"""
+Lean mapping of journal entry rows to response bytes.
+
+List endpoints select exactly the columns ``JournalEntryResponse`` needs in
+one joined query and serialize the rows straight to JSON, instead of loading
+ORM objects, querying the category and sub-emotion per entry, building a
+pydantic model per entry and letting FastAPI validate it all again against
+``response_model``. The column values come from typed DB columns, so there is
+nothing left to validate; the output is byte-for-byte what the pydantic path
+produces.
+"""
+from typing import Any, Dict, Iterable, Sequence, Tuple
+
+from fastapi import Response
+from sqlalchemy.orm import Query, Session
+
+from app.core.serialization import dumps
+from app.models.db_models import EmotionCategory, JournalEntry, SubEmotion
+
+# Column order of the rows returned by ``journal_entry_query``
+JOURNAL_ENTRY_COLUMNS = (
+    JournalEntry.id,
+    JournalEntry.user_id,
+    EmotionCategory.name,
+    SubEmotion.name,
+    JournalEntry.text,
+    JournalEntry.photo_url,
+    JournalEntry.reflections,
+    JournalEntry.created_at,
+    JournalEntry.updated_at,
+)
+
+
+def journal_entry_query(db: Session) -> Query:
+    """
+    Journal entry rows joined with their category and sub-emotion names.
+
+    Inner joins drop entries whose category or sub-emotion is missing, as the
+    list endpoints always have.
+    """
+    return db.query(*JOURNAL_ENTRY_COLUMNS)\
+        .join(EmotionCategory, JournalEntry.category_id == EmotionCategory.id)\
+        .join(SubEmotion, JournalEntry.sub_emotion_id == SubEmotion.id)
+
+
+def entry_row(entry: JournalEntry, category: str, sub_emotion: str) -> Tuple[Any, ...]:
+    """A loaded entry and its names as a ``journal_entry_query``-shaped row."""
+    return (
+        entry.id, entry.user_id, category, sub_emotion, entry.text, entry.photo_url,
+        entry.reflections, entry.created_at, entry.updated_at,
+    )
+
+
+def row_to_dict(row: Sequence[Any]) -> Dict[str, Any]:
+    """Map a ``journal_entry_query`` row to the aliased ``JournalEntryResponse`` shape."""
+    entry_id, user_id, category, sub_emotion, text, photo_url, reflections, created_at, updated_at = row
+    return {
+        "id": entry_id,
+        "userId": user_id,
+        "category": category,
+        "subEmotion": sub_emotion,
+        "text": text,
+        "photoUrl": photo_url,
+        "reflections": reflections or [],
+        "createdAt": created_at,
+        "updatedAt": updated_at,
+    }
+
+
+def rows_to_json(rows: Iterable[Sequence[Any]]) -> bytes:
+    return dumps([row_to_dict(row) for row in rows])
+
+
+def journal_entry_response(row: Sequence[Any]) -> Response:
+    return Response(content=dumps(row_to_dict(row)), media_type="application/json")
+
+
+def journal_entries_response(rows: Iterable[Sequence[Any]]) -> Response:
+    """
+    A JSON response for a list of journal entry rows.
+
+    Returning a ``Response`` makes FastAPI skip ``response_model`` validation;
+    the route's ``response_model`` still documents the shape.
+    """
+    return Response(content=rows_to_json(rows), media_type="application/json")
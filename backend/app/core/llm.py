@@ -0,0 +1,305 @@
+"""
+Shared OpenAI client used by every AI-backed endpoint.
+
+Wraps ``openai.ChatCompletion.acreate`` with a per-call deadline, jittered
+exponential-backoff retries, a circuit breaker and a process-wide concurrency
+cap, so a slow or failing upstream cannot tie up workers (and the database
+sessions they hold) indefinitely.
+
+The ``openai`` package takes ~0.4 s to import, so it is loaded on first use
+(or by ``preload`` in the background after startup) rather than at import.
+"""
+import asyncio
+import logging
+import os
+import random
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def _openai():
+    import openai
+
+    return openai
+
+
+@lru_cache(maxsize=None)
+def retryable_errors() -> tuple:
+    """Upstream errors worth retrying; anything else (bad request, auth) fails at once."""
+    openai_error = _openai().error
+    return (
+        asyncio.TimeoutError,
+        openai_error.Timeout,
+        openai_error.APIConnectionError,
+        openai_error.RateLimitError,
+        openai_error.ServiceUnavailableError,
+        openai_error.TryAgain,
+        openai_error.APIError,
+    )
+
+
+def preload():
+    """Import ``openai`` ahead of the first AI request; run off the event loop."""
+    retryable_errors()
+
+
+class LLMError(Exception):
+    """Raised when a completion could not be produced."""
+
+
+class LLMUnavailableError(LLMError):
+    """Raised without calling upstream (open circuit or saturated client)."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail fast for ``reset_timeout`` seconds. The first call after that
+    is let through as a probe: success closes the circuit, failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def release_probe(self):
+        self._probe_in_flight = False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning("LLM circuit opened after %d consecutive failures", self.failures)
+            self.opened_at = time.monotonic()
+
+
+class LLMMetrics:
+    """In-process counters for upstream LLM calls."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.short_circuits = 0
+        self.in_flight = 0
+        self.latency_seconds_total = 0.0
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "calls": self.calls,
+            "successes": self.successes,
+            "failures": self.failures,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "short_circuits": self.short_circuits,
+            "in_flight": self.in_flight,
+            "latency_seconds_total": round(self.latency_seconds_total, 6),
+        }
+
+
+class LLMClient:
+    """Chat-completion client with deadlines, retries and a circuit breaker."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        api_base: Optional[str] = None,
+        model: str = "gpt-4o",
+        timeout: float = 10.0,
+        max_retries: int = 2,
+        backoff_base: float = 0.25,
+        backoff_max: float = 4.0,
+        max_concurrency: int = 8,
+        acquire_timeout: float = 2.0,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.api_key = api_key
+        self.api_base = api_base
+        self.model = model
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_concurrency = max_concurrency
+        self.acquire_timeout = acquire_timeout
+        self.breaker = breaker or CircuitBreaker()
+        self.metrics = LLMMetrics()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop = None
+
+    @classmethod
+    def from_env(cls) -> "LLMClient":
+        return cls(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            api_base=os.getenv("OPENAI_API_BASE") or None,
+            model=os.getenv("LLM_MODEL", "gpt-4o"),
+            timeout=float(os.getenv("LLM_TIMEOUT_SECONDS", "10")),
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", "2")),
+            max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "8")),
+            breaker=CircuitBreaker(
+                failure_threshold=int(os.getenv("LLM_BREAKER_FAILURES", "5")),
+                reset_timeout=float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30")),
+            ),
+        )
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Semaphores bind to the loop they are first awaited on
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: uniform in [0, min(max, base * 2^attempt)]
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def chat(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 100,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """
+        Return the assistant message for ``messages``.
+
+        ``timeout`` bounds each attempt; the whole call including retries is
+        bounded by ``timeout * (max_retries + 1)`` plus backoff. Raises
+        ``LLMUnavailableError`` when the circuit is open or the concurrency cap
+        cannot be acquired in time, and ``LLMError`` for any other failure.
+        """
+        if not self.api_key:
+            raise LLMError("OpenAI API key not configured")
+
+        # Whether this call is the half-open probe, which it must give back if
+        # it ends without a verdict on upstream
+        probing = self.breaker.state == CircuitBreaker.HALF_OPEN
+        if not self.breaker.allow_request():
+            self.metrics.short_circuits += 1
+            raise LLMUnavailableError("LLM circuit is open")
+
+        semaphore = self._get_semaphore()
+        try:
+            await asyncio.wait_for(semaphore.acquire(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.metrics.short_circuits += 1
+            # Saturation is not an upstream failure; release a half-open probe
+            self.breaker.release_probe()
+            raise LLMUnavailableError("LLM client is saturated")
+        except asyncio.CancelledError:
+            if probing:
+                self.breaker.release_probe()
+            raise
+
+        deadline = timeout or self.timeout
+        openai = _openai()
+        self.metrics.in_flight += 1
+        try:
+            last_error: Optional[BaseException] = None
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    self.metrics.retries += 1
+                    await asyncio.sleep(self._backoff(attempt - 1))
+                self.metrics.calls += 1
+                started = time.perf_counter()
+                try:
+                    response = await asyncio.wait_for(
+                        openai.ChatCompletion.acreate(
+                            model=model or self.model,
+                            messages=messages,
+                            temperature=temperature,
+                            max_tokens=max_tokens,
+                            api_key=self.api_key,
+                            api_base=self.api_base,
+                            request_timeout=deadline,
+                        ),
+                        deadline,
+                    )
+                except retryable_errors() as e:
+                    self.metrics.latency_seconds_total += time.perf_counter() - started
+                    if isinstance(e, (asyncio.TimeoutError, openai.error.Timeout)):
+                        self.metrics.timeouts += 1
+                    logger.warning("LLM attempt %d failed: %r", attempt + 1, e)
+                    last_error = e
+                    continue
+                except openai.error.InvalidRequestError as e:
+                    # The request itself is bad; upstream is healthy
+                    self.metrics.latency_seconds_total += time.perf_counter() - started
+                    self.metrics.failures += 1
+                    self.breaker.release_probe()
+                    raise LLMError(str(e)) from e
+                except Exception as e:
+                    self.metrics.latency_seconds_total += time.perf_counter() - started
+                    self.metrics.failures += 1
+                    self.breaker.record_failure()
+                    raise LLMError(str(e)) from e
+
+                self.metrics.latency_seconds_total += time.perf_counter() - started
+                self.metrics.successes += 1
+                self.breaker.record_success()
+                if not response.choices:
+                    return ""
+                return response.choices[0].message.content.strip()
+
+            self.metrics.failures += 1
+            self.breaker.record_failure()
+            raise LLMError(f"LLM call failed after {self.max_retries + 1} attempts: {last_error!r}")
+        except asyncio.CancelledError:
+            # The caller went away (client disconnect, an outer wait_for); that
+            # says nothing about upstream, but the probe must not stay taken
+            if probing:
+                self.breaker.release_probe()
+            raise
+        finally:
+            self.metrics.in_flight -= 1
+            semaphore.release()
+
+
+llm_client = LLMClient.from_env()
+
+
+def get_llm_client() -> LLMClient:
+    return llm_client
@@ -0,0 +1,130 @@
+"""
+Process-wide logging setup: one handler, JSON lines, request correlation IDs.
+
+``configure_logging`` is called once by ``app.main``; modules only create
+loggers with ``logging.getLogger(__name__)`` and pass arguments lazily
+(``logger.info("... %s", value)``) so disabled levels cost no formatting.
+Per-entry debug lines inside loops go through ``debug_sampled`` so that
+turning on DEBUG under load logs a fraction of them instead of all.
+"""
+import json
+import logging
+import os
+import random
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+# Set per request by CorrelationIdMiddleware; "-" outside requests
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+REQUEST_ID_HEADER = b"x-request-id"
+MAX_REQUEST_ID_LENGTH = 64
+
+# Fraction of per-entry debug lines emitted when DEBUG is enabled
+DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.01"))
+
+# Attributes every LogRecord has; anything else was passed via ``extra``
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line; ``extra`` fields are emitted as top-level keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+
+_handler: Optional[logging.Handler] = None
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None):
+    """
+    Install a single stream handler on the root logger.
+
+    ``LOG_LEVEL`` (default INFO) and ``LOG_FORMAT`` (``json`` or ``text``,
+    default json) apply when the arguments are omitted. Safe to call again:
+    the previous handler is replaced.
+    """
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    fmt = (fmt or os.getenv("LOG_FORMAT", "json")).lower()
+
+    global _handler
+    handler = logging.StreamHandler()
+    handler.addFilter(RequestIdFilter())
+    handler.setFormatter(JSONFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+    root = logging.getLogger()
+    if _handler is not None:
+        root.removeHandler(_handler)
+    root.addHandler(handler)
+    _handler = handler
+    root.setLevel(level)
+    # Per-request HTTP client lines from the OpenAI/httpx stack are noise at INFO
+    logging.getLogger("httpx").setLevel(max(logging.WARNING, root.level))
+
+
+def debug_sampled(logger: logging.Logger, rate: Optional[float] = None) -> bool:
+    """True when a per-entry debug line should be emitted; check once per loop iteration."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return False
+    return random.random() < (DEBUG_SAMPLE_RATE if rate is None else rate)
+
+
+class CorrelationIdMiddleware:
+    """
+    ASGI middleware giving every request an ID for its log lines.
+
+    A client-supplied ``X-Request-ID`` is reused (truncated), otherwise a new
+    one is generated; either way it is echoed in the response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", []):
+            if name == REQUEST_ID_HEADER:
+                request_id = value.decode("latin-1")[:MAX_REQUEST_ID_LENGTH]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message = {
+                    **message,
+                    "headers": list(message.get("headers", [])) + [(REQUEST_ID_HEADER, request_id.encode("latin-1"))],
+                }
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id_var.reset(token)
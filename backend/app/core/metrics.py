@@ -0,0 +1,231 @@
+"""
+Per-request query counting and latency metrics.
+
+``TimingMiddleware`` opens a ``RequestStats`` for every HTTP request; the
+cursor hooks in ``app.database`` add each statement's duration to it. When the
+response starts, the totals go into a ``Server-Timing`` header, one log line
+and the process-wide histograms that ``/metrics`` renders in the Prometheus
+text format.
+"""
+import bisect
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class RequestStats:
+    __slots__ = ("started", "query_count", "db_seconds")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.db_seconds = 0.0
+
+    def record_query(self, seconds: float):
+        self.query_count += 1
+        self.db_seconds += seconds
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+# Shared by reference with threadpool workers, which run in a copy of the context
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+
+def record_query(seconds: float):
+    """Attribute one SQL statement to the current request, if any."""
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.record_query(seconds)
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label set."""
+
+    def __init__(self, name: str, help: str, buckets: Sequence[float]):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        # labels -> ([count per bucket, +Inf], sum)
+        self._series: Dict[Labels, Tuple[List[int], float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(sorted(labels.items()))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._series.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[index] += 1
+            self._series[key] = (counts, total + value)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = [(key, list(counts), total) for key, (counts, total) in sorted(self._series.items())]
+        for key, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_number(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(key + (('le', le),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_number(total)}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._series: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            series = sorted(self._series.items())
+        lines += [f"{self.name}{_format_labels(key)} {_format_number(value)}" for key, value in series]
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+# (name, type, help, value) samples produced on scrape
+Sample = Tuple[str, str, str, float]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.request_duration = Histogram(
+            "http_request_duration_seconds", "Time from request start to response start.", LATENCY_BUCKETS)
+        self.db_duration = Histogram(
+            "http_request_db_seconds", "Time spent in SQL statements per request.", LATENCY_BUCKETS)
+        self.db_queries = Histogram(
+            "http_request_db_queries", "SQL statements executed per request.", QUERY_COUNT_BUCKETS)
+        self.requests = Counter("http_requests_total", "Requests by route and status.")
+        self.single_flight = Counter(
+            "single_flight_requests_total",
+            "Coalescable reads by route: leader ran the computation, coalesced shared an in-flight one.")
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+
+    def add_collector(self, collector: Callable[[], Iterable[Sample]]):
+        """Register a callable whose samples are read at scrape time (e.g. LLM and cache stats)."""
+        self._collectors.append(collector)
+
+    def observe_request(self, method: str, route: str, status: int, stats: RequestStats, elapsed: float):
+        self.request_duration.observe(elapsed, method=method, route=route)
+        self.db_duration.observe(stats.db_seconds, method=method, route=route)
+        self.db_queries.observe(stats.query_count, method=method, route=route)
+        self.requests.inc(method=method, route=route, status=str(status))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in (self.request_duration, self.db_duration, self.db_queries, self.requests, self.single_flight):
+            lines += metric.render()
+        for collector in self._collectors:
+            for name, kind, help, value in collector():
+                lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}", f"{name} {_format_number(value)}"]
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        for metric in (self.request_duration, self.db_duration, self.db_queries, self.requests, self.single_flight):
+            metric.reset()
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    pairs = (
+        '{}="{}"'.format(name, value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for name, value in labels
+    )
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_number(value: float) -> str:
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def server_timing(stats: RequestStats, elapsed: float) -> str:
+    return (
+        f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.query_count} queries", '
+        f"app;dur={(elapsed - stats.db_seconds) * 1000:.2f}, "
+        f"total;dur={elapsed * 1000:.2f}"
+    )
+
+
+class TimingMiddleware:
+    """
+    ASGI middleware measuring each request's total time, SQL count and SQL time.
+
+    Figures are taken when the response starts, so streamed bodies are not
+    included. Requests that never reach a route are labelled ``unmatched`` to
+    keep label cardinality bounded.
+    """
+
+    def __init__(self, app, registry: Optional[MetricsRegistry] = None):
+        self.app = app
+        self.registry = registry or metrics_registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+
+        async def timing_send(message):
+            if message["type"] == "http.response.start":
+                elapsed = stats.elapsed
+                route = scope.get("route")
+                route_path = getattr(route, "path", None) or "unmatched"
+                status = message["status"]
+                self.registry.observe_request(scope["method"], route_path, status, stats, elapsed)
+                logger.info(
+                    "%s %s %d", scope["method"], route_path, status,
+                    extra={
+                        "route": route_path,
+                        "status": status,
+                        "queries": stats.query_count,
+                        "db_ms": round(stats.db_seconds * 1000, 2),
+                        "total_ms": round(elapsed * 1000, 2),
+                    },
+                )
+                message = {
+                    **message,
+                    "headers": list(message.get("headers", [])) + [(b"server-timing", server_timing(stats, elapsed).encode())],
+                }
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timing_send)
+        finally:
+            current_request_stats.reset(token)
+
+
+metrics_registry = MetricsRegistry()
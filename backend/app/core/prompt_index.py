@@ -0,0 +1,102 @@
+"""
+In-memory index of active reflection prompts, grouped by emotion category.
+
+Prompts are seed data that change rarely, so the index is loaded with one
+query and reused until it is invalidated or its TTL lapses. Selection uses
+rejection sampling, which is O(1) expected per request.
+"""
+import os
+import random
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from app.models.db_models import EmotionCategory, JournalEntry, Prompt
+from app.schemas.prompt import PromptResponse
+
+# Relative chance of re-serving a prompt the user answered recently
+RECENT_PROMPT_WEIGHT = 0.05
+# Number of the user's latest entries whose reflections count as "recent"
+RECENT_ENTRY_WINDOW = int(os.getenv("PROMPT_RECENT_ENTRY_WINDOW", "10"))
+MAX_SAMPLING_ATTEMPTS = 16
+
+
+class PromptIndex:
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._by_category: Dict[Optional[str], List[PromptResponse]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Drop the index; the next request reloads it."""
+        with self._lock:
+            self._loaded_at = None
+
+    def _is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    def ensure_loaded(self, db: Session):
+        if self._is_fresh():
+            return
+        with self._lock:
+            if self._is_fresh():
+                return
+            rows = db.query(Prompt, EmotionCategory.name)\
+                .outerjoin(EmotionCategory, Prompt.category_id == EmotionCategory.id)\
+                .filter(Prompt.is_active.is_(True))\
+                .order_by(Prompt.id)\
+                .all()
+            by_category: Dict[Optional[str], List[PromptResponse]] = {None: []}
+            for prompt, category_name in rows:
+                item = PromptResponse.model_validate(prompt)
+                by_category[None].append(item)
+                if category_name:
+                    by_category.setdefault(category_name, []).append(item)
+            self._by_category = by_category
+            self._loaded_at = time.monotonic()
+
+    def prompts(self, category: Optional[str] = None) -> List[PromptResponse]:
+        return self._by_category.get(category, [])
+
+    def pick(self, category: Optional[str] = None, recent_texts: Iterable[str] = ()) -> Optional[PromptResponse]:
+        """
+        Pick a random active prompt, strongly preferring ones not in ``recent_texts``.
+
+        A candidate the user answered recently is accepted only with
+        probability ``RECENT_PROMPT_WEIGHT``. If sampling keeps hitting recent
+        prompts (the user has answered most of the category) the candidates
+        are scanned once for a fresh one before falling back to any prompt.
+        """
+        candidates = self._by_category.get(category)
+        if not candidates:
+            return None
+        recent: Set[str] = set(recent_texts)
+        for _ in range(MAX_SAMPLING_ATTEMPTS):
+            choice = random.choice(candidates)
+            if choice.text not in recent or random.random() < RECENT_PROMPT_WEIGHT:
+                return choice
+        fresh = [p for p in candidates if p.text not in recent]
+        return random.choice(fresh or candidates)
+
+
+def recent_prompt_texts(db: Session, user_id: str, window: Optional[int] = None) -> Set[str]:
+    """Prompts answered in the user's latest entries (range scan on user_id, created_at)."""
+    if window is None:
+        window = RECENT_ENTRY_WINDOW
+    rows = db.query(JournalEntry.reflections)\
+        .filter(JournalEntry.user_id == user_id)\
+        .order_by(JournalEntry.created_at.desc())\
+        .limit(window)\
+        .all()
+    texts = set()
+    for (reflections,) in rows:
+        for reflection in reflections or []:
+            if isinstance(reflection, dict) and reflection.get("prompt"):
+                texts.add(reflection["prompt"])
+    return texts
+
+
+prompt_index = PromptIndex(ttl=float(os.getenv("PROMPT_INDEX_TTL_SECONDS", "300")))
@@ -0,0 +1,261 @@
+"""
+Slow-query capture and sampled EXPLAIN plans.
+
+The cursor hooks in ``app.database`` report every statement's duration to
+``slow_query_log``. Statements over ``SLOW_QUERY_THRESHOLD_MS`` are recorded
+and aggregated by statement text; reads keep their (truncated) bound
+parameters in memory for ``/api/admin/slow-queries``. Writes keep none, since
+they carry row contents such as journal text and password hashes, and the
+log line for a slow statement never includes parameters. A
+sampled subset of slow SELECTs is queued for ``run_explain_worker``, which
+re-runs them under ``EXPLAIN (ANALYZE, BUFFERS)`` off the request path and
+notes sequential scans, the usual sign of a missing index. Results are served
+by ``GET /api/admin/slow-queries``.
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy.engine import Engine
+
+from app.core.logging_config import request_id_var
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+SLOW_QUERY_CAPACITY = int(os.getenv("SLOW_QUERY_CAPACITY", "200"))
+EXPLAIN_SAMPLE_RATE = float(os.getenv("EXPLAIN_SAMPLE_RATE", "0.1"))
+# Re-explain a statement at most this often
+EXPLAIN_TTL_SECONDS = float(os.getenv("EXPLAIN_TTL_SECONDS", "600"))
+EXPLAIN_STATEMENT_TIMEOUT_MS = int(os.getenv("EXPLAIN_STATEMENT_TIMEOUT_MS", "5000"))
+MAX_PENDING_EXPLAINS = 20
+MAX_PARAMETER_LENGTH = 200
+
+# Only plain reads are safe to re-run: EXPLAIN ANALYZE executes the statement
+_READ_ONLY = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+_WRITES = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE)\b|\bFOR\s+(UPDATE|SHARE)\b", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+def is_explainable(statement: str) -> bool:
+    return bool(_READ_ONLY.match(statement)) and not _WRITES.search(statement)
+
+
+def _truncate(value: Any) -> Any:
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+    text = value if isinstance(value, str) else repr(value)
+    return text if len(text) <= MAX_PARAMETER_LENGTH else text[:MAX_PARAMETER_LENGTH] + "..."
+
+
+def capture_parameters(parameters: Any) -> Any:
+    """A JSON-friendly, truncated copy of a statement's bound parameters."""
+    if isinstance(parameters, dict):
+        return {str(k): _truncate(v) for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: keep the first row only
+            return capture_parameters(parameters[0])
+        return [_truncate(v) for v in parameters]
+    return _truncate(parameters)
+
+
+@dataclass
+class SlowQuery:
+    statement: str
+    parameters: Any
+    duration_ms: float
+    request_id: str
+    captured_at: str
+    dialect: str
+
+
+@dataclass
+class StatementStats:
+    statement: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_parameters: Any = None
+    plan: Optional[Any] = None
+    seq_scans: List[str] = field(default_factory=list)
+    explain_error: Optional[str] = None
+    explained_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "statement": self.statement,
+            "count": self.count,
+            "totalMs": round(self.total_ms, 2),
+            "maxMs": round(self.max_ms, 2),
+            "meanMs": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "lastParameters": self.last_parameters,
+            "seqScans": self.seq_scans,
+            "plan": self.plan,
+            "explainError": self.explain_error,
+            "explainedAt": datetime.fromtimestamp(self.explained_at, timezone.utc).isoformat() if self.explained_at else None,
+        }
+
+
+class SlowQueryLog:
+    def __init__(
+        self,
+        threshold_ms: float = SLOW_QUERY_THRESHOLD_MS,
+        capacity: int = SLOW_QUERY_CAPACITY,
+        sample_rate: float = EXPLAIN_SAMPLE_RATE,
+    ):
+        self.threshold_ms = threshold_ms
+        self.capacity = capacity
+        self.sample_rate = sample_rate
+        self.recent: Deque[SlowQuery] = deque(maxlen=capacity)
+        self._stats: Dict[str, StatementStats] = {}
+        self._pending: Deque[Any] = deque(maxlen=MAX_PENDING_EXPLAINS)
+        self._lock = threading.Lock()
+
+    def observe(self, statement: str, parameters: Any, seconds: float, dialect: str = "postgresql"):
+        duration_ms = seconds * 1000
+        if duration_ms < self.threshold_ms or statement.lstrip()[:7].upper() == "EXPLAIN":
+            return
+        key = normalize_statement(statement)
+        explainable = is_explainable(statement)
+        captured = capture_parameters(parameters) if explainable else None
+        with self._lock:
+            self.recent.append(SlowQuery(
+                statement=key,
+                parameters=captured,
+                duration_ms=round(duration_ms, 2),
+                request_id=request_id_var.get(),
+                captured_at=datetime.now(timezone.utc).isoformat(),
+                dialect=dialect,
+            ))
+            stats = self._stats.get(key)
+            if stats is None:
+                if len(self._stats) >= self.capacity:
+                    # Forget the statement with the least total time
+                    del self._stats[min(self._stats, key=lambda k: self._stats[k].total_ms)]
+                stats = self._stats[key] = StatementStats(statement=key)
+            stats.count += 1
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+            stats.last_parameters = captured
+            due = stats.explained_at is None or time.time() - stats.explained_at >= EXPLAIN_TTL_SECONDS
+            queued = any(pending[0] == key for pending in self._pending)
+            if due and not queued and explainable and random.random() < self.sample_rate:
+                # Keep the raw parameters: the plan must run with the real values
+                self._pending.append((key, statement, parameters))
+        # Statement and timing only: logs are shipped off the host, parameters stay in memory
+        logger.warning(
+            "Slow query (%.1f ms): %s", duration_ms, key[:200],
+            extra={"duration_ms": round(duration_ms, 2)},
+        )
+
+    def pop_pending(self):
+        with self._lock:
+            return self._pending.popleft() if self._pending else None
+
+    def record_plan(self, key: str, plan: Any = None, seq_scans: Optional[List[str]] = None, error: Optional[str] = None):
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                return
+            stats.plan = plan
+            stats.seq_scans = seq_scans or []
+            stats.explain_error = error
+            stats.explained_at = time.time()
+
+    def statements(self) -> List[Dict[str, Any]]:
+        """Aggregates by statement, most total time first."""
+        with self._lock:
+            stats = sorted(self._stats.values(), key=lambda s: s.total_ms, reverse=True)
+            return [s.to_dict() for s in stats]
+
+    def recent_queries(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [vars(q).copy() for q in reversed(self.recent)]
+
+    def clear(self):
+        with self._lock:
+            self.recent.clear()
+            self._stats.clear()
+            self._pending.clear()
+
+
+# "SCAN journal_entries" without "USING ... INDEX" is a full table scan
+_SQLITE_FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)$")
+
+
+def _postgres_seq_scans(node: Dict[str, Any]) -> List[str]:
+    scans = []
+    if node.get("Node Type") == "Seq Scan" and node.get("Relation Name"):
+        scans.append(node["Relation Name"])
+    for child in node.get("Plans", []):
+        scans += _postgres_seq_scans(child)
+    return scans
+
+
+def explain(engine: Engine, statement: str, parameters: Any):
+    """
+    Run EXPLAIN for one statement; returns ``(plan, seq_scans)``.
+
+    PostgreSQL gets ``EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`` inside a
+    transaction that is always rolled back, with a statement timeout. SQLite
+    (development and tests) gets ``EXPLAIN QUERY PLAN``.
+    """
+    with engine.connect() as conn:
+        with conn.begin() as transaction:
+            try:
+                if engine.dialect.name == "postgresql":
+                    conn.exec_driver_sql(f"SET LOCAL statement_timeout = {EXPLAIN_STATEMENT_TIMEOUT_MS}")
+                    row = conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters).scalar()
+                    plan = json.loads(row) if isinstance(row, str) else row
+                    return plan, sorted(set(_postgres_seq_scans(plan[0]["Plan"])))
+                rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+                plan = [row[-1] for row in rows]
+                return plan, sorted({m.group(1) for m in map(_SQLITE_FULL_SCAN.match, plan) if m})
+            finally:
+                transaction.rollback()
+
+
+def explain_pending(log: SlowQueryLog, engine: Engine) -> int:
+    """Explain every queued statement; returns how many were processed."""
+    processed = 0
+    while True:
+        item = log.pop_pending()
+        if item is None:
+            return processed
+        key, statement, parameters = item
+        try:
+            plan, seq_scans = explain(engine, statement, parameters)
+            log.record_plan(key, plan=plan, seq_scans=seq_scans)
+        except Exception as e:
+            logger.warning("EXPLAIN failed for slow query: %s", e)
+            log.record_plan(key, error=str(e))
+        processed += 1
+
+
+async def run_explain_worker(log: SlowQueryLog, engine: Engine, interval: float = 5.0):
+    """Drain the EXPLAIN queue every ``interval`` seconds until cancelled."""
+    from starlette.concurrency import run_in_threadpool
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(explain_pending, log, engine)
+        except Exception as e:
+            logger.error("EXPLAIN worker failed: %s", e)
+
+
+slow_query_log = SlowQueryLog()
@@ -0,0 +1,359 @@
+"""
+Per-client, per-route token-bucket rate limiting for the AI endpoints.
+
+Every request is limited by its client address. The app has no
+authentication, so a user id the client sends (``X-User-Id``, ``user_id``)
+only adds a second bucket on top of the address one: rotating ids never
+gets a caller past its address limit. ``X-Forwarded-For`` is only believed
+from the proxies in ``FORWARDED_ALLOW_IPS``.
+
+The limiter runs as ASGI middleware in front of the routers. Bucket state lives
+in a pluggable backend: ``InMemoryBackend`` for a single process (and tests),
+``RedisBackend`` when several workers must share limits. Request counts are
+accumulated in memory and flushed to the ``api_usage`` table once per interval,
+so accounting never adds a database write to the request path.
+"""
+import asyncio
+import ipaddress
+import json
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """``capacity`` requests, refilled at ``capacity / period`` per second."""
+
+    name: str
+    path_prefix: str
+    capacity: int
+    period: float
+    methods: Tuple[str, ...] = ("POST", "GET")
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / self.period
+
+    def matches(self, method: str, path: str) -> bool:
+        return method in self.methods and path.startswith(self.path_prefix)
+
+
+DEFAULT_RULES = [
+    RateLimitRule("completion", "/api/completion", capacity=int(os.getenv("RATE_LIMIT_COMPLETION_PER_MINUTE", "20")), period=60, methods=("POST",)),
+    RateLimitRule("bot", "/api/bot/sessions", capacity=int(os.getenv("RATE_LIMIT_BOT_PER_MINUTE", "20")), period=60, methods=("POST",)),
+    RateLimitRule("weekly_summary", "/api/journal/weekly-summary", capacity=int(os.getenv("RATE_LIMIT_SUMMARY_PER_MINUTE", "6")), period=60, methods=("GET",)),
+    RateLimitRule("weekly_summary", "/api/user/weekly-summary", capacity=int(os.getenv("RATE_LIMIT_SUMMARY_PER_MINUTE", "6")), period=60, methods=("GET",)),
+]
+
+
+class RateLimitBackend:
+    """Storage for token buckets. ``take`` must be atomic per key."""
+
+    def take(self, key: str, rule: RateLimitRule, cost: float = 1.0) -> Tuple[bool, float, float]:
+        """Consume ``cost`` tokens; return ``(allowed, remaining, retry_after_seconds)``."""
+        raise NotImplementedError
+
+
+class InMemoryBackend(RateLimitBackend):
+    """Process-local buckets; idle buckets expire once they would be full again."""
+
+    def __init__(self, max_keys: int = 100000):
+        self._buckets = TTLCache(max_entries=max_keys, max_bytes=64 * 1024 * 1024, ttl=None)
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rule: RateLimitRule, cost: float = 1.0) -> Tuple[bool, float, float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key) or (float(rule.capacity), now)
+            tokens = min(rule.capacity, tokens + (now - updated) * rule.refill_rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets.set(key, (tokens, now), ttl=rule.period)
+        retry_after = 0.0 if allowed else (cost - tokens) / rule.refill_rate
+        return allowed, tokens, retry_after
+
+
+class RedisBackend(RateLimitBackend):
+    """Buckets shared by every worker, updated atomically with a Lua script."""
+
+    SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local cost = tonumber(ARGV[4])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + (now - ts) * rate)
+    local allowed = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._script = client.register_script(self.SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        import redis  # Optional dependency, only needed for shared limits
+
+        return cls(redis.Redis.from_url(url))
+
+    def take(self, key: str, rule: RateLimitRule, cost: float = 1.0) -> Tuple[bool, float, float]:
+        allowed, tokens = self._script(keys=[f"ratelimit:{key}"], args=[rule.capacity, rule.refill_rate, time.time(), cost])
+        tokens = float(tokens)
+        retry_after = 0.0 if allowed else (cost - tokens) / rule.refill_rate
+        return bool(allowed), tokens, retry_after
+
+
+class UsageRecorder:
+    """Per-day request counters, flushed in batches to ``api_usage``."""
+
+    def __init__(self):
+        self._counts: Dict[Tuple[str, str, date], List[int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, user_key: str, route: str, allowed: bool):
+        day = datetime.now(timezone.utc).date()
+        with self._lock:
+            counts = self._counts.setdefault((user_key, route, day), [0, 0])
+            counts[0 if allowed else 1] += 1
+
+    def drain(self) -> Dict[Tuple[str, str, date], List[int]]:
+        with self._lock:
+            counts, self._counts = self._counts, {}
+        return counts
+
+    def flush(self, db: Session) -> int:
+        """Upsert accumulated counters; returns the number of rows written."""
+        from app.models.db_models import ApiUsage
+
+        counts = self.drain()
+        if not counts:
+            return 0
+        if db.bind.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        rows = [
+            {"user_key": user_key, "route": route, "day": day, "request_count": allowed, "rejected_count": rejected}
+            for (user_key, route, day), (allowed, rejected) in counts.items()
+        ]
+        stmt = insert(ApiUsage).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_key", "route", "day"],
+            set_={
+                "request_count": ApiUsage.request_count + stmt.excluded.request_count,
+                "rejected_count": ApiUsage.rejected_count + stmt.excluded.rejected_count,
+            },
+        )
+        try:
+            db.execute(stmt)
+            db.commit()
+        except Exception:
+            db.rollback()
+            # Put the counts back so they are retried on the next flush
+            with self._lock:
+                for key, (allowed, rejected) in counts.items():
+                    current = self._counts.setdefault(key, [0, 0])
+                    current[0] += allowed
+                    current[1] += rejected
+            raise
+        return len(rows)
+
+
+# Matches api_usage.user_key
+USER_KEY_MAX_LENGTH = 100
+
+
+class TrustedProxies:
+    """Peers whose ``X-Forwarded-For`` is believed: addresses, CIDR networks, or ``*`` for any."""
+
+    def __init__(self, entries: Iterable[str]):
+        self.any = False
+        self.hosts = set()
+        self.networks = []
+        for entry in entries:
+            entry = entry.strip()
+            if entry == "*":
+                self.any = True
+            elif entry:
+                try:
+                    self.networks.append(ipaddress.ip_network(entry, strict=False))
+                except ValueError:
+                    self.hosts.add(entry)
+
+    @classmethod
+    def from_env(cls) -> "TrustedProxies":
+        # The setting uvicorn and gunicorn use for the same purpose
+        return cls(os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1").split(","))
+
+    def __contains__(self, host: str) -> bool:
+        if self.any or host in self.hosts:
+            return True
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            return False
+        return any(address in network for network in self.networks)
+
+
+def client_address(scope, trusted: TrustedProxies) -> str:
+    """
+    The caller's address: the peer, or when the peer is a trusted proxy, the
+    nearest ``X-Forwarded-For`` hop that was not added by a trusted proxy.
+    """
+    client = scope.get("client")
+    address = client[0] if client else "unknown"
+    if address not in trusted:
+        return address
+    hops = [
+        hop.strip()
+        for name, value in scope.get("headers", []) if name == b"x-forwarded-for"
+        for hop in value.decode("latin-1").split(",")
+    ]
+    for hop in reversed(hops):
+        if not hop:
+            break
+        address = hop
+        if hop not in trusted:
+            break
+    return address
+
+
+def identify_user(scope) -> Optional[str]:
+    """Claimed user identity: X-User-Id header, then user_id/userId query param. Not verified."""
+    for name, value in scope.get("headers", []):
+        if name == b"x-user-id" and value:
+            return f"user:{value.decode('latin-1')}"[:USER_KEY_MAX_LENGTH]
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    for param in ("user_id", "userId"):
+        if query.get(param):
+            return f"user:{query[param][0]}"[:USER_KEY_MAX_LENGTH]
+    return None
+
+
+class RateLimiter:
+    def __init__(self, rules: List[RateLimitRule], backend: Optional[RateLimitBackend] = None,
+                 recorder: Optional[UsageRecorder] = None, trusted_proxies: Optional[TrustedProxies] = None):
+        self.rules = rules
+        self.backend = backend or InMemoryBackend()
+        self.recorder = recorder or UsageRecorder()
+        self.trusted_proxies = trusted_proxies if trusted_proxies is not None else TrustedProxies.from_env()
+
+    def match(self, method: str, path: str) -> Optional[RateLimitRule]:
+        for rule in self.rules:
+            if rule.matches(method, path):
+                return rule
+        return None
+
+    def check(self, rule: RateLimitRule, address_key: str, user_key: Optional[str] = None) -> Tuple[bool, float, float]:
+        """
+        Take a token from the address bucket and, if that allows the request
+        and a user is claimed, from the user's bucket too.
+        """
+        allowed, remaining, retry_after = self.backend.take(f"{rule.name}:{address_key}", rule)
+        # Only requests within their address limit can create user buckets, so
+        # made-up ids cannot flood the store faster than the address limit allows
+        if allowed and user_key:
+            allowed, user_remaining, retry_after = self.backend.take(f"{rule.name}:{user_key}", rule)
+            remaining = min(remaining, user_remaining)
+        self.recorder.record(user_key or address_key, rule.name, allowed)
+        return allowed, remaining, retry_after
+
+    def check_request(self, scope, rule: RateLimitRule) -> Tuple[bool, float, float]:
+        address_key = f"ip:{client_address(scope, self.trusted_proxies)}"[:USER_KEY_MAX_LENGTH]
+        return self.check(rule, address_key, identify_user(scope))
+
+
+class RateLimitMiddleware:
+    """ASGI middleware returning 429 with ``Retry-After`` once a bucket is empty."""
+
+    def __init__(self, app, limiter: RateLimiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        rule = self.limiter.match(scope["method"], scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Off the event loop: RedisBackend makes a blocking round trip
+        allowed, remaining, retry_after = await run_in_threadpool(self.limiter.check_request, scope, rule)
+        limit_headers = [
+            (b"x-ratelimit-limit", str(rule.capacity).encode()),
+            (b"x-ratelimit-remaining", str(int(remaining)).encode()),
+        ]
+        if not allowed:
+            body = json.dumps({"detail": "Rate limit exceeded. Please slow down."}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+                ] + limit_headers,
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + limit_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+async def run_usage_flusher(recorder: UsageRecorder, session_factory, interval: float = 60.0):
+    """Flush usage counters every ``interval`` seconds until cancelled."""
+    def flush_once():
+        with session_factory() as db:
+            return recorder.flush(db)
+
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await run_in_threadpool(flush_once)
+            except Exception as e:
+                logger.error("Failed to flush API usage counters: %s", e)
+    except asyncio.CancelledError:
+        await run_in_threadpool(flush_once)
+        raise
+
+
+def create_backend() -> RateLimitBackend:
+    redis_url = os.getenv("RATE_LIMIT_REDIS_URL")
+    if redis_url:
+        return RedisBackend.from_url(redis_url)
+    return InMemoryBackend()
+
+
+rate_limiter = RateLimiter(DEFAULT_RULES, backend=create_backend())
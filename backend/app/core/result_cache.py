@@ -0,0 +1,255 @@
+"""
+Per-user cache of serialized read results (journal lists, entry details,
+weekly summaries).
+
+Entries are keyed by user and query, under the user's current *version*.
+Writes never delete entries; ``invalidate_user`` moves the user to a fresh
+random version, so everything cached for them becomes unreachable at once.
+A read captures the version before it queries the database, so a read that
+raced with a write stores its result under the old version and nobody sees
+it. Versions are random rather than counters, so a version that was evicted
+or expired can never come back and resurrect old entries.
+
+Invalidation is driven by ``app.core.events``: creating or updating a journal
+entry and deleting a user each bump that user's version.
+
+The backend is an in-process LRU bounded by bytes (``InMemoryCacheBackend``),
+or Redis (``RESULT_CACHE_REDIS_URL``) when several processes serve traffic.
+An in-process cache cannot see other processes' writes, so without Redis the
+cache is disabled unless this is the only process (``WEB_CONCURRENCY`` and
+``APP_INSTANCES`` both 1). Results read from a replica are served but never
+stored, since the replica may still lag behind the write that invalidated
+the user.
+"""
+import logging
+import os
+import threading
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import TTLCache
+from app.core.events import JOURNAL_ENTRY_CREATED, JOURNAL_ENTRY_UPDATED, USER_DELETED, event_bus
+from app.core.ids import to_uuid
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """Byte-string storage shared by everyone who reads and invalidates the cache."""
+
+    # Operations wait on the network; async callers run them with ``off_loop``
+    blocking = False
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: float):
+        raise NotImplementedError
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        """Set ``key`` only if it is absent; return whether it was set."""
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Process-local LRU bounded by entry count and bytes (``app.core.cache.TTLCache``)."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.entries = TTLCache(max_entries=max_entries, max_bytes=max_bytes, ttl=None)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.entries.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self.entries.set(key, value, ttl=ttl)
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        with self._lock:
+            if self.entries.get(key) is not None:
+                return False
+            self.entries.set(key, value, ttl=ttl)
+            return True
+
+    def clear(self):
+        self.entries.clear()
+
+
+class RedisCacheBackend(CacheBackend):
+    """Shared by every worker; eviction is left to Redis (``maxmemory-policy allkeys-lru``)."""
+
+    blocking = True
+
+    def __init__(self, client, prefix: str = "result:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "result:") -> "RedisCacheBackend":
+        import redis  # Optional dependency, only needed for a shared cache
+
+        return cls(redis.Redis.from_url(url), prefix)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self.client.set(self.prefix + key, value, px=int(ttl * 1000))
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        return bool(self.client.set(self.prefix + key, value, px=int(ttl * 1000), nx=True))
+
+    def clear(self):
+        for key in self.client.scan_iter(self.prefix + "*"):
+            self.client.delete(key)
+
+
+async def off_loop(backend: Optional[CacheBackend], operation: Callable[..., Any], *args):
+    """``operation(*args)`` in a worker thread if ``backend`` blocks, inline otherwise."""
+    if backend is not None and backend.blocking:
+        return await run_in_threadpool(operation, *args)
+    return operation(*args)
+
+
+class ResultCache:
+    def __init__(self, backend: Optional[CacheBackend], ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None and self.ttl > 0
+
+    @staticmethod
+    def _user(user_id: str) -> str:
+        # user-1 and its uuid form are the same user
+        return to_uuid(str(user_id)).hex
+
+    def version(self, user_id: str) -> bytes:
+        key = f"v:{self._user(user_id)}"
+        # Versions outlive the entries stored under them
+        fresh = uuid.uuid4().hex.encode()
+        if self.backend.add(key, fresh, self.ttl * 2):
+            return fresh
+        return self.backend.get(key) or fresh
+
+    def invalidate_user(self, user_id: str):
+        if not self.enabled:
+            return
+        self.invalidations += 1
+        self.backend.set(f"v:{self._user(user_id)}", uuid.uuid4().hex.encode(), self.ttl * 2)
+
+    def remember_owner(self, entry_id: str, user_id: str):
+        """Entries never change owner, so entry -> user needs no invalidation."""
+        if self.enabled:
+            self._guarded(self.backend.set, f"owner:{entry_id}", self._user(user_id).encode(), self.ttl)
+
+    def owner(self, entry_id: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        owner = self._guarded(self.backend.get, f"owner:{entry_id}")
+        return owner.decode() if owner else None
+
+    def lookup(self, user_id: str, query: str) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        ``(cached value or None, slot)``. On a miss, a value read from the
+        database *after* this call may be stored with ``store(slot, value)``;
+        ``slot`` is None while the cache is disabled or its backend failing.
+        """
+        if not self.enabled:
+            return None, None
+        version = self._guarded(self.version, user_id)
+        if version is None:
+            return None, None
+        slot = f"r:{self._user(user_id)}:{version.decode()}:{query}"
+        value = self._guarded(self.backend.get, slot)
+        if value is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return value, slot
+
+    def store(self, slot: Optional[str], value: bytes):
+        if slot is not None:
+            self._guarded(self.backend.set, slot, value, self.ttl)
+
+    async def cached(self, user_id: str, query: str, compute: Callable[[], Awaitable[bytes]],
+                     store: bool = True) -> bytes:
+        """
+        The cached bytes for ``(user_id, query)``, or ``await compute()``.
+
+        ``store=False`` (reads from a replica) serves hits but never writes.
+        A failing backend degrades to computing every time.
+        """
+        value, slot = await off_loop(self.backend, self.lookup, user_id, query)
+        if value is not None:
+            return value
+        value = await compute()
+        if store:
+            await off_loop(self.backend, self.store, slot, value)
+        return value
+
+    def _guarded(self, operation: Callable[..., Any], *args):
+        try:
+            return operation(*args)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Result cache %s failed: %s", getattr(operation, "__name__", operation), e)
+            return None
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        stats = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+        if isinstance(self.backend, InMemoryCacheBackend):
+            stats["entries"] = len(self.backend.entries)
+            stats["bytes"] = self.backend.entries.current_bytes
+        return stats
+
+
+def serving_processes() -> int:
+    """Processes serving this deployment: workers per instance times instances."""
+    return int(os.getenv("WEB_CONCURRENCY", "1")) * int(os.getenv("APP_INSTANCES", "1"))
+
+
+def create_backend() -> Optional[CacheBackend]:
+    redis_url = os.getenv("RESULT_CACHE_REDIS_URL")
+    if redis_url:
+        return RedisCacheBackend.from_url(redis_url)
+    processes = serving_processes()
+    if processes > 1:
+        logger.info("Result cache disabled: %d processes and no RESULT_CACHE_REDIS_URL", processes)
+        return None
+    return InMemoryCacheBackend(
+        max_entries=int(os.getenv("RESULT_CACHE_ENTRIES", "10000")),
+        max_bytes=int(os.getenv("RESULT_CACHE_BYTES", str(32 * 1024 * 1024))),
+    )
+
+
+result_cache = ResultCache(create_backend(), ttl=float(os.getenv("RESULT_CACHE_TTL_SECONDS", "300")))
+
+
+def _invalidate(user_id: str, **payload):
+    result_cache.invalidate_user(user_id)
+
+
+for _event in (JOURNAL_ENTRY_CREATED, JOURNAL_ENTRY_UPDATED, USER_DELETED):
+    event_bus.subscribe(_event, _invalidate)
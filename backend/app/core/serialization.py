@@ -0,0 +1,133 @@
+"""
+Fast JSON encoding and response compression.
+
+``orjson`` replaces the stdlib encoder for responses and pre-serialized
+payloads. ``CompressionMiddleware`` compresses large, uncompressed JSON
+responses with brotli or gzip depending on what the client accepts.
+"""
+import gzip
+from typing import Any, Dict, Optional
+
+import brotli
+import orjson
+from fastapi.responses import ORJSONResponse
+
+# Responses smaller than this are not worth the CPU to compress
+COMPRESSION_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# Pre-compressed static payloads are built once, so spend more effort on them
+STATIC_GZIP_LEVEL = 9
+STATIC_BROTLI_QUALITY = 11
+
+COMPRESSIBLE_TYPES = (b"application/json", b"text/")
+
+__all__ = ["ORJSONResponse", "dumps", "compress", "choose_encoding", "CompressionMiddleware"]
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize ``value`` to compact JSON bytes (datetimes as ISO 8601)."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick ``br`` over ``gzip`` from an Accept-Encoding header, ignoring q=0 entries."""
+    if not accept_encoding:
+        return None
+    offered = set()
+    for part in accept_encoding.lower().split(","):
+        token, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        offered.add(token.strip())
+    if "br" in offered:
+        return "br"
+    if "gzip" in offered or "*" in offered:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str, static: bool = False) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=STATIC_BROTLI_QUALITY if static else BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=STATIC_GZIP_LEVEL if static else GZIP_LEVEL, mtime=0)
+
+
+def precompress(body: bytes) -> Dict[str, bytes]:
+    """Identity, gzip and brotli variants of a static payload."""
+    variants = {"identity": body}
+    if len(body) >= COMPRESSION_MIN_SIZE:
+        variants["gzip"] = compress(body, "gzip", static=True)
+        variants["br"] = compress(body, "br", static=True)
+    return variants
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing single-chunk responses above a size threshold.
+
+    Streaming responses and bodies that already carry a Content-Encoding are
+    passed through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = None
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def compressing_send(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                headers = {k.lower(): v for k, v in message.get("headers", [])}
+                content_type = headers.get(b"content-type", b"")
+                if b"content-encoding" in headers or not content_type.startswith(COMPRESSIBLE_TYPES):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+            if passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if message.get("more_body") or len(body) < self.minimum_size:
+                # Streaming or small: send as-is
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding)
+            vary = b"Accept-Encoding"
+            headers = []
+            for k, v in start_message.get("headers", []):
+                if k.lower() == b"vary":
+                    vary = v + b", Accept-Encoding"
+                elif k.lower() != b"content-length":
+                    headers.append((k, v))
+            headers += [
+                (b"content-encoding", encoding.encode()),
+                (b"content-length", str(len(compressed)).encode()),
+                (b"vary", vary),
+            ]
+            await send({**start_message, "headers": headers})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, compressing_send)
@@ -0,0 +1,63 @@
+"""
+Process sizing for the production server (``gunicorn.conf.py``).
+
+One uvicorn worker per available CPU: each worker is a single event loop, so
+more workers than cores only adds context switches. Each worker has its own
+SQLAlchemy pool, so pool sizes are capped so that every worker of every
+instance together stays within the connections PostgreSQL allows this
+deployment (``DB_MAX_CONNECTIONS``).
+"""
+import math
+import os
+from pathlib import Path
+from typing import Optional, Tuple
+
+CGROUP_V2_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+CGROUP_V1_QUOTA = Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+CGROUP_V1_PERIOD = Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+
+
+def _cgroup_cpu_limit() -> Optional[float]:
+    """CPUs granted by the container's CFS quota, if one is set."""
+    try:
+        if CGROUP_V2_CPU_MAX.exists():
+            quota, period = CGROUP_V2_CPU_MAX.read_text().split()
+            return None if quota == "max" else int(quota) / int(period)
+        if CGROUP_V1_QUOTA.exists():
+            quota = int(CGROUP_V1_QUOTA.read_text())
+            return None if quota <= 0 else quota / int(CGROUP_V1_PERIOD.read_text())
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def available_cpus() -> int:
+    """CPUs this process may use: scheduler affinity, capped by a container CPU quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, max(1, math.ceil(limit)))
+    return max(1, cpus)
+
+
+def worker_count(configured: Optional[str] = None) -> int:
+    """``WEB_CONCURRENCY`` when set, else one worker per available CPU."""
+    if configured:
+        return max(1, int(configured))
+    return available_cpus()
+
+
+def pool_limits(pool_size: int, max_overflow: int, max_connections: Optional[int], processes: int) -> Tuple[int, int]:
+    """
+    ``(pool_size, max_overflow)`` for one worker, so that ``processes``
+    workers never open more than ``max_connections`` between them. Unlimited
+    when ``max_connections`` is not set.
+    """
+    if not max_connections:
+        return pool_size, max_overflow
+    per_process = max(1, max_connections // max(1, processes))
+    capped_size = min(pool_size, per_process)
+    return capped_size, min(max_overflow, per_process - capped_size)
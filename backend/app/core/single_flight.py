@@ -0,0 +1,89 @@
+"""
+Request coalescing ("single-flight") for identical concurrent reads.
+
+Dashboards open the same views from several tabs and devices at once. The
+first request for a ``(route, key)`` becomes the leader and runs the
+computation; identical requests that arrive while it is still running await
+the same result instead of querying the database (or the LLM) again.
+Nothing is cached: once the leader finishes, the next request computes
+afresh.
+
+Flights are per worker process (they are asyncio tasks). A committed write
+detaches the writer's flights, so a read that follows a write never joins a
+computation that started before it (``forget_users``, called from the
+session's ``after_commit`` hook). Counts of leaders and coalesced requests go
+to ``single_flight_requests_total`` on ``/metrics``.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple, TypeVar
+
+from app.core.ids import to_uuid
+from app.core.metrics import MetricsRegistry, metrics_registry
+
+T = TypeVar("T")
+
+FlightKey = Tuple[str, Hashable]
+
+
+class SingleFlight:
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry or metrics_registry
+        self._flights: Dict[FlightKey, asyncio.Task] = {}
+        # user id (uuid hex) -> keys of that user's flights, for forget_users
+        self._by_user: Dict[str, Set[FlightKey]] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def run(self, route: str, key: Hashable, compute: Callable[[], Awaitable[T]],
+                  user_id: Optional[str] = None) -> T:
+        """
+        ``await compute()``, or the result of an identical in-flight call.
+
+        ``route`` names the flight in metrics; ``key`` must capture everything
+        the result depends on. Errors are shared like results. The result is
+        shared by reference, so it must not be mutated.
+        """
+        flight_key = (route, key)
+        task = self._flights.get(flight_key)
+        if task is not None:
+            self.registry.single_flight.inc(route=route, result="coalesced")
+            try:
+                # A follower going away must not cancel the leader's work
+                return await asyncio.shield(task)
+            except asyncio.CancelledError:
+                if not task.cancelled():
+                    raise
+            # The leader was cancelled (its client left); run our own computation
+            return await self.run(route, key, compute, user_id)
+
+        self.registry.single_flight.inc(route=route, result="leader")
+        task = asyncio.ensure_future(compute())
+        self._flights[flight_key] = task
+        user = to_uuid(user_id).hex if user_id else None
+        if user is not None:
+            self._by_user.setdefault(user, set()).add(flight_key)
+        try:
+            return await task
+        finally:
+            self._detach(flight_key, task, user)
+
+    def _detach(self, flight_key: FlightKey, task: asyncio.Task, user: Optional[str]):
+        # forget_users may run concurrently from a threadpool commit, hence pop() over del
+        if self._flights.get(flight_key) is task:
+            self._flights.pop(flight_key, None)
+        if user is not None:
+            keys = self._by_user.get(user)
+            if keys is not None:
+                keys.discard(flight_key)
+                if not keys:
+                    self._by_user.pop(user, None)
+
+    def forget_users(self, user_ids: Iterable[str]):
+        """Let later requests for these users start fresh flights; running ones finish for their callers."""
+        for user_id in user_ids:
+            for flight_key in self._by_user.pop(to_uuid(str(user_id)).hex, ()):
+                self._flights.pop(flight_key, None)
+
+
+single_flight = SingleFlight()
@@ -0,0 +1,80 @@
+"""
+Worker warm-up run by the lifespan in ``app.main``.
+
+Everything here is best-effort: a database that is not reachable yet must not
+stop the worker from starting, so failures are logged and the first requests
+simply pay the cost instead. ``readiness`` tells ``/ready`` whether warm-up
+has finished and whether shutdown has begun.
+"""
+import asyncio
+import logging
+import time
+from typing import Callable
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.catalog import taxonomy_catalog
+from app.core.ids import legacy_ids
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    """Whether this worker should get traffic: after warm-up, until shutdown begins."""
+
+    def __init__(self):
+        self.started = False
+        self.draining = False
+
+    @property
+    def accepting(self) -> bool:
+        return self.started and not self.draining
+
+
+readiness = Readiness()
+
+
+def warm_pool(engine: Engine, connections: int) -> int:
+    """Open ``connections`` pooled connections at once so early requests skip the connect handshake."""
+    opened = []
+    try:
+        for _ in range(connections):
+            connection = engine.connect()
+            opened.append(connection)
+            connection.exec_driver_sql("SELECT 1")
+    finally:
+        for connection in opened:
+            connection.close()
+    return len(opened)
+
+
+def preload_taxonomy(session_factory: Callable[[], Session]):
+    """Build the catalog payloads and prompt index before the first catalog request."""
+    with session_factory() as db:
+        taxonomy_catalog.ensure_loaded(db)
+
+
+def preload_legacy_ids(session_factory: Callable[[], Session]):
+    """Read the original values of non-UUID ids before the first response that returns one."""
+    with session_factory() as db:
+        legacy_ids.ensure_loaded(db)
+
+
+async def warm_up(engine: Engine, session_factory: Callable[[], Session], connections: int, timeout: float = 10.0):
+    started = time.perf_counter()
+    steps = (
+        ("pool", warm_pool, (engine, connections)),
+        ("taxonomy", preload_taxonomy, (session_factory,)),
+        ("legacy ids", preload_legacy_ids, (session_factory,)),
+    )
+    for name, step, args in steps:
+        try:
+            await asyncio.wait_for(run_in_threadpool(step, *args), timeout)
+        except Exception as e:
+            logger.warning("Startup warm-up step %s failed: %r", name, e)
+    logger.info(
+        "Startup warm-up finished in %.1f ms", (time.perf_counter() - started) * 1000,
+        extra={"warm_connections": connections},
+    )
@@ -0,0 +1,138 @@
+"""
+Journaling streaks, updated incrementally.
+
+A user's streak state is a handful of counters plus a bitmap of the last
+``WINDOW_DAYS`` local days, anchored at the latest active day (bit ``i`` set
+means an entry on ``last_day - i``). Recording an entry for today or a later
+day is O(1): shift the bitmap, bump the counters. A back-dated day re-derives
+only the run it joins, from the bitmap and, past the window, from a bounded
+lookup of older days, so an import of old entries never rescans a user's full
+history.
+
+Days are local to the user's timezone; the current streak is reported as 0
+once a full local day has passed without an entry.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Iterable, List, Optional, Set
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+WINDOW_DAYS = 366
+WINDOW_BYTES = (WINDOW_DAYS + 7) // 8
+WINDOW_MASK = (1 << WINDOW_DAYS) - 1
+# Longest run a back-dated day is followed through beyond the window
+MAX_RECOMPUTE_DAYS = 400
+
+# Active days in [start, end], used for days that fell out of the window
+DayLookup = Callable[[date, date], Set[date]]
+
+
+def parse_timezone(name: Optional[str]) -> ZoneInfo:
+    """``ZoneInfo`` for an IANA name; raises ``ValueError`` for unknown names."""
+    try:
+        return ZoneInfo(name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        raise ValueError(f"Unknown timezone: {name}") from e
+
+
+def local_day(moment: datetime, tz: ZoneInfo) -> date:
+    """The calendar day ``moment`` falls on in ``tz``; naive datetimes are UTC."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(tz).date()
+
+
+def window_to_bytes(window: int) -> bytes:
+    return (window & WINDOW_MASK).to_bytes(WINDOW_BYTES, "little")
+
+
+def window_from_bytes(data: Optional[bytes]) -> int:
+    return int.from_bytes(data or b"", "little") & WINDOW_MASK
+
+
+@dataclass
+class StreakState:
+    current: int = 0
+    longest: int = 0
+    # Distinct active days ever recorded
+    active_days: int = 0
+    last_day: Optional[date] = None
+    window: int = 0
+
+    def is_active(self, day: date) -> bool:
+        if self.last_day is None or day > self.last_day:
+            return False
+        offset = (self.last_day - day).days
+        if offset < self.current:
+            return True
+        return offset < WINDOW_DAYS and bool(self.window >> offset & 1)
+
+    def record(self, day: date, lookup: Optional[DayLookup] = None) -> bool:
+        """Mark ``day`` active; returns False if it already was."""
+        if self.last_day is None or day > self.last_day:
+            gap = (day - self.last_day).days if self.last_day else WINDOW_DAYS
+            self.window = (self.window << gap | 1) & WINDOW_MASK
+            self.current = self.current + 1 if gap == 1 else 1
+            self.last_day = day
+            self.active_days += 1
+            self.longest = max(self.longest, self.current)
+            return True
+
+        if self.is_active(day):
+            return False
+
+        older: List[Set[date]] = []
+
+        def older_days() -> Set[date]:
+            # One bounded read serves the duplicate check and the walk in both directions
+            if not older:
+                older.append(lookup(day - timedelta(days=MAX_RECOMPUTE_DAYS), day + timedelta(days=MAX_RECOMPUTE_DAYS)))
+            return older[0]
+
+        lookup_older = older_days if lookup is not None else None
+        offset = (self.last_day - day).days
+        if offset < WINDOW_DAYS:
+            self.window |= 1 << offset
+        elif lookup_older is not None and day in lookup_older():
+            # Past the window only the lookup knows the day was already recorded
+            return False
+        self.active_days += 1
+        before = self._run_length(day, -1, lookup_older)
+        # A day right before the current run extends it
+        after = self.current if offset == self.current else self._run_length(day, 1, lookup_older)
+        run = before + 1 + after
+        if offset == self.current:
+            self.current = run
+        self.longest = max(self.longest, run)
+        return True
+
+    def _run_length(self, day: date, step: int, older_days: Optional[Callable[[], Set[date]]]) -> int:
+        """Consecutive active days next to ``day`` in direction ``step``, capped at MAX_RECOMPUTE_DAYS."""
+        length = 0
+        while length < MAX_RECOMPUTE_DAYS:
+            probe = day + timedelta(days=step * (length + 1))
+            if self.is_active(probe):
+                length += 1
+                continue
+            if (self.last_day - probe).days < WINDOW_DAYS or older_days is None or probe not in older_days():
+                break
+            length += 1
+        return length
+
+    def current_as_of(self, today: date) -> int:
+        """The current streak on ``today``: broken once a whole day passes without an entry."""
+        if self.last_day is None or (today - self.last_day).days > 1:
+            return 0
+        return self.current
+
+    def history(self, today: date, days: int) -> List[bool]:
+        """Activity for the ``days`` local days ending ``today``, oldest first."""
+        return [self.is_active(today - timedelta(days=i)) for i in reversed(range(days))]
+
+
+def rebuild(days: Iterable[date]) -> StreakState:
+    """State from scratch, for users whose state was never recorded."""
+    state = StreakState()
+    for day in sorted(set(days)):
+        state.record(day)
+    return state
@@ -0,0 +1,58 @@
+"""
+Gunicorn worker class for the production server (``gunicorn.conf.py``).
+
+uvicorn only runs the lifespan shutdown after it has closed its listeners and
+waited for open connections, so a flag set there fails ``/ready`` when the
+load balancer can no longer reach the worker anyway. ``DrainingUvicornWorker``
+fails ``/ready`` as soon as SIGTERM arrives and keeps serving for
+``DRAIN_SECONDS``, long enough for the load balancer to notice and route new
+requests elsewhere, before the usual graceful shutdown starts. A second
+SIGTERM (or SIGINT) during the drain stops the worker straight away.
+"""
+import asyncio
+import logging
+import os
+import sys
+from types import FrameType
+from typing import Optional
+
+from gunicorn.arbiter import Arbiter
+from uvicorn.server import Server
+from uvicorn.workers import UvicornWorker
+
+logger = logging.getLogger(__name__)
+
+DRAIN_SECONDS = float(os.getenv("DRAIN_SECONDS", "5"))
+
+
+class DrainingServer(Server):
+    def __init__(self, config, drain_seconds: float = DRAIN_SECONDS):
+        super().__init__(config)
+        self.drain_seconds = drain_seconds
+        self._drain: Optional[asyncio.TimerHandle] = None
+
+    def handle_exit(self, sig: int, frame: Optional[FrameType]) -> None:
+        if self._drain is not None or self.drain_seconds <= 0:
+            super().handle_exit(sig, frame)
+            return
+        # Imported here: the gunicorn master loads this class and must not import the app
+        from app.core.startup import readiness
+
+        readiness.draining = True
+        logger.info("Draining for %.1fs before shutting down", self.drain_seconds)
+        self._drain = asyncio.get_event_loop().call_later(self.drain_seconds, self._stop)
+
+    def _stop(self):
+        self.should_exit = True
+
+
+class DrainingUvicornWorker(UvicornWorker):
+    """``UvicornWorker`` serving through ``DrainingServer``."""
+
+    async def _serve(self) -> None:
+        self.config.app = self.wsgi
+        server = DrainingServer(config=self.config)
+        self._install_sigquit_handler()
+        await server.serve(sockets=self.sockets)
+        if not server.started:
+            sys.exit(Arbiter.WORKER_BOOT_ERROR)
@@ -1,38 +1,104 @@
-from sqlalchemy import create_engine, event, text
+from fastapi import Depends, Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-import os
-from dotenv import load_dotenv
+from sqlalchemy.orm import Session, sessionmaker
+import time
 import logging
+from app.config import settings
+from app.core.ids import legacy_ids
+from app.core.db_routing import PRIMARY_COOKIE, RecentWrites, ReplicaRouter, install_write_tracking
+from app.core.metrics import record_query
+from app.core.server import pool_limits
+from app.core.single_flight import single_flight
+from app.core.query_diagnostics import slow_query_log
 
-# Load environment variables
-load_dotenv()
+DATABASE_URL = settings.DATABASE_URL
+DATABASE_SCHEMA = settings.DATABASE_SCHEMA
+REPLICA_URLS = [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
 
-# Get database configuration from environment variables
-DATABASE_URL = os.getenv("DATABASE_URL")
-DATABASE_SCHEMA = os.getenv("DATABASE_SCHEMA", "feel-write")
-
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def engine_options(url: str) -> dict:
+    """
+    Pool sizing for server databases, capped to this worker's share of
+    ``DB_MAX_CONNECTIONS``; SQLite (tests) keeps SQLAlchemy's defaults.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    pool_size, max_overflow = pool_limits(
+        settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW, settings.DB_MAX_CONNECTIONS,
+        settings.WEB_CONCURRENCY * settings.APP_INSTANCES,
+    )
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_pre_ping": True,
+    }
+
 # Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+
+def install_search_path(engine, schema: str):
+    """
+    Set ``search_path`` once per new PostgreSQL connection.
+
+    Runs in autocommit so the pool's rollback-on-return cannot undo it, which
+    makes a per-transaction ``SET`` (one extra round trip each) unnecessary.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+
+    @event.listens_for(engine, "connect", insert=True)
+    def set_search_path(dbapi_connection, connection_record):
+        autocommit = dbapi_connection.autocommit
+        dbapi_connection.autocommit = True
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute(f'SET SESSION search_path TO "{schema}"')
+        dbapi_connection.autocommit = autocommit
+
+install_search_path(engine, DATABASE_SCHEMA)
+
+def install_query_hooks(engine):
+    """Time every statement on ``engine``, attribute it to the current request and capture slow ones."""
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
 
-# Set the search path for all connections
-@event.listens_for(engine, "connect")
-def set_search_path(dbapi_connection, connection_record):
-    with dbapi_connection.cursor() as cursor:
-        cursor.execute(f'SET search_path TO "{DATABASE_SCHEMA}";')
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        record_query(elapsed)
+        slow_query_log.observe(statement, parameters, elapsed, conn.dialect.name)
 
-# Set the search path for the current session
-@event.listens_for(engine, "begin")
-def set_search_path_for_session(conn):
-    conn.execute(text(f'SET search_path TO "{DATABASE_SCHEMA}";'))
+    @event.listens_for(engine, "handle_error")
+    def discard_query_timer(context):
+        timers = context.connection.info.get("query_start_time") if context.connection is not None else None
+        if timers:
+            timers.pop()
+
+install_query_hooks(engine)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read replicas, each with the primary's pool settings and hooks
+replica_engines = []
+for url in REPLICA_URLS:
+    replica = create_engine(url, **engine_options(url))
+    install_search_path(replica, DATABASE_SCHEMA)
+    install_query_hooks(replica)
+    replica_engines.append(replica)
+
+recent_writes = RecentWrites(settings.READ_YOUR_WRITES_SECONDS)
+db_router = ReplicaRouter(
+    [sessionmaker(autocommit=False, autoflush=False, bind=replica) for replica in replica_engines],
+    recent_writes,
+)
+
+# Writers are pinned to the primary (with replicas) and detached from coalesced reads
+install_write_tracking(SessionLocal, recent_writes, on_commit=single_flight.forget_users)
+
 # Create base class for models
 Base = declarative_base()
 
@@ -40,6 +106,30 @@ Base = declarative_base()
 def get_db():
     db = SessionLocal()
     try:
+        # A no-op once loaded; normally done by the startup warm-up already
+        legacy_ids.ensure_loaded(db)
         yield db
     finally:
         db.close()
+
+def read_db_dependency(router: ReplicaRouter):
+    def get_read_db(request: Request, db: Session = Depends(get_db)):
+        """
+        Session for read-only handlers: a replica when configured, unless the
+        request's ``user_id`` (path or query) or client wrote recently. Handlers
+        using it must not write.
+        """
+        user_id = request.path_params.get("user_id") or request.query_params.get("user_id")
+        if router.use_primary(user_id, request.cookies.get(PRIMARY_COOKIE)):
+            # Sessions connect lazily, so the unused primary session costs nothing
+            yield db
+            return
+        replica = router.replica_session()
+        try:
+            yield replica
+        finally:
+            replica.close()
+
+    return get_read_db
+
+get_read_db = read_db_dependency(db_router)
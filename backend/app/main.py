@@ -1,31 +1,85 @@
+# Loads .env once; must come before any module that reads os.environ at import
+from app.config import settings
+
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
 from app.api import (
     journal, emotions, prompts, users,
-    user, images, completion, analytics
+    user, images, completion, analytics, bot, metrics, admin, health
 )
-from app.database import engine, Base
-from app.models.db_models import User, EmotionCategory, SubEmotion, Prompt, JournalEntry, Analytics
+from app.database import engine, SessionLocal, db_router
+from app.core import llm
+from app.core.db_routing import ReadYourWritesMiddleware
+from app.core.rate_limit import RateLimitMiddleware, rate_limiter, run_usage_flusher
+from app.core.serialization import CompressionMiddleware, ORJSONResponse
+from app.core.metrics import TimingMiddleware
+from app.core.logging_config import CorrelationIdMiddleware, configure_logging
+from app.core.query_diagnostics import run_explain_worker, slow_query_log
+from app.core.startup import readiness, warm_up
+from app.services.erasure_service import run_erasure_worker
+from app.services.partition_service import run_partition_maintainer
+import asyncio
 import os
-from dotenv import load_dotenv
 
 import logging
 
-# Load environment variables
-load_dotenv()
-
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging once for the whole process
+configure_logging()
 logger = logging.getLogger(__name__)
 
+# The schema is managed by Alembic (backend/migrations): run `alembic upgrade head`
+# before starting the app, not on every worker boot
+
+
+async def _cancel(task: asyncio.Task):
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open pooled connections and build the taxonomy payloads before taking traffic
+    await warm_up(engine, SessionLocal, settings.DB_POOL_WARM_CONNECTIONS)
+
+    # The openai import is slow; do it in the background so it doesn't delay startup
+    app.state.llm_preload = asyncio.create_task(run_in_threadpool(llm.preload))
+    app.state.usage_flusher = asyncio.create_task(run_usage_flusher(
+        rate_limiter.recorder, SessionLocal, float(os.getenv("RATE_LIMIT_USAGE_FLUSH_SECONDS", "60"))
+    ))
+    app.state.explain_worker = asyncio.create_task(run_explain_worker(
+        slow_query_log, engine, float(os.getenv("EXPLAIN_WORKER_INTERVAL_SECONDS", "5"))
+    ))
+    # Keep monthly journal_entries partitions created ahead (PostgreSQL only)
+    app.state.partition_maintainer = asyncio.create_task(run_partition_maintainer(
+        engine, float(os.getenv("PARTITION_MAINTENANCE_INTERVAL_SECONDS", "43200"))
+    ))
+    # Pick up account erasures whose worker stopped before finishing
+    app.state.erasure_worker = asyncio.create_task(run_erasure_worker(
+        SessionLocal, float(os.getenv("ERASURE_WORKER_INTERVAL_SECONDS", "60"))
+    ))
+    readiness.started = True
+    try:
+        yield
+    finally:
+        # Already set on SIGTERM under gunicorn (app.core.worker); this covers plain uvicorn
+        readiness.draining = True
+        await _cancel(app.state.erasure_worker)
+        await _cancel(app.state.partition_maintainer)
+        await _cancel(app.state.explain_worker)
+        await _cancel(app.state.usage_flusher)
+        await _cancel(app.state.llm_preload)
+
 
 # Initialize FastAPI app
 
 app = FastAPI(
+    lifespan=lifespan,
     title="Feel-Write API",
     description="""
     Feel-Write API Documentation - Emotional Journaling and Reflection Platform
@@ -239,6 +293,22 @@ app = FastAPI(
       }
       ```
 
+    * `DELETE /api/users/{user_id}` - Erase the user and everything they wrote (202, runs in the background)
+    * `GET /api/users/{user_id}/erasure` - Erasure progress
+      Response:
+      ```json
+      {
+        "userId": "user1",
+        "status": "running",
+        "deleted": {"chat_messages": 120, "chat_sessions": 4, "journal_entries": 3000},
+        "imagesRemoved": 0,
+        "error": null,
+        "requestedAt": "2024-03-20T10:30:00Z",
+        "finishedAt": null,
+        "statusUrl": "/api/users/user1/erasure"
+      }
+      ```
+
     ### Analytics
     * `GET /api/user/streak` - Get user's streak information
       Response:
@@ -350,6 +420,7 @@ app = FastAPI(
     openapi_url="/api/openapi.json",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -362,10 +433,25 @@ app.add_middleware(
     ],
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
-    allow_headers=["Content-Type", "Authorization", "accept"],
-    expose_headers=["Content-Type"]
+    allow_headers=["Content-Type", "Authorization", "accept", "X-User-Id", "If-None-Match", "X-Request-ID"],
+    expose_headers=["Content-Type", "Content-Encoding", "ETag", "Retry-After", "Server-Timing", "X-Request-ID", "X-RateLimit-Limit", "X-RateLimit-Remaining"]
 )
 
+# Per-user rate limits on the AI endpoints
+app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+
+# brotli/gzip for large JSON responses (catalog payloads arrive pre-compressed)
+app.add_middleware(CompressionMiddleware)
+
+# Pins a client to the primary for a few seconds after it writes (only with read replicas)
+app.add_middleware(ReadYourWritesMiddleware, window=settings.READ_YOUR_WRITES_SECONDS, enabled=bool(db_router.replicas))
+
+# Server-Timing, per-request query counts and /metrics histograms; outside the limiter so it also times rejected requests
+app.add_middleware(TimingMiddleware)
+
+# Request IDs on every log line; outermost so all middleware logs carry them
+app.add_middleware(CorrelationIdMiddleware)
+
 # Include routers with descriptions
 app.include_router(
     journal.router,
@@ -416,6 +502,13 @@ app.include_router(
     responses={404: {"description": "Not found"}},
 )
 
+app.include_router(
+    bot.router,
+    prefix="/api/bot",
+    tags=["bot"],
+    responses={404: {"description": "Not found"}},
+)
+
 # Include analytics router
 app.include_router(
     analytics.router,
@@ -424,6 +517,20 @@ app.include_router(
     responses={404: {"description": "Not found"}},
 )
 
+# Prometheus scrape endpoint
+app.include_router(metrics.router)
+
+# Liveness (/health) and readiness (/ready) probes
+app.include_router(health.router)
+
+# Diagnostics, enabled by ADMIN_API_TOKEN
+app.include_router(
+    admin.router,
+    prefix="/api/admin",
+    tags=["admin"],
+    include_in_schema=False,
+)
+
 @app.get("/", tags=["root"])
 async def root():
     """
@@ -7,7 +7,15 @@ from app.models.db_models import (
     SubEmotion,
     Prompt,
     JournalEntry,
-    Analytics
+    UserProfile,
+    Analytics,
+    UserStreak,
+    ActivityYear,
+    ChatSession,
+    ChatMessage,
+    ApiUsage,
+    LegacyId,
+    UserErasure
 )
 
 __all__ = [
@@ -16,5 +24,13 @@ __all__ = [
     "SubEmotion",
     "Prompt",
     "JournalEntry",
-    "Analytics"
+    "UserProfile",
+    "Analytics",
+    "UserStreak",
+    "ActivityYear",
+    "ChatSession",
+    "ChatMessage",
+    "ApiUsage",
+    "LegacyId",
+    "UserErasure"
 ]
@@ -1,11 +1,32 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean, JSON, DateTime, func
+from sqlalchemy import Column, Integer, BigInteger, String, Text, ForeignKey, Boolean, JSON, Date, DateTime, Index, LargeBinary, UniqueConstraint, Uuid, func
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
+from app.core.ids import to_api_id, to_uuid
 from app.database import Base
 
+# JSONB in production, plain JSON on SQLite (tests and benchmarks)
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+class UUIDType(TypeDecorator):
+    """Native ``uuid`` on PostgreSQL (CHAR(32) on SQLite), plain strings in Python (see app.core.ids)."""
+    impl = Uuid
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else to_uuid(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else to_api_id(value)
+
+# The schema itself is owned by the Alembic migrations in backend/migrations;
+# keep these models in step with them (tests/test_migrations.py checks).
+
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(String(36), primary_key=True)
+    id = Column(UUIDType, primary_key=True)
     email = Column(String(255), unique=True, nullable=False)
     username = Column(String(50), unique=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
@@ -28,7 +49,7 @@ class SubEmotion(Base):
     __tablename__ = "sub_emotions"
 
     id = Column(Integer, primary_key=True)
-    category_id = Column(Integer, ForeignKey("emotion_categories.id"), nullable=False)
+    category_id = Column(Integer, ForeignKey("emotion_categories.id"))
     name = Column(String(50), nullable=False)
     description = Column(Text)
     intensity = Column(Integer)
@@ -48,24 +69,139 @@ class Prompt(Base):
 class JournalEntry(Base):
     __tablename__ = "journal_entries"
 
-    id = Column(String(36), primary_key=True)
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
+    # On PostgreSQL the table is partitioned by month of created_at and its primary
+    # key is (id, created_at) (see app.services.partition_service); ids are UUIDs,
+    # so id alone still identifies a row
+    id = Column(UUIDType, primary_key=True)
+    user_id = Column(UUIDType, ForeignKey("users.id"), nullable=False)
     category_id = Column(Integer, ForeignKey("emotion_categories.id"))
     sub_emotion_id = Column(Integer, ForeignKey("sub_emotions.id"))
     text = Column(Text, nullable=False)
     photo_url = Column(Text, nullable=True)
-    reflections = Column(JSON, nullable=False, server_default='[]')
+    reflections = Column(JSONType, nullable=False, server_default='[]')
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
 
     category = relationship("EmotionCategory")
     sub_emotion = relationship("SubEmotion")
 
+    # Full-text (GIN) index is PostgreSQL-only and lives in the migrations alone
+    __table_args__ = (
+        Index("idx_journal_entries_user_created", user_id, created_at.desc()),
+        Index("idx_journal_entries_category_id", category_id),
+        Index("idx_journal_entries_created_at", created_at),
+    )
+
+class UserProfile(Base):
+    __tablename__ = "user_profiles"
+
+    user_id = Column(UUIDType, ForeignKey("users.id"), primary_key=True)
+    name = Column(String(100))
+    avatar_url = Column(Text)
+    stats = Column(JSONType, nullable=False, server_default='{}')
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
 class Analytics(Base):
     __tablename__ = "analytics"
 
     id = Column(Integer, primary_key=True)
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
-    date = Column(DateTime(timezone=True), nullable=False)
-    emotion_counts = Column(JSON, nullable=False, server_default='{}')
+    user_id = Column(UUIDType, ForeignKey("users.id"), nullable=False)
+    date = Column(Date, nullable=False)
+    current_streak = Column(Integer, server_default='0')
+    longest_streak = Column(Integer, server_default='0')
+    last_check_in_date = Column(DateTime(timezone=True))
+    mood_distribution = Column(JSONType, nullable=False, server_default='{}')
+    sub_emotion_counts = Column(JSONType, nullable=False, server_default='{}')
+    timeline = Column(JSONType, nullable=False, server_default='[]')
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("idx_analytics_user_date", "user_id", "date"),
+    )
+
+class UserStreak(Base):
+    __tablename__ = "user_streaks"
+
+    # Maintained incrementally by app.services.streak_service on entry creation
+    user_id = Column(UUIDType, ForeignKey("users.id"), primary_key=True)
+    timezone = Column(String(64), nullable=False, server_default="UTC")
+    current_streak = Column(Integer, nullable=False, server_default='0')
+    longest_streak = Column(Integer, nullable=False, server_default='0')
+    active_days = Column(Integer, nullable=False, server_default='0')
+    last_active_day = Column(Date, nullable=True)
+    # Bit i set = an entry on last_active_day - i (see app.core.streaks)
+    recent_days = Column(LargeBinary, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+class ActivityYear(Base):
+    __tablename__ = "activity_years"
+
+    # One bit per local day of the year (see app.core.activity), set on entry creation
+    user_id = Column(UUIDType, ForeignKey("users.id"), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    days = Column(LargeBinary, nullable=False)
+
+class ChatSession(Base):
+    __tablename__ = "chat_sessions"
+
+    id = Column(UUIDType, primary_key=True)
+    user_id = Column(UUIDType, ForeignKey("users.id"), nullable=False)
+    # Rolling summary of every message with seq <= summarized_through
+    summary = Column(Text, nullable=True)
+    summarized_through = Column(Integer, nullable=False, server_default='0')
+    message_count = Column(Integer, nullable=False, server_default='0')
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("idx_chat_sessions_user_id", "user_id"),
+    )
+
+class ChatMessage(Base):
+    __tablename__ = "chat_messages"
+
+    # Append-only log; seq is 1-based and dense within a session
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    session_id = Column(UUIDType, ForeignKey("chat_sessions.id"), nullable=False)
+    seq = Column(Integer, nullable=False)
+    role = Column(String(16), nullable=False)
+    content = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("session_id", "seq", name="uq_chat_messages_session_seq"),
+    )
+
+class ApiUsage(Base):
+    __tablename__ = "api_usage"
+
+    # user_key is "user:<id>" or "ip:<address>" for anonymous callers
+    user_key = Column(String(100), primary_key=True)
+    route = Column(String(50), primary_key=True)
+    day = Column(Date, primary_key=True)
+    request_count = Column(Integer, nullable=False, server_default='0')
+    rejected_count = Column(Integer, nullable=False, server_default='0')
+
+class LegacyId(Base):
+    __tablename__ = "legacy_ids"
+
+    # A non-UUID id as it was before migration 0006; rows store md5(legacy_id)::uuid
+    legacy_id = Column(String(36), primary_key=True)
+
+class UserErasure(Base):
+    __tablename__ = "user_erasures"
+
+    # Outlives the users row it erases, so no foreign key (see app.services.erasure_service)
+    user_id = Column(UUIDType, primary_key=True)
+    status = Column(String(16), nullable=False, server_default="pending")
+    # Rows deleted so far, by table
+    deleted = Column(JSONType, nullable=False, server_default='{}')
+    images_removed = Column(Integer, nullable=False, server_default='0')
+    error = Column(Text, nullable=True)
+    # The worker running the job holds it until lease_until, renewed every batch
+    lease_owner = Column(String(36), nullable=True)
+    lease_until = Column(DateTime(timezone=True), nullable=True)
+    requested_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -5,10 +5,14 @@ from app.schemas.user import UserCreate, UserResponse
 from app.schemas.journal import JournalEntryCreate, JournalEntryResponse
 from app.schemas.emotion import EmotionCategoryResponse, SubEmotionResponse
 from app.schemas.prompt import PromptResponse
+from app.schemas.chat import ChatSessionCreate, ChatSessionResponse, ChatMessageCreate, ChatMessageResponse
+from app.schemas.streak import StreakResponse, ActivityYearResponse
 
 __all__ = [
     "UserCreate", "UserResponse",
     "JournalEntryCreate", "JournalEntryResponse",
     "EmotionCategoryResponse", "SubEmotionResponse",
-    "PromptResponse"
+    "PromptResponse",
+    "ChatSessionCreate", "ChatSessionResponse", "ChatMessageCreate", "ChatMessageResponse",
+    "StreakResponse", "ActivityYearResponse"
 ]
@@ -0,0 +1,27 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+class ChatSessionCreate(BaseModel):
+    userId: str
+
+class ChatSessionResponse(BaseModel):
+    id: str
+    userId: str
+    summary: Optional[str] = None
+    messageCount: int
+    createdAt: datetime
+    updatedAt: datetime
+
+class ChatMessageCreate(BaseModel):
+    content: str = Field(..., min_length=1)
+
+class ChatMessageResponse(BaseModel):
+    seq: int
+    role: str
+    content: str
+    createdAt: datetime
+
+class ChatReplyResponse(BaseModel):
+    sessionId: str
+    message: ChatMessageResponse
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional
+from app.schemas.prompt import PromptResponse
 
 class EmotionCategoryBase(BaseModel):
     name: str
@@ -31,3 +32,9 @@ class SubEmotionResponse(SubEmotionBase):
 
     class Config:
         from_attributes = True
+
+class EmotionCatalogResponse(BaseModel):
+    version: str
+    categories: List[EmotionCategoryResponse]
+    subEmotions: List[SubEmotionResponse]
+    prompts: List[PromptResponse]
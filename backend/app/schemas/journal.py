@@ -17,7 +17,10 @@ class JournalEntryBase(BaseModel):
     reflections: List[dict] = Field(default_factory=list)
 
 class JournalEntryCreate(JournalEntryBase):
-    pass
+    # Back-dated imports set created_at; defaults to now
+    created_at: Optional[datetime] = None
+    # IANA name of the writer's timezone; decides which day counts towards the streak
+    timezone: Optional[str] = None
 
 class JournalEntryUpdate(BaseModel):
     reflection_text: Optional[str] = None
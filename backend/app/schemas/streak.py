@@ -0,0 +1,28 @@
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class StreakDay(BaseModel):
+    date: date
+    hasEntry: bool
+
+
+class StreakResponse(BaseModel):
+    currentStreak: int
+    longestStreak: int
+    # Distinct days with at least one entry
+    streakDays: int
+    lastCheckInDate: Optional[date]
+    timezone: str
+    streakHistory: List[StreakDay]
+
+
+class ActivityYearResponse(BaseModel):
+    year: int
+    timezone: str
+    activeDays: int
+    # Longest run of consecutive active days within the year
+    longestStreak: int
+    activeDates: List[date]
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field
+from typing import Dict, Optional
 from datetime import datetime
 
 class UserBase(BaseModel):
@@ -21,3 +21,16 @@ class UserResponse(UserBase):
 
     class Config:
         from_attributes = True
+
+class UserErasureResponse(BaseModel):
+    user_id: str = Field(alias="userId")
+    status: str
+    deleted: Dict[str, int]
+    images_removed: int = Field(alias="imagesRemoved")
+    error: Optional[str] = None
+    requested_at: datetime = Field(alias="requestedAt")
+    finished_at: Optional[datetime] = Field(None, alias="finishedAt")
+    status_url: str = Field(alias="statusUrl")
+
+    class Config:
+        populate_by_name = True
@@ -0,0 +1,3 @@
+"""
+Services shared by the API routers
+"""
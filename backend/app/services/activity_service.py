@@ -0,0 +1,44 @@
+"""
+Per-user-year activity bitmaps, kept in step with journal entries.
+
+Writes happen inside ``streak_service.record_activity``, under the user's
+locked ``user_streaks`` row, so concurrent entries for one user never race on
+a year's bitmap. Reads are a single primary-key lookup per year.
+"""
+from datetime import date
+from typing import Dict, Iterable, Set
+
+from sqlalchemy.orm import Session
+
+from app.core.activity import day_bit, days_between, from_bytes, to_bytes, year_bitmaps
+from app.models.db_models import ActivityYear
+
+
+def mark_day(db: Session, user_id: str, day: date):
+    """Set ``day`` in the user's bitmap for its year."""
+    row = db.get(ActivityYear, (user_id, day.year))
+    if row is None:
+        db.add(ActivityYear(user_id=user_id, year=day.year, days=to_bytes(day_bit(day))))
+    else:
+        row.days = to_bytes(from_bytes(row.days) | day_bit(day))
+
+
+def add_days(db: Session, user_id: str, days: Iterable[date]):
+    """Bitmaps for a user rebuilt from their entries; the user must have none yet."""
+    db.add_all(
+        ActivityYear(user_id=user_id, year=year, days=to_bytes(bits))
+        for year, bits in year_bitmaps(days).items()
+    )
+
+
+def load_years(db: Session, user_id: str, start_year: int, end_year: int) -> Dict[int, int]:
+    rows = (
+        db.query(ActivityYear.year, ActivityYear.days)
+        .filter(ActivityYear.user_id == user_id, ActivityYear.year.between(start_year, end_year))
+    )
+    return {year: from_bytes(days) for year, days in rows}
+
+
+def active_days_between(db: Session, user_id: str, start: date, end: date) -> Set[date]:
+    """Active local days in ``[start, end]``, read from the year bitmaps instead of journal_entries."""
+    return days_between(load_years(db, user_id, start.year, end.year), start, end)
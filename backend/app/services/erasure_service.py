@@ -0,0 +1,260 @@
+"""
+Batched account erasure.
+
+Nothing references ``users(id)`` with ``ON DELETE CASCADE``, and a long
+journal is too big to delete in one transaction, so ``DELETE /api/users/{id}``
+queues an erasure instead. The job deletes the user's rows child tables
+first, ``ERASURE_BATCH_SIZE`` rows per transaction, so no transaction holds
+row locks for long and replicas never receive one huge delete. Each batch
+records its progress in ``user_erasures`` in the same transaction, so a
+restarted job resumes from what is actually gone. The last transaction
+deletes the small per-user tables and the ``users`` row together.
+
+Jobs start right away in the worker that received the request and are
+resumed by ``run_erasure_worker`` in any worker if that one died. A job holds
+a lease that it renews on every batch, so two workers never run the same
+erasure.
+"""
+import asyncio
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Set
+
+from sqlalchemy import delete, null, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.events import USER_DELETED, event_bus
+from app.core.ids import to_uuid
+from app.models.db_models import (
+    ActivityYear, Analytics, ApiUsage, ChatMessage, ChatSession, JournalEntry, User, UserErasure,
+    UserProfile, UserStreak,
+)
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = int(os.getenv("ERASURE_BATCH_SIZE", "1000"))
+LEASE_SECONDS = 60.0
+# Rows written for the user while the job runs are caught by another pass
+MAX_PASSES = 3
+
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+ACTIVE = (PENDING, RUNNING)
+
+# Uploads are served from here (see app.api.images); other photo URLs are hosted elsewhere
+IMAGE_URL_PREFIX = "/api/images/"
+
+
+class LeaseLost(Exception):
+    """Another worker took over the erasure (our lease expired)."""
+
+
+def stored_image_ids(urls: List[str]) -> List[str]:
+    return [url[len(IMAGE_URL_PREFIX):] for url in urls if url and url.startswith(IMAGE_URL_PREFIX)]
+
+
+def remove_stored_images(image_ids: List[str]) -> int:
+    """
+    Delete uploaded images; returns how many were removed. ``app.api.images``
+    does not persist uploads yet, so there is nothing to delete until it does.
+    """
+    return 0
+
+
+def _batched_steps(user_id: str):
+    """(table, key column, select of (key, photo URL)) in delete order: children before parents."""
+    no_photo = null().label("photo_url")
+    return [
+        ("chat_messages", ChatMessage.id,
+         select(ChatMessage.id, no_photo).join(ChatSession, ChatMessage.session_id == ChatSession.id)
+         .where(ChatSession.user_id == user_id)),
+        ("chat_sessions", ChatSession.id, select(ChatSession.id, no_photo).where(ChatSession.user_id == user_id)),
+        ("journal_entries", JournalEntry.id,
+         select(JournalEntry.id, JournalEntry.photo_url).where(JournalEntry.user_id == user_id)),
+        ("analytics", Analytics.id, select(Analytics.id, no_photo).where(Analytics.user_id == user_id)),
+    ]
+
+
+def _final_deletes(user_id: str):
+    """Tables with at most a few rows per user, deleted with the users row."""
+    usage_keys = {f"user:{user_id}", f"user:{to_uuid(user_id)}"}
+    return [
+        ("user_profiles", delete(UserProfile).where(UserProfile.user_id == user_id)),
+        ("user_streaks", delete(UserStreak).where(UserStreak.user_id == user_id)),
+        ("activity_years", delete(ActivityYear).where(ActivityYear.user_id == user_id)),
+        ("api_usage", delete(ApiUsage).where(ApiUsage.user_key.in_(usage_keys))),
+        ("users", delete(User).where(User.id == user_id)),
+    ]
+
+
+def request_erasure(db: Session, user_id: str) -> UserErasure:
+    """Queue an erasure of ``user_id``, or return the existing one; a failed one is queued again."""
+    erasure = db.get(UserErasure, user_id)
+    if erasure is None:
+        erasure = UserErasure(user_id=user_id, status=PENDING, deleted={}, images_removed=0)
+        db.add(erasure)
+    elif erasure.status == FAILED:
+        erasure.status, erasure.error, erasure.finished_at = PENDING, None, None
+    db.commit()
+    db.refresh(erasure)
+    return erasure
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def claim(db: Session, user_id: str, owner: str, lease: float = LEASE_SECONDS) -> bool:
+    """Take the erasure's lease if it is queued and nobody else holds a live one."""
+    now = _now()
+    result = db.execute(
+        update(UserErasure)
+        .where(
+            UserErasure.user_id == user_id,
+            UserErasure.status.in_(ACTIVE),
+            or_(UserErasure.lease_until.is_(None), UserErasure.lease_until < now, UserErasure.lease_owner == owner),
+        )
+        .values(status=RUNNING, lease_owner=owner, lease_until=now + timedelta(seconds=lease))
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def _record(db: Session, user_id: str, owner: str, lease: float, **values):
+    """Save progress and renew the lease, in the caller's transaction."""
+    result = db.execute(
+        update(UserErasure)
+        .where(UserErasure.user_id == user_id, UserErasure.lease_owner == owner)
+        .values({"lease_until": _now() + timedelta(seconds=lease), **values})
+    )
+    if result.rowcount != 1:
+        raise LeaseLost(user_id)
+
+
+def _delete_in_batches(session_factory: sessionmaker, user_id: str, owner: str, batch_size: int, lease: float,
+                       deleted: Dict[str, int], images_removed: int,
+                       remove_images: Callable[[List[str]], int]) -> int:
+    """Empty the user's large tables, one short transaction per batch; updates ``deleted``."""
+    for table, key, keys in _batched_steps(user_id):
+        while True:
+            with session_factory() as db:
+                rows = db.execute(keys.limit(batch_size)).all()
+                if not rows:
+                    break
+                db.execute(delete(key.table).where(key.in_([row[0] for row in rows])))
+                deleted[table] = deleted.get(table, 0) + len(rows)
+                _record(db, user_id, owner, lease, deleted=dict(deleted), images_removed=images_removed)
+                db.commit()
+            # Only once the rows are gone, so a rolled-back batch never loses a photo it still shows
+            image_ids = stored_image_ids([row[1] for row in rows])
+            if image_ids:
+                images_removed += remove_images(image_ids)
+            logger.debug("Erasure of %s: %d rows from %s", user_id, len(rows), table)
+    return images_removed
+
+
+def erase_user(session_factory: sessionmaker, user_id: str, batch_size: int = BATCH_SIZE,
+               remove_images: Callable[[List[str]], int] = remove_stored_images,
+               lease: float = LEASE_SECONDS) -> Optional[Dict[str, int]]:
+    """
+    Run (or resume) the queued erasure of ``user_id``. Returns rows deleted
+    per table, or None when the erasure is not queued or another worker holds it.
+    """
+    owner = str(uuid.uuid4())
+    with session_factory() as db:
+        if not claim(db, user_id, owner, lease):
+            return None
+        erasure = db.get(UserErasure, user_id)
+        deleted: Dict[str, int] = dict(erasure.deleted or {})
+        images_removed = erasure.images_removed or 0
+
+    try:
+        for attempt in range(1, MAX_PASSES + 1):
+            images_removed = _delete_in_batches(
+                session_factory, user_id, owner, batch_size, lease, deleted, images_removed, remove_images
+            )
+            try:
+                with session_factory() as db:
+                    finished = dict(deleted)
+                    for table, statement in _final_deletes(user_id):
+                        finished[table] = finished.get(table, 0) + db.execute(statement).rowcount
+                    _record(db, user_id, owner, lease, deleted=finished, images_removed=images_removed,
+                            status=DONE, lease_owner=None, lease_until=None, finished_at=_now())
+                    db.commit()
+                deleted = finished
+                break
+            except IntegrityError:
+                # A row referencing the user was written after its table was emptied
+                if attempt == MAX_PASSES:
+                    raise
+                logger.info("Erasure of %s: new rows appeared, another pass", user_id)
+    except LeaseLost:
+        logger.warning("Erasure of %s was taken over by another worker", user_id)
+        return None
+    except Exception as e:
+        logger.error("Erasure of %s failed: %s", user_id, e, exc_info=True)
+        with session_factory() as db:
+            db.execute(
+                update(UserErasure).where(UserErasure.user_id == user_id, UserErasure.lease_owner == owner)
+                .values(status=FAILED, error=str(e), lease_owner=None, lease_until=None)
+            )
+            db.commit()
+        raise
+
+    event_bus.publish(USER_DELETED, user_id=user_id)
+    logger.info("Erased user %s: %s", user_id, deleted)
+    return deleted
+
+
+# Strong references to running jobs; the event loop only keeps weak ones
+_jobs: Set[asyncio.Task] = set()
+
+
+def start_erasure(session_factory: sessionmaker, user_id: str) -> asyncio.Task:
+    """Run the queued erasure in the threadpool, in the background."""
+    from starlette.concurrency import run_in_threadpool
+
+    async def run():
+        try:
+            await run_in_threadpool(erase_user, session_factory, user_id)
+        except Exception:
+            pass  # logged and recorded as failed by erase_user
+
+    task = asyncio.create_task(run())
+    _jobs.add(task)
+    task.add_done_callback(_jobs.discard)
+    return task
+
+
+def claimable(db: Session) -> List[str]:
+    """Queued erasures nobody is working on (never started, or their worker died)."""
+    now = _now()
+    return db.execute(
+        select(UserErasure.user_id).where(
+            UserErasure.status.in_(ACTIVE),
+            or_(UserErasure.lease_until.is_(None), UserErasure.lease_until < now),
+        ).order_by(UserErasure.requested_at)
+    ).scalars().all()
+
+
+async def run_erasure_worker(session_factory: sessionmaker, interval: float = 60.0):
+    """Every ``interval`` seconds, resume erasures left behind until cancelled."""
+    from starlette.concurrency import run_in_threadpool
+
+    def resume():
+        with session_factory() as db:
+            user_ids = claimable(db)
+        for user_id in user_ids:
+            try:
+                erase_user(session_factory, user_id)
+            except Exception:
+                pass  # recorded as failed; the next one still runs
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(resume)
+        except Exception as e:
+            logger.error("Failed to resume account erasures: %s", e)
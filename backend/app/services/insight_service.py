@@ -0,0 +1,94 @@
+"""
+Personalized insights for weekly summaries, with a rule-based fallback.
+"""
+import json
+import logging
+
+from app.core.llm import llm_client, LLMError
+
+logger = logging.getLogger(__name__)
+
+
+async def generate_insights(emotional_patterns, mood_changes, entries_text=None):
+    """
+    Generate personalized insights using OpenAI for sophisticated analysis.
+    Falls back to basic insights when the LLM client fails or its circuit is open.
+    """
+    if not emotional_patterns:
+        logger.info("No emotional patterns provided for insights generation")
+        return "No entries found for this period. Start journaling to get insights!"
+
+    try:
+        logger.debug("Preparing data for OpenAI analysis")
+        # Create the prompt for OpenAI
+        prompt = f"""
+        Analyze the following journal entry data and provide personalized insights:
+
+        Emotional Patterns:
+        {json.dumps([p.model_dump() for p in emotional_patterns], indent=2)}
+
+        Mood Changes:
+        {json.dumps([c.model_dump() for c in mood_changes], indent=2, default=str)}
+
+        Please provide:
+        1. A summary of emotional patterns and trends
+        2. Notable changes or shifts in mood
+        3. Personalized insights and observations
+        4. Gentle suggestions for emotional well-being
+
+        Format the response in a warm, supportive tone, as if you're a caring friend or therapist.
+        Keep the insights constructive and encouraging.
+        """
+
+        logger.debug("Making OpenAI API call")
+        insights = await llm_client.chat(
+            [
+                {"role": "system", "content": "You are a supportive and insightful emotional well-being assistant."},
+                {"role": "user", "content": prompt}
+            ],
+            model="gpt-3.5-turbo",
+            temperature=0.7,
+            max_tokens=500
+        )
+
+        logger.debug("Successfully received response from OpenAI")
+        logger.debug("Generated insights: %s...", insights[:100])  # Log first 100 chars
+        return insights
+
+    except LLMError as e:
+        logger.error("Error generating insights with OpenAI: %s", e)
+        # Fallback to basic insights if OpenAI fails
+        logger.info("Falling back to basic insights generation")
+        return generate_basic_insights(emotional_patterns, mood_changes)
+
+
+def generate_basic_insights(emotional_patterns, mood_changes):
+    """
+    Fallback function for basic insights generation if OpenAI fails.
+    """
+    if not emotional_patterns:
+        return "No entries found for this period. Start journaling to get insights!"
+
+    # Find dominant emotion
+    dominant_emotion = max(emotional_patterns, key=lambda x: x.count)
+
+    # Analyze mood stability
+    mood_stability = len(set(change.emotion for change in mood_changes))
+
+    insights = []
+
+    # Add emotion pattern insight
+    insights.append(f"Your dominant emotion this week was {dominant_emotion.emotion}, appearing in {dominant_emotion.percentage:.1f}% of your entries.")
+
+    # Add mood stability insight
+    if mood_stability <= 2:
+        insights.append("You've shown consistent emotional patterns this week.")
+    elif mood_stability <= 4:
+        insights.append("You've experienced a moderate range of emotions this week.")
+    else:
+        insights.append("You've had a diverse emotional experience this week.")
+
+    # Add encouragement
+    insights.append("Keep journaling to track your emotional journey and gain deeper insights!")
+
+    return " ".join(insights)
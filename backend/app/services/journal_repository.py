@@ -0,0 +1,108 @@
+"""
+Data access for journal entries.
+
+Every read joins the category and sub-emotion names in the same query, so
+handlers never look them up per entry.
+"""
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.events import JOURNAL_ENTRY_CREATED, JOURNAL_ENTRY_UPDATED, event_bus
+from app.core.ids import new_id
+from app.core.journal_mapper import journal_entry_query
+from app.models.db_models import EmotionCategory, JournalEntry, SubEmotion
+from app.services.streak_service import record_activity
+
+# (created_at, text, category name or None) for weekly summaries
+SummaryRow = Tuple[datetime, str, Optional[str]]
+
+
+class JournalRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def list_rows(self, user_id: Optional[str] = None, skip: int = 0, limit: Optional[int] = None) -> List[Sequence[Any]]:
+        """Response rows, newest first; entries with a missing category or sub-emotion are skipped."""
+        query = journal_entry_query(self.db)
+        if user_id is not None:
+            query = query.filter(JournalEntry.user_id == user_id)
+        query = query.order_by(JournalEntry.created_at.desc()).offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def all_rows(self) -> List[Sequence[Any]]:
+        return journal_entry_query(self.db).all()
+
+    def get(self, entry_id: str) -> Optional[JournalEntry]:
+        return self.db.query(JournalEntry).filter(JournalEntry.id == entry_id).first()
+
+    def names_for(self, entry: JournalEntry) -> Tuple[Optional[str], Optional[str]]:
+        """Category and sub-emotion names of an entry, in one query."""
+        row = self.db.query(EmotionCategory.name, SubEmotion.name)\
+            .select_from(JournalEntry)\
+            .outerjoin(EmotionCategory, JournalEntry.category_id == EmotionCategory.id)\
+            .outerjoin(SubEmotion, JournalEntry.sub_emotion_id == SubEmotion.id)\
+            .filter(JournalEntry.id == entry.id)\
+            .first()
+        return (row[0], row[1]) if row else (None, None)
+
+    def get_category(self, category_id: int) -> Optional[EmotionCategory]:
+        return self.db.query(EmotionCategory).filter(EmotionCategory.id == category_id).first()
+
+    def get_sub_emotion(self, sub_emotion_id: int, category_id: int) -> Optional[SubEmotion]:
+        """The sub-emotion, only if it belongs to ``category_id``."""
+        return self.db.query(SubEmotion).filter(
+            SubEmotion.id == sub_emotion_id,
+            SubEmotion.category_id == category_id
+        ).first()
+
+    def create(self, user_id: str, category_id: int, sub_emotion_id: int, text: str,
+               photo_url: Optional[str] = None, reflections: Optional[list] = None,
+               created_at: Optional[datetime] = None, timezone_name: Optional[str] = None) -> JournalEntry:
+        """Insert an entry and update the user's streak in the same transaction."""
+        created_at = created_at or datetime.now(timezone.utc)
+        entry = JournalEntry(
+            id=new_id(),
+            user_id=user_id,
+            category_id=category_id,
+            sub_emotion_id=sub_emotion_id,
+            text=text,
+            photo_url=photo_url,
+            reflections=reflections or [],
+            created_at=created_at,
+        )
+        self.db.add(entry)
+        self.db.flush()
+        record_activity(self.db, user_id, created_at, timezone_name)
+        self.db.commit()
+        self.db.refresh(entry)
+        event_bus.publish(JOURNAL_ENTRY_CREATED, user_id=user_id, entry_id=entry.id)
+        return entry
+
+    def add_reflection(self, entry: JournalEntry, prompt: str, response: str) -> JournalEntry:
+        reflection = {
+            "prompt": prompt,
+            "response": response,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        # Assign a new list so the JSON column is flagged as modified
+        entry.reflections = (entry.reflections or []) + [reflection]
+        self.db.commit()
+        self.db.refresh(entry)
+        event_bus.publish(JOURNAL_ENTRY_UPDATED, user_id=entry.user_id, entry_id=entry.id)
+        return entry
+
+    def summary_rows(self, user_id: str, start_date: datetime, end_date: datetime) -> List[SummaryRow]:
+        """The user's entries in ``[start_date, end_date]`` with their category names, oldest first."""
+        return self.db.query(JournalEntry.created_at, JournalEntry.text, EmotionCategory.name)\
+            .outerjoin(EmotionCategory, JournalEntry.category_id == EmotionCategory.id)\
+            .filter(
+                JournalEntry.user_id == user_id,
+                JournalEntry.created_at >= start_date,
+                JournalEntry.created_at <= end_date
+            )\
+            .order_by(JournalEntry.created_at)\
+            .all()
@@ -0,0 +1,186 @@
+"""
+Monthly range partitions of ``journal_entries`` on PostgreSQL.
+
+Migration ``0005_partition_journal_entries`` turns the table into a parent
+partitioned by ``created_at``: rows from before the migration stay in one
+``journal_entries_legacy`` partition, later months get one partition each
+(UTC month boundaries) and a default partition catches anything outside them.
+This module keeps partitions created ``JOURNAL_PARTITION_MONTHS_AHEAD`` months
+ahead, so the default partition stays empty, and detaches old months for
+archiving. On SQLite, or before the migration, everything here is a no-op.
+
+Runs in the app (see ``run_partition_maintainer``) and from the command line::
+
+    python -m app.services.partition_service ensure
+    python -m app.services.partition_service archive --before 2024-01
+"""
+import argparse
+import asyncio
+import logging
+import os
+import re
+from datetime import date, datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+PARENT = "journal_entries"
+LEGACY = f"{PARENT}_legacy"
+DEFAULT = f"{PARENT}_default"
+MONTHS_AHEAD = int(os.getenv("JOURNAL_PARTITION_MONTHS_AHEAD", "3"))
+
+# (partition, lower bound or None for MINVALUE, upper bound); the default partition has no bounds
+Bounds = Tuple[str, Optional[datetime], datetime]
+_BOUND = re.compile(r"FROM \((?:'([^']+)'|MINVALUE)\) TO \('([^']+)'\)")
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_p{month:%Y_%m}"
+
+
+def bound_literal(month: date) -> str:
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+def partition_ddl(month: date) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {PARENT} "
+        f"FOR VALUES FROM ({bound_literal(month)}) TO ({bound_literal(add_months(month, 1))})"
+    )
+
+
+def parse_bound(expression: str) -> Optional[Tuple[Optional[datetime], datetime]]:
+    """``(lower, upper)`` from ``pg_get_expr(relpartbound)``; None for the default partition."""
+    match = _BOUND.search(expression)
+    if match is None:
+        return None
+    lower, upper = match.groups()
+    return (datetime.fromisoformat(lower) if lower else None), datetime.fromisoformat(upper)
+
+
+def missing_months(existing: List[Bounds], first: date, months_ahead: int) -> List[date]:
+    """Months from ``first`` through ``months_ahead`` later that no existing partition covers."""
+    missing = []
+    for offset in range(months_ahead + 1):
+        month = add_months(first, offset)
+        start = datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+        # The legacy partition already covers the month the migration ran in
+        if not any((lower is None or lower <= start) and start < upper for _, lower, upper in existing):
+            missing.append(month)
+    return missing
+
+
+def is_partitioned(conn: Connection) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    return bool(conn.execute(
+        text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:parent))"),
+        {"parent": PARENT},
+    ).scalar())
+
+
+def list_partitions(conn: Connection) -> List[Bounds]:
+    """Bounded partitions of ``journal_entries``, oldest first."""
+    # Bounds are rendered in the session timezone; pin it so they parse the same everywhere
+    conn.exec_driver_sql("SET LOCAL timezone = 'UTC'")
+    rows = conn.execute(text(
+        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = to_regclass(:parent)"
+    ), {"parent": PARENT})
+    partitions = []
+    for name, expression in rows:
+        bound = parse_bound(expression)
+        if bound is not None:
+            partitions.append((name, *bound))
+    return sorted(partitions, key=lambda p: p[2])
+
+
+def _lock(conn: Connection):
+    # One worker at a time, so concurrent starts don't race on CREATE TABLE
+    conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:parent))"), {"parent": PARENT})
+
+
+def ensure_partitions(engine: Engine, months_ahead: int = MONTHS_AHEAD, today: Optional[date] = None) -> List[str]:
+    """Create missing partitions for this month through ``months_ahead`` months ahead; returns their names."""
+    first = month_start(today or datetime.now(timezone.utc).date())
+    created = []
+    with engine.begin() as conn:
+        if not is_partitioned(conn):
+            return created
+        _lock(conn)
+        for month in missing_months(list_partitions(conn), first, months_ahead):
+            conn.exec_driver_sql(partition_ddl(month))
+            created.append(partition_name(month))
+    if created:
+        logger.info("Created journal_entries partitions: %s", ", ".join(created))
+    return created
+
+
+def detach_before(engine: Engine, before: date) -> List[str]:
+    """
+    Detach partitions holding only entries older than ``before`` (a month
+    start). Detached tables keep their rows for ``pg_dump`` and ``DROP``;
+    streaks and activity bitmaps are unaffected.
+    """
+    cutoff = datetime(before.year, before.month, 1, tzinfo=timezone.utc)
+    detached = []
+    with engine.begin() as conn:
+        if not is_partitioned(conn):
+            return detached
+        _lock(conn)
+        for name, _, upper in list_partitions(conn):
+            if upper <= cutoff:
+                # Catalog-only but briefly locks the parent; CONCURRENTLY is not allowed
+                # while a default partition exists
+                conn.exec_driver_sql(f"ALTER TABLE {PARENT} DETACH PARTITION {name}")
+                detached.append(name)
+    if detached:
+        logger.info("Detached journal_entries partitions: %s", ", ".join(detached))
+    return detached
+
+
+async def run_partition_maintainer(engine: Engine, interval: float = 43200.0):
+    """Create upcoming partitions now and every ``interval`` seconds until cancelled."""
+    from starlette.concurrency import run_in_threadpool
+
+    while True:
+        try:
+            await run_in_threadpool(ensure_partitions, engine)
+        except Exception as e:
+            logger.error("Failed to create journal_entries partitions: %s", e)
+        await asyncio.sleep(interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain monthly journal_entries partitions")
+    commands = parser.add_subparsers(dest="command", required=True)
+    ensure = commands.add_parser("ensure", help="create upcoming monthly partitions")
+    ensure.add_argument("--months-ahead", type=int, default=MONTHS_AHEAD)
+    archive = commands.add_parser("archive", help="detach partitions older than a month")
+    archive.add_argument("--before", required=True, type=lambda s: datetime.strptime(s, "%Y-%m").date(),
+                         help="first month to keep, as YYYY-MM")
+    args = parser.parse_args(argv)
+
+    from app.database import engine
+
+    if args.command == "ensure":
+        names = ensure_partitions(engine, args.months_ahead)
+    else:
+        names = detach_before(engine, args.before)
+    print("\n".join(names) or "nothing to do")
+
+
+if __name__ == "__main__":
+    main()
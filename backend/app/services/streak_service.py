@@ -0,0 +1,149 @@
+"""
+Per-user streak state, kept in step with journal entries.
+
+``record_activity`` runs inside the transaction that inserts an entry and
+touches a single ``user_streaks`` row, locked (``SELECT ... FOR UPDATE`` on
+PostgreSQL) so concurrent entries for one user apply one after the other.
+The same lock covers the user's year bitmaps in ``activity_service``, which
+also serve back-dated recomputes. Users without a row yet are rebuilt once
+from their entries.
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import and_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.activity import from_bytes
+from app.core.streaks import StreakState, local_day, parse_timezone, rebuild, window_from_bytes, window_to_bytes
+from app.models.db_models import ActivityYear, JournalEntry, UserStreak
+from app.services.activity_service import active_days_between, add_days, mark_day
+
+
+def active_days(db: Session, user_id: str, tz: ZoneInfo,
+                start: Optional[date] = None, end: Optional[date] = None) -> Set[date]:
+    """Local days in ``[start, end]`` with at least one entry (range scan on user_id, created_at)."""
+    query = db.query(JournalEntry.created_at).filter(JournalEntry.user_id == user_id)
+    if start is not None:
+        query = query.filter(JournalEntry.created_at >= datetime.combine(start, time.min, tz))
+    if end is not None:
+        query = query.filter(JournalEntry.created_at < datetime.combine(end + timedelta(days=1), time.min, tz))
+    return {local_day(created_at, tz) for (created_at,) in query}
+
+
+def to_state(row: UserStreak) -> StreakState:
+    return StreakState(
+        current=row.current_streak,
+        longest=row.longest_streak,
+        active_days=row.active_days,
+        last_day=row.last_active_day,
+        window=window_from_bytes(row.recent_days),
+    )
+
+
+def _store(row: UserStreak, state: StreakState):
+    row.current_streak = state.current
+    row.longest_streak = state.longest
+    row.active_days = state.active_days
+    row.last_active_day = state.last_day
+    row.recent_days = window_to_bytes(state.window)
+
+
+def _locked_row(db: Session, user_id: str) -> Optional[UserStreak]:
+    return db.query(UserStreak).filter(UserStreak.user_id == user_id).with_for_update().first()
+
+
+def _create_row(db: Session, user_id: str, tz: ZoneInfo, days: Optional[Iterable[date]] = None) -> Optional[UserStreak]:
+    """
+    Insert the user's state and year bitmaps, rebuilt from ``days`` or else
+    their entries; None if a concurrent request created them first.
+    """
+    days = set(active_days(db, user_id, tz) if days is None else days)
+    row = UserStreak(user_id=user_id, timezone=tz.key)
+    _store(row, rebuild(days))
+    try:
+        with db.begin_nested():
+            db.add(row)
+            add_days(db, user_id, days)
+    except IntegrityError:
+        return None
+    return row
+
+
+def record_activity(db: Session, user_id: str, moment: datetime, timezone_name: Optional[str] = None) -> UserStreak:
+    """
+    Count an entry written at ``moment`` towards the user's streak.
+
+    ``timezone_name`` (IANA) replaces the user's stored timezone for this and
+    later days; raises ``ValueError`` if it is unknown. Call after the entry
+    is flushed and before the commit.
+    """
+    tz = parse_timezone(timezone_name) if timezone_name else None
+    row = _locked_row(db, user_id)
+    if row is None:
+        row = _create_row(db, user_id, tz or ZoneInfo("UTC"))
+        if row is not None:
+            # Rebuilt from entries, which already include this one
+            return row
+        row = _locked_row(db, user_id)
+
+    if tz is not None and tz.key != row.timezone:
+        row.timezone = tz.key
+    tz = parse_timezone(row.timezone)
+    state = to_state(row)
+    day = local_day(moment, tz)
+    if state.record(day, lambda start, end: active_days_between(db, user_id, start, end)):
+        _store(row, state)
+        mark_day(db, user_id, day)
+    return row
+
+
+def load_streak(db: Session, user_id: str) -> Tuple[StreakState, ZoneInfo]:
+    """The user's state and timezone; the row is created on first read for users with entries."""
+    row = db.query(UserStreak).filter(UserStreak.user_id == user_id).first()
+    if row is None:
+        tz = ZoneInfo("UTC")
+        days = active_days(db, user_id, tz)
+        if not days:
+            return StreakState(), tz
+        row = _create_row(db, user_id, tz, days)
+        db.commit()
+        if row is None:
+            row = db.query(UserStreak).filter(UserStreak.user_id == user_id).first()
+    return to_state(row), parse_timezone(row.timezone)
+
+
+def load_activity_year(db: Session, user_id: str, year: Optional[int] = None) -> Tuple[int, int, ZoneInfo]:
+    """
+    ``(year, bitmap, timezone)`` for one year of the user's activity, the
+    current local year by default, in a single read of the user's streak row
+    joined to the year's bitmap.
+    """
+    if year is None:
+        # The local year is the UTC year give or take one near New Year
+        # (offsets span -12h..+14h); fetch both and pick after the timezone is known
+        now = datetime.now(timezone.utc)
+        years = {(now - timedelta(hours=12)).year, (now + timedelta(hours=14)).year}
+    else:
+        years = {year}
+
+    def read():
+        return (
+            db.query(UserStreak.timezone, ActivityYear.year, ActivityYear.days)
+            .outerjoin(ActivityYear, and_(ActivityYear.user_id == UserStreak.user_id, ActivityYear.year.in_(years)))
+            .filter(UserStreak.user_id == user_id)
+            .all()
+        )
+
+    rows = read()
+    if not rows:
+        # No state yet: rebuild it (and the bitmaps) from the user's entries
+        load_streak(db, user_id)
+        rows = read()
+    tz = parse_timezone(rows[0].timezone) if rows else ZoneInfo("UTC")
+    if year is None:
+        year = datetime.now(tz).year
+    bits = next((from_bytes(row.days) for row in rows if row.year == year), 0)
+    return year, bits, tz
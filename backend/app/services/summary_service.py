@@ -0,0 +1,141 @@
+"""
+Weekly summaries of a user's journal entries.
+"""
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.ids import to_uuid
+from app.core.logging_config import debug_sampled
+from app.core.db_routing import is_replica
+from app.core.result_cache import result_cache
+from app.core.serialization import dumps
+from app.core.single_flight import single_flight
+from app.schemas.journal import WeeklySummaryResponse, EmotionalPattern, MoodChange
+from app.services.insight_service import generate_insights
+from app.services.journal_repository import JournalRepository, SummaryRow
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_PERIOD_DAYS = 7
+
+# List of positive quotes
+POSITIVE_QUOTES = [
+    "Every day is a new beginning. Take a deep breath and start again.",
+    "You are stronger than you think, braver than you believe, and smarter than you know.",
+    "The only way to do great work is to love what you do.",
+    "Your present circumstances don't determine where you can go; they merely determine where you start.",
+    "Believe you can and you're halfway there.",
+    "The best way to predict your future is to create it.",
+    "You are never too old to set another goal or to dream a new dream.",
+    "Every moment is a fresh beginning.",
+    "You are enough just as you are.",
+    "The sun will rise and we will try again.",
+    "Your potential is endless. Go do what you were created to do.",
+    "Today is a perfect day to start something new.",
+    "You are capable of amazing things.",
+    "The only limit to our realization of tomorrow is our doubts of today.",
+    "You are braver than you believe, stronger than you seem, and smarter than you think."
+]
+
+
+def random_quote() -> str:
+    return random.choice(POSITIVE_QUOTES)
+
+
+def analyze_entries(rows: List[SummaryRow]):
+    """
+    Emotional patterns, key themes, mood changes and categorized texts for summary rows.
+
+    Entries without a category still count towards the percentage denominator
+    and the key themes, but not towards patterns or mood changes.
+    """
+    emotion_counts: Dict[str, int] = {}
+    entries_text = []
+    mood_changes = []
+    themes = set()
+    for created_at, text, category in rows:
+        # Analyze key themes (simple implementation - can be enhanced with NLP)
+        themes.update(text.lower().split()[:5])
+        if category is None:
+            logger.warning("Missing category for entry created at %s", created_at)
+            continue
+        if debug_sampled(logger):
+            logger.debug("Entry at %s: category %s, text length %d", created_at, category, len(text))
+        emotion_counts[category] = emotion_counts.get(category, 0) + 1
+        entries_text.append(text)
+        mood_changes.append(MoodChange(
+            date=created_at,
+            emotion=category,
+            intensity=1.0  # Can be enhanced with actual intensity calculation
+        ))
+
+    emotional_patterns = [
+        EmotionalPattern(emotion=emotion, count=count, percentage=(count / len(rows)) * 100)
+        for emotion, count in emotion_counts.items()
+    ]
+    key_themes = list(themes)[:5]  # Limit to top 5 themes
+    return emotional_patterns, key_themes, mood_changes, entries_text
+
+
+async def build_weekly_summary(db: Session, user_id: str, end_date: Optional[datetime] = None) -> WeeklySummaryResponse:
+    """
+    Summarize the user's entries from the last seven days.
+
+    Loads the period with one joined query and gives the connection back
+    before the insights text goes to the LLM.
+    """
+    end_date = end_date or datetime.utcnow()
+    start_date = end_date - timedelta(days=SUMMARY_PERIOD_DAYS)
+
+    rows = JournalRepository(db).summary_rows(user_id, start_date, end_date)
+    # End the read transaction so no connection is held while the LLM answers
+    db.rollback()
+    logger.info("Found %s entries for user %s between %s and %s", len(rows), user_id, start_date, end_date)
+
+    # If no entries found, return a summary with a positive quote
+    if not rows:
+        return WeeklySummaryResponse(
+            emotionalPatterns=[],
+            keyThemes=[],
+            moodChanges=[],
+            personalizedInsights=f"{random_quote()} Start journaling to track your emotional journey and gain deeper insights!",
+            period="week",
+            startDate=start_date,
+            endDate=end_date,
+            isAI=False
+        )
+
+    emotional_patterns, key_themes, mood_changes, entries_text = analyze_entries(rows)
+    personalized_insights = await generate_insights(emotional_patterns, mood_changes, entries_text)
+
+    return WeeklySummaryResponse(
+        emotionalPatterns=emotional_patterns,
+        keyThemes=key_themes,
+        moodChanges=mood_changes,
+        personalizedInsights=personalized_insights,
+        period="week",
+        startDate=start_date,
+        endDate=end_date,
+        isAI=True
+    )
+
+
+async def weekly_summary_json(db: Session, user_id: str) -> bytes:
+    """
+    The weekly summary as JSON, from the per-user result cache until the user
+    writes again. A miss is computed once for identical concurrent requests in
+    this worker: one query and one LLM call however many tabs ask at once.
+    """
+    async def compute() -> bytes:
+        # The session's engine is part of the key so replica and primary reads never mix
+        summary = await single_flight.run(
+            "weekly_summary", (to_uuid(user_id), db.get_bind()),
+            lambda: build_weekly_summary(db, user_id), user_id=user_id,
+        )
+        return dumps(summary.model_dump(mode="json"))
+
+    return await result_cache.cached(user_id, "weekly_summary", compute, store=not is_replica(db))
@@ -0,0 +1,112 @@
+"""
+Per-entry cost of building journal list responses for 1,000-entry pages.
+
+Compares the previous handler path (a ``JournalEntryResponse`` built per
+entry, re-validated against ``response_model`` and encoded by FastAPI) with
+``JournalRepository`` rows serialized straight to bytes by
+``app.core.journal_mapper``, both for serialization alone and including the
+query against in-memory SQLite.
+
+Run from ``backend/``:
+
+    python -m benchmarks.bench_journal_mapper
+"""
+import timeit
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.journal_mapper import row_to_dict, rows_to_json
+from app.database import Base
+from app.models.db_models import EmotionCategory, JournalEntry, SubEmotion, User
+from app.schemas.journal import JournalEntryResponse
+from app.services.journal_repository import JournalRepository
+
+PAGE_SIZE = 1000
+ADAPTER = TypeAdapter(List[JournalEntryResponse])
+
+
+def make_rows(n=PAGE_SIZE):
+    start = datetime(2024, 1, 1, 8, 0)
+    return [
+        (
+            str(uuid.uuid4()), "user-1", "happy", "Joyful",
+            "Today I went for a long walk and thought about the week. " * 3,
+            None,
+            [{"prompt": "What triggered this?", "response": "Work deadlines", "timestamp": start.isoformat()}],
+            start + timedelta(hours=i), start + timedelta(hours=i),
+        )
+        for i in range(n)
+    ]
+
+
+def pydantic_serialize(rows) -> bytes:
+    models = [JournalEntryResponse(**row_to_dict(row)) for row in rows]
+    # FastAPI's serialize_response for response_model=List[JournalEntryResponse]
+    content = jsonable_encoder(ADAPTER.dump_python(ADAPTER.validate_python(models), by_alias=True, mode="json"))
+    return ORJSONResponse(content).body
+
+
+def seeded_session(n=PAGE_SIZE):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add_all([
+            User(id="user-1", email="one@example.com", username="one", hashed_password="x"),
+            EmotionCategory(id=1, name="happy"),
+            SubEmotion(id=1, category_id=1, name="Joyful", intensity=5),
+        ])
+        db.flush()
+        db.add_all(
+            JournalEntry(id=row[0], user_id="user-1", category_id=1, sub_emotion_id=1, text=row[4],
+                         reflections=row[6], created_at=row[7], updated_at=row[8])
+            for row in make_rows(n)
+        )
+        db.commit()
+    return Session()
+
+
+def previous_handler(db) -> bytes:
+    entries = db.query(JournalEntry).filter(JournalEntry.user_id == "user-1")\
+        .order_by(JournalEntry.created_at.desc()).limit(PAGE_SIZE).all()
+    rows = []
+    for entry in entries:
+        category = db.query(EmotionCategory).filter(EmotionCategory.id == entry.category_id).first()
+        sub_emotion = db.query(SubEmotion).filter(SubEmotion.id == entry.sub_emotion_id).first()
+        rows.append((entry.id, entry.user_id, category.name, sub_emotion.name, entry.text, entry.photo_url,
+                     entry.reflections, entry.created_at, entry.updated_at))
+    db.expire_all()
+    return pydantic_serialize(rows)
+
+
+def mapper_handler(db) -> bytes:
+    return rows_to_json(JournalRepository(db).list_rows(user_id="user-1", limit=PAGE_SIZE))
+
+
+def per_entry_us(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number / PAGE_SIZE * 1e6
+
+
+def main():
+    rows = make_rows()
+    assert rows_to_json(rows) == pydantic_serialize(rows)
+    print(f"{PAGE_SIZE}-entry page, microseconds per entry")
+    print(f"  serialize  pydantic + response_model: {per_entry_us(lambda: pydantic_serialize(rows), 10):8.2f}")
+    print(f"  serialize  row mapper + orjson:       {per_entry_us(lambda: rows_to_json(rows), 10):8.2f}")
+
+    db = seeded_session()
+    print(f"  handler    ORM + per-entry lookups:   {per_entry_us(lambda: previous_handler(db), 2):8.2f}")
+    print(f"  handler    joined rows + mapper:      {per_entry_us(lambda: mapper_handler(db), 2):8.2f}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Primary-key types: index size and insert throughput.
+
+Inserts ``ROWS`` rows shaped like ``journal_entries`` (id, user_id,
+created_at, text) under three key schemes and reports rows/s plus the size of
+the primary-key and user_id indexes:
+
+- varchar-uuid4: VARCHAR(36) ids from uuid4 (before migration 0006)
+- uuid-uuid4: native uuid ids from uuid4
+- uuid-uuid7: native uuid ids from app.core.ids.uuid7 (what the app writes)
+
+Random uuid4 keys insert all over the primary-key B-tree (on PostgreSQL
+leaving half-full pages behind); time-ordered uuid7 keys append to its right
+edge. Runs on a throwaway SQLite file by default, where native uuid is only
+CHAR(32) and the locality effect shows up in throughput rather than size;
+point ``BENCH_DATABASE_URL`` at a scratch PostgreSQL database for the real
+16-byte ``uuid`` numbers:
+
+    python -m benchmarks.bench_keys
+    BENCH_DATABASE_URL=postgresql://localhost/bench python -m benchmarks.bench_keys
+    pytest benchmarks/bench_keys.py --benchmark-autosave
+"""
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import Column, DateTime, Index, MetaData, String, Table, Text, Uuid, create_engine, text
+
+from app.core.ids import uuid7
+
+ROWS = 20_000
+BATCH = 500
+USERS = 200
+
+VARIANTS = {
+    "varchar-uuid4": (String(36), lambda: str(uuid.uuid4())),
+    "uuid-uuid4": (Uuid(), uuid.uuid4),
+    "uuid-uuid7": (Uuid(), uuid7),
+}
+
+
+def make_table(metadata: MetaData, name: str, key_type) -> Table:
+    table = Table(
+        f"bench_keys_{name.replace('-', '_')}", metadata,
+        Column("id", key_type, primary_key=True),
+        Column("user_id", key_type, nullable=False),
+        Column("created_at", DateTime(timezone=True), nullable=False),
+        Column("text", Text, nullable=False),
+    )
+    Index(f"{table.name}_user_id", table.c.user_id)
+    return table
+
+
+def index_bytes(conn, table: Table) -> dict:
+    if conn.dialect.name == "postgresql":
+        return {
+            "pkey_bytes": conn.execute(text("SELECT pg_relation_size(:i)"), {"i": f"{table.name}_pkey"}).scalar(),
+            "user_index_bytes": conn.execute(text("SELECT pg_relation_size(:i)"), {"i": f"{table.name}_user_id"}).scalar(),
+        }
+    sizes = dict(conn.exec_driver_sql("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name").all())
+    return {
+        "pkey_bytes": sizes[f"sqlite_autoindex_{table.name}_1"],
+        "user_index_bytes": sizes[f"{table.name}_user_id"],
+    }
+
+
+def run_variant(engine, name: str) -> dict:
+    key_type, new_key = VARIANTS[name]
+    metadata = MetaData()
+    table = make_table(metadata, name, key_type)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    users = [new_key() for _ in range(USERS)]
+    started = datetime.now(timezone.utc)
+    try:
+        elapsed = 0.0
+        for offset in range(0, ROWS, BATCH):
+            rows = [
+                {"id": new_key(), "user_id": users[i % USERS],
+                 "created_at": started + timedelta(seconds=i), "text": "Benchmark entry"}
+                for i in range(offset, offset + BATCH)
+            ]
+            begin = time.perf_counter()
+            with engine.begin() as conn:
+                conn.execute(table.insert(), rows)
+            elapsed += time.perf_counter() - begin
+        with engine.connect() as conn:
+            sizes = index_bytes(conn, table)
+    finally:
+        metadata.drop_all(engine)
+    return {"rows_per_s": round(ROWS / elapsed), **sizes}
+
+
+def database_engine(tmp: Path):
+    return create_engine(os.getenv("BENCH_DATABASE_URL") or f"sqlite:///{tmp / 'keys.db'}")
+
+
+def test_key_types(benchmark, tmp_path):
+    engine = database_engine(tmp_path)
+    results = {}
+
+    def run_all():
+        for name in VARIANTS:
+            results[name] = run_variant(engine, name)
+
+    benchmark.pedantic(run_all, rounds=1, iterations=1)
+    engine.dispose()
+    for name, result in results.items():
+        for metric, value in result.items():
+            benchmark.extra_info[f"{name}.{metric}"] = value
+    # Native keys are narrower than their 36-character text form on every backend
+    assert results["uuid-uuid4"]["pkey_bytes"] < results["varchar-uuid4"]["pkey_bytes"]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = database_engine(Path(tmp))
+        print(f"{ROWS} inserts on {engine.dialect.name}")
+        print(f"  {'variant':<14} {'rows/s':>8} {'pkey KB':>8} {'user_id KB':>10}")
+        for name in VARIANTS:
+            r = run_variant(engine, name)
+            print(f"  {name:<14} {r['rows_per_s']:8d} {r['pkey_bytes'] // 1024:8d} {r['user_index_bytes'] // 1024:10d}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+CPU cost of logging on the weekly summary analysis path.
+
+Replays the analysis loop as it was before logging was centralized (f-string
+messages built per entry whether or not the level is enabled, plus INFO lines
+that stringify every pattern) against ``summary_service.analyze_entries``
+(lazy arguments, per-entry debug lines sampled). Both run with the JSON
+handler writing to a null stream, at INFO and at DEBUG.
+
+Run from ``backend/``:
+
+    python -m benchmarks.bench_logging
+"""
+import io
+import logging
+import time
+from datetime import datetime, timedelta
+
+from app.core.logging_config import JSONFormatter, RequestIdFilter
+from app.schemas.journal import EmotionalPattern, MoodChange
+from app.services import summary_service
+
+ENTRY_COUNT = 500
+ROUNDS = 50
+CATEGORIES = ["happy", "sad", "angry", "anxious", "calm", "excited"]
+
+legacy_logger = logging.getLogger("benchmarks.legacy_summary")
+
+
+def make_rows(n=ENTRY_COUNT):
+    start = datetime(2024, 3, 13, 8, 0)
+    return [
+        (start + timedelta(minutes=20 * i), "Today I went for a long walk and thought about the week. " * 2, CATEGORIES[i % 6])
+        for i in range(n)
+    ]
+
+
+def legacy_analyze(rows):
+    logger = legacy_logger
+    emotion_counts = {}
+    entries_text = []
+    logger.info("Analyzing emotional patterns...")
+    for i, (created_at, text, category) in enumerate(rows):
+        emotion_counts[category] = emotion_counts.get(category, 0) + 1
+        entries_text.append(text)
+        logger.debug(f"Entry {i}: Category {category}, Text length: {len(text)}")
+    emotional_patterns = [
+        EmotionalPattern(emotion=emotion, count=count, percentage=(count / len(rows)) * 100)
+        for emotion, count in emotion_counts.items()
+    ]
+    logger.info(f"Emotional patterns: {emotional_patterns}")
+    themes = set()
+    for _, text, _ in rows:
+        themes.update(text.lower().split()[:5])
+    key_themes = list(themes)[:5]
+    logger.info(f"Key themes identified: {key_themes}")
+    logger.info("Tracking mood changes...")
+    mood_changes = []
+    for created_at, text, category in rows:
+        mood_changes.append(MoodChange(date=created_at, emotion=category, intensity=1.0))
+        logger.debug(f"Mood change: {created_at} - {category}")
+    return emotional_patterns, key_themes, mood_changes, entries_text
+
+
+def cpu_ms(fn, rows):
+    started = time.process_time()
+    for _ in range(ROUNDS):
+        fn(rows)
+    return (time.process_time() - started) / ROUNDS * 1000
+
+
+def main():
+    handler = logging.StreamHandler(io.StringIO())
+    handler.addFilter(RequestIdFilter())
+    handler.setFormatter(JSONFormatter())
+    root = logging.getLogger()
+    root.handlers = [handler]
+
+    rows = make_rows()
+    print(f"{ENTRY_COUNT} entries, CPU ms per summary analysis")
+    for level in (logging.INFO, logging.DEBUG):
+        root.setLevel(level)
+        handler.stream = io.StringIO()
+        legacy = cpu_ms(legacy_analyze, rows)
+        legacy_bytes = handler.stream.tell()
+        handler.stream = io.StringIO()
+        current = cpu_ms(summary_service.analyze_entries, rows)
+        current_bytes = handler.stream.tell()
+        print(
+            f"  {logging.getLevelName(level):<5}  before {legacy:7.2f} ms ({legacy_bytes // ROUNDS:>7} B logged)"
+            f"   after {current:7.2f} ms ({current_bytes // ROUNDS:>6} B logged)"
+            f"   saved {100 * (1 - current / legacy):5.1f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Route-level latency and query-count benchmarks.
+
+Every endpoint runs against in-memory SQLite with a stubbed LLM. Each route
+has a query budget that fails the run when exceeded (catching N+1
+regressions deterministically); latency regressions are caught by comparing
+against a saved pytest-benchmark run:
+
+    pytest benchmarks/bench_routes.py --benchmark-autosave
+    pytest benchmarks/bench_routes.py --benchmark-compare --benchmark-compare-fail=median:25%
+"""
+import itertools
+import uuid
+
+import pytest
+
+from benchmarks.conftest import BENCH_USER_ID
+
+ENTRY_ID = str(uuid.UUID(int=1))
+_unique = itertools.count()
+
+
+def unique(prefix: str) -> str:
+    return f"{prefix}-{next(_unique)}"
+
+
+# (name, method, path or path factory, json body factory, query budget)
+ROUTES = [
+    ("journal.list", "GET", "/api/journal/", None, 1),
+    ("journal.create", "POST", "/api/journal/", lambda: {
+        "user_id": BENCH_USER_ID, "category_id": 1, "sub_emotion_id": 1, "text": "Benchmark entry",
+    }, 7),  # includes the locked streak row read; a new day adds the year bitmap read/write
+    ("journal.weekly_summary", "GET", f"/api/journal/weekly-summary?user_id={BENCH_USER_ID}", None, 1),
+    ("journal.debug_entries", "GET", "/api/journal/debug/entries", None, 1),
+    ("journal.by_user", "GET", f"/api/journal/user/{BENCH_USER_ID}", None, 1),
+    ("journal.get", "GET", f"/api/journal/{ENTRY_ID}", None, 2),
+    ("journal.add_reflection", "PATCH", f"/api/journal/{ENTRY_ID}", lambda: {
+        "prompt": "Reflection prompt 2?", "response": "Benchmark reflection",
+    }, 4),
+    ("emotions.categories", "GET", "/api/emotions/categories", None, 0),
+    ("emotions.sub_emotions", "GET", "/api/emotions/sub-emotions?category=happy", None, 0),
+    ("emotions.catalog", "GET", "/api/emotions/catalog", None, 0),
+    ("prompts.list", "GET", "/api/prompts?category=sad", None, 0),
+    ("prompts.next", "GET", f"/api/prompts/next?user_id={BENCH_USER_ID}", None, 1),
+    ("users.create", "POST", "/api/users/", lambda: {
+        "email": f"{unique('user')}@example.com", "username": unique("user"), "password": "benchmark-password",
+    }, 3),
+    ("users.get", "GET", f"/api/users/{BENCH_USER_ID}", None, 1),
+    ("user.weekly_summary", "GET", f"/api/user/weekly-summary?user_id={BENCH_USER_ID}", None, 1),
+    ("user.streak", "GET", f"/api/user/streak?user_id={BENCH_USER_ID}&days=366", None, 1),
+    ("user.activity", "GET", f"/api/user/activity?user_id={BENCH_USER_ID}", None, 1),
+    ("user.profile", "GET", "/api/user/profile", None, 0),
+    ("completion", "POST", "/api/completion", lambda: {
+        "messages": [{"role": "user", "content": unique("I feel anxious about tomorrow")}],
+    }, 0),
+    ("bot.create_session", "POST", "/api/bot/sessions", lambda: {"userId": BENCH_USER_ID}, 3),
+    ("bot.get_session", "GET", f"/api/bot/sessions/bench-session?user_id={BENCH_USER_ID}", None, 1),
+    ("bot.list_messages", "GET", f"/api/bot/sessions/bench-session/messages?user_id={BENCH_USER_ID}", None, 1),
+    ("bot.send_message", "POST", f"/api/bot/sessions/bench-session/messages?user_id={BENCH_USER_ID}", lambda: {
+        "content": unique("Tell me something kind"),
+    }, 8),  # headroom for folding the rolling summary
+]
+
+
+@pytest.mark.parametrize("name,method,path,body,budget", ROUTES, ids=[r[0] for r in ROUTES])
+def test_route(benchmark, client, queries, name, method, path, body, budget):
+    def call():
+        response = client.request(method, path, json=body() if body else None)
+        assert response.status_code == 200, response.text
+        return response
+
+    # Warm caches, then count the queries of one steady-state request
+    call()
+    with queries:
+        call()
+    assert queries.count <= budget, f"{name} ran {queries.count} queries (budget {budget})"
+    benchmark.extra_info["queries"] = queries.count
+
+    benchmark(call)
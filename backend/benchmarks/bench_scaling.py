@@ -0,0 +1,168 @@
+"""
+Multi-worker scaling of the production server (``gunicorn.conf.py``).
+
+Starts gunicorn with 1, 2 and 4 uvicorn workers against a throwaway SQLite
+file seeded with one user's entries, drives ``GET /api/journal/user/{id}``
+from ``CLIENTS`` keep-alive client processes for ``DURATION`` seconds, and
+reports requests/s plus scaling efficiency against one worker (1.0 = linear).
+
+Client processes share the machine with the workers, so run it on a host with
+at least twice as many cores as the largest worker count for clean numbers;
+under pytest it is skipped with fewer than 4 CPUs:
+
+    python -m benchmarks.bench_scaling
+    pytest benchmarks/bench_scaling.py --benchmark-autosave
+"""
+import http.client
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.ids import new_id
+from app.core.server import available_cpus
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+WORKER_COUNTS = (1, 2, 4)
+CLIENTS = 8
+DURATION = 10.0
+USER_ID = "scaling-user"
+PATH = f"/api/journal/user/{USER_ID}"
+
+
+def make_database(path: Path) -> str:
+    from app.database import Base
+    from app.models.db_models import EmotionCategory, JournalEntry, SubEmotion, User
+
+    url = f"sqlite:///{path}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    now = datetime.utcnow()
+    with sessionmaker(bind=engine)() as db:
+        db.add(User(id=USER_ID, email="scaling@example.com", username="scaling", hashed_password="x"))
+        db.add(EmotionCategory(id=1, name="happy"))
+        db.flush()
+        db.add(SubEmotion(id=1, category_id=1, name="Joyful", intensity=5))
+        db.flush()
+        for i in range(50):
+            db.add(JournalEntry(
+                id=new_id(), user_id=USER_ID, category_id=1, sub_emotion_id=1,
+                text="Today I went for a long walk and thought about the week ahead.",
+                created_at=now - timedelta(hours=i * 6), updated_at=now - timedelta(hours=i * 6),
+            ))
+        db.commit()
+    engine.dispose()
+    return url + "?check_same_thread=false"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(port: int, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/ready")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} never became ready")
+
+
+def start_server(database_url: str, workers: int, port: int) -> subprocess.Popen:
+    env = {
+        **os.environ, "DATABASE_URL": database_url, "WEB_CONCURRENCY": str(workers),
+        "PORT": str(port), "LOG_LEVEL": "WARNING", "DRAIN_SECONDS": "0",
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app.main:app", "-c", "gunicorn.conf.py", "--bind", f"127.0.0.1:{port}"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def stop_server(server: subprocess.Popen):
+    server.send_signal(signal.SIGTERM)
+    try:
+        server.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        server.kill()
+
+
+def drive(args) -> int:
+    """One client: sequential keep-alive requests until the deadline; returns how many succeeded."""
+    port, deadline = args
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    done = 0
+    while time.time() < deadline:
+        conn.request("GET", PATH)
+        response = conn.getresponse()
+        response.read()
+        if response.status == 200:
+            done += 1
+    conn.close()
+    return done
+
+
+def measure(database_url: str, workers: int) -> float:
+    port = free_port()
+    server = start_server(database_url, workers, port)
+    try:
+        wait_ready(port)
+        with multiprocessing.Pool(CLIENTS) as pool:
+            # Warm every worker's pool and caches before timing
+            pool.map(drive, [(port, time.time() + 1.0)] * CLIENTS)
+            started = time.time()
+            done = sum(pool.map(drive, [(port, started + DURATION)] * CLIENTS))
+        return done / DURATION
+    finally:
+        stop_server(server)
+
+
+def run(database_url: str) -> dict:
+    throughput = {workers: measure(database_url, workers) for workers in WORKER_COUNTS}
+    base = throughput[WORKER_COUNTS[0]]
+    return {
+        workers: {"req_per_s": round(rps), "efficiency": round(rps / (base * workers), 2)}
+        for workers, rps in throughput.items()
+    }
+
+
+@pytest.mark.skipif(available_cpus() < max(WORKER_COUNTS), reason="needs at least 4 CPUs to show scaling")
+def test_worker_scaling(benchmark, tmp_path):
+    database_url = make_database(tmp_path / "scaling.db")
+    results = {}
+    benchmark.pedantic(lambda: results.update(run(database_url)), rounds=1, iterations=1)
+    for workers, result in results.items():
+        benchmark.extra_info[f"workers_{workers}.req_per_s"] = result["req_per_s"]
+        benchmark.extra_info[f"workers_{workers}.efficiency"] = result["efficiency"]
+    # More workers must actually add throughput, not just contend
+    assert results[max(WORKER_COUNTS)]["req_per_s"] > results[1]["req_per_s"] * 2
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = make_database(Path(tmp) / "scaling.db")
+        print(f"GET {PATH}, {CLIENTS} clients x {DURATION:.0f}s, {available_cpus()} CPUs available")
+        print(f"  {'workers':>7} {'req/s':>8} {'efficiency':>10}")
+        for workers, r in run(database_url).items():
+            print(f"  {workers:7d} {r['req_per_s']:8d} {r['efficiency']:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
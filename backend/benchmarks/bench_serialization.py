@@ -0,0 +1,112 @@
+"""
+Microbenchmarks for response serialization.
+
+Compares, per endpoint shape, the stock FastAPI path (pydantic validation +
+stdlib ``json``), ``orjson`` on already-validated data, and serving the
+pre-encoded (and pre-compressed) bytes the catalog keeps in memory.
+
+Run from ``backend/``:
+
+    python -m benchmarks.bench_serialization
+"""
+import json
+import timeit
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.http_cache import StaticPayload
+from app.core.serialization import compress, dumps
+from app.schemas.emotion import EmotionCategoryResponse, SubEmotionResponse
+from app.schemas.journal import JournalEntryResponse
+from app.schemas.prompt import PromptResponse
+
+CATEGORIES = ["happy", "sad", "angry", "anxious", "calm", "excited"]
+
+
+def categories():
+    return [
+        {"id": i, "name": name, "description": f"Feeling {name}", "color": "#FFD700", "icon": name}
+        for i, name in enumerate(CATEGORIES, 1)
+    ]
+
+
+def sub_emotions(n=50):
+    return [
+        {"id": i, "category_id": i % 6 + 1, "name": f"Sub emotion {i}", "description": "A nuance", "intensity": i % 10 + 1}
+        for i in range(1, n + 1)
+    ]
+
+
+def prompts(n=25):
+    now = datetime(2024, 3, 20, 10, 30)
+    return [
+        {"id": i, "category_id": i % 6 + 1, "text": f"What made you feel this way today? ({i})", "is_active": True, "created_at": now}
+        for i in range(1, n + 1)
+    ]
+
+
+def journal_entries(n):
+    start = datetime(2024, 1, 1, 8, 0)
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "userId": "user-1",
+            "category": CATEGORIES[i % 6],
+            "subEmotion": f"Sub emotion {i % 50}",
+            "text": "Today I went for a long walk and thought about the week. " * 3,
+            "photoUrl": None,
+            "reflections": [{"prompt": "What triggered this?", "response": "Work deadlines", "timestamp": start.isoformat()}],
+            "createdAt": start + timedelta(hours=i),
+            "updatedAt": start + timedelta(hours=i),
+        }
+        for i in range(n)
+    ]
+
+
+SHAPES = [
+    ("categories", EmotionCategoryResponse, categories()),
+    ("sub-emotions x50", SubEmotionResponse, sub_emotions()),
+    ("prompts x25", PromptResponse, prompts()),
+    ("journal x100", JournalEntryResponse, journal_entries(100)),
+    ("journal x1000", JournalEntryResponse, journal_entries(1000)),
+]
+
+
+def bench(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    print(f"{'shape':<18}{'bytes':>9}{'pydantic+json':>16}{'orjson':>10}{'pre-encoded':>13}{'gzip':>9}{'br':>9}   (us/op)")
+    for name, schema, rows in SHAPES:
+        adapter = TypeAdapter(List[schema])
+        validated = adapter.validate_python(rows)
+        plain = adapter.dump_python(validated, by_alias=True)
+        number = 20 if len(rows) >= 1000 else 200
+
+        def stock():
+            # What FastAPI does for response_model + JSONResponse
+            data = jsonable_encoder(adapter.dump_python(adapter.validate_python(rows), by_alias=True))
+            return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+        body = dumps(plain)
+        payload = StaticPayload('"bench"', body)
+        results = [
+            bench(stock, number),
+            bench(lambda: dumps(plain), number),
+            bench(lambda: payload.variants["identity"], number),
+            bench(lambda: compress(body, "gzip"), number),
+            bench(lambda: compress(body, "br"), number),
+        ]
+        sizes = {enc: len(v) for enc, v in payload.variants.items()}
+        print(f"{name:<18}{len(body):>9}" + "".join(f"{r:>{w}.1f}" for r, w in zip(results, (16, 10, 13, 9, 9))))
+        if len(sizes) > 1:
+            print(f"{'':<18}static gzip={sizes['gzip']}B br={sizes['br']}B")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Worker cold start: importing ``app.main``, running the lifespan, first request.
+
+Each round starts a fresh interpreter against a throwaway SQLite database, so
+nothing is cached between rounds. Reported per phase (median):
+
+- import: ``import app.main`` (routers, models, settings)
+- startup: lifespan until the app accepts requests (pool warm-up, taxonomy)
+- first: the first ``GET /api/emotions/categories``
+
+Run from ``backend/``, either standalone or under pytest-benchmark to track
+regressions against a saved run:
+
+    python -m benchmarks.bench_startup
+    pytest benchmarks/bench_startup.py --benchmark-autosave
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+ROUNDS = 5
+
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+eager = [m for m in ("openai", "passlib", "bcrypt") if m in sys.modules and m not in before]
+from fastapi.testclient import TestClient
+entering = time.perf_counter()
+with TestClient(app.main.app) as client:
+    ready = time.perf_counter()
+    status = client.get("/api/emotions/categories").status_code
+    first = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (ready - entering) * 1000,
+    "first_ms": (first - ready) * 1000,
+    "status": status,
+    "eager_imports": eager,
+}))
+"""
+
+
+def make_database(path: Path) -> str:
+    from app.database import Base
+    from app.models.db_models import EmotionCategory
+
+    url = f"sqlite:///{path}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(EmotionCategory.__table__.insert(), [{"id": 1, "name": "happy"}, {"id": 2, "name": "sad"}])
+    engine.dispose()
+    return url + "?check_same_thread=false"
+
+
+def cold_start(database_url: str) -> dict:
+    env = {**os.environ, "DATABASE_URL": database_url, "LOG_LEVEL": "WARNING"}
+    # Snapshot modules right after interpreter start, before any app import
+    code = "import sys; before = set(sys.modules)\n" + CHILD
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def summarize(results):
+    return {
+        phase: round(statistics.median(r[phase] for r in results), 1)
+        for phase in ("import_ms", "startup_ms", "first_ms")
+    }
+
+
+def test_cold_start(benchmark, tmp_path):
+    database_url = make_database(tmp_path / "startup.db")
+    results = []
+    benchmark.pedantic(lambda: results.append(cold_start(database_url)), rounds=ROUNDS, iterations=1)
+    assert all(r["status"] == 200 for r in results)
+    # Heavy optional dependencies stay out of the import path
+    assert all(r["eager_imports"] == [] for r in results)
+    benchmark.extra_info.update(summarize(results))
+
+
+def main():
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = make_database(Path(tmp) / "startup.db")
+        results = [cold_start(database_url) for _ in range(ROUNDS)]
+    print(f"{ROUNDS} cold starts, median ms")
+    for phase, value in summarize(results).items():
+        print(f"  {phase[:-3]:<8} {value:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Fixtures for the route benchmarks: every router mounted on an in-memory
+SQLite database seeded with a realistic user, and a stubbed LLM.
+"""
+import itertools
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api import bot, completion, emotions, images, journal, prompts, user, users
+from app.core.catalog import taxonomy_catalog
+from app.core.llm import llm_client
+from app.database import Base, get_db
+from app.models.db_models import ChatSession, EmotionCategory, JournalEntry, Prompt, SubEmotion, User
+
+BENCH_USER_ID = "bench-user"
+BENCH_ENTRY_COUNT = 200
+CATEGORIES = ["happy", "sad", "angry", "anxious", "calm", "excited"]
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+def seed(db):
+    now = datetime.utcnow()
+    db.add(User(id=BENCH_USER_ID, email="bench@example.com", username="bench", hashed_password="x"))
+    for i, name in enumerate(CATEGORIES, 1):
+        db.add(EmotionCategory(id=i, name=name, color="#FFD700"))
+    db.flush()
+    for i in range(1, 49):
+        db.add(SubEmotion(id=i, category_id=(i - 1) % len(CATEGORIES) + 1, name=f"Sub emotion {i}", intensity=i % 10 + 1))
+    for i in range(1, 31):
+        db.add(Prompt(id=i, category_id=(i - 1) % len(CATEGORIES) + 1, text=f"Reflection prompt {i}?"))
+    db.flush()
+    for i in range(BENCH_ENTRY_COUNT):
+        category_id = i % len(CATEGORIES) + 1
+        db.add(JournalEntry(
+            id=str(uuid.UUID(int=i + 1)),
+            user_id=BENCH_USER_ID,
+            category_id=category_id,
+            sub_emotion_id=category_id,
+            text="Today I went for a long walk and thought about the week ahead. " * 2,
+            reflections=[{"prompt": "Reflection prompt 1?", "response": "It helped", "timestamp": now.isoformat()}],
+            created_at=now - timedelta(hours=i * 6),
+            updated_at=now - timedelta(hours=i * 6),
+        ))
+    db.add(ChatSession(id="bench-session", user_id=BENCH_USER_ID, summarized_through=0, message_count=0))
+    db.commit()
+
+
+@pytest.fixture(scope="session")
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        seed(db)
+    return engine
+
+
+@pytest.fixture(scope="session")
+def client(engine):
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(journal.router, prefix="/api/journal")
+    app.include_router(emotions.router, prefix="/api/emotions")
+    app.include_router(prompts.router, prefix="/api/prompts")
+    app.include_router(users.router, prefix="/api/users")
+    app.include_router(user.router, prefix="/api/user")
+    app.include_router(images.router, prefix="/api/images")
+    app.include_router(completion.router, prefix="/api")
+    app.include_router(bot.router, prefix="/api/bot")
+    app.dependency_overrides[get_db] = override_get_db
+
+    taxonomy_catalog.invalidate()
+    yield TestClient(app)
+    taxonomy_catalog.invalidate()
+
+
+@pytest.fixture(scope="session")
+def queries(engine):
+    return QueryCounter(engine)
+
+
+@pytest.fixture(autouse=True)
+def fake_llm(monkeypatch):
+    """Answer instantly so the benchmarks measure this service, not the upstream."""
+    replies = itertools.count()
+
+    async def chat(messages, **kwargs):
+        return f"Stub reply {next(replies)}"
+
+    monkeypatch.setattr(llm_client, "chat", chat)
@@ -0,0 +1,39 @@
+"""
+Production server: gunicorn supervising uvicorn workers.
+
+    gunicorn app.main:app -c gunicorn.conf.py
+
+One worker per available CPU unless ``WEB_CONCURRENCY`` is set. The count is
+exported back into ``WEB_CONCURRENCY`` so each worker caps its database pool
+to its share of ``DB_MAX_CONNECTIONS`` (see app.core.server.pool_limits).
+
+On SIGTERM ``/ready`` starts failing at once while workers keep serving for
+``DRAIN_SECONDS`` (see app.core.worker); then they stop accepting and in-flight
+requests get ``GRACEFUL_TIMEOUT`` seconds to finish before workers are killed.
+"""
+import math
+import os
+
+from app.core.server import worker_count
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = "app.core.worker.DrainingUvicornWorker"
+workers = worker_count(os.getenv("WEB_CONCURRENCY"))
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+# Workers import the app themselves, so each gets its own engine and pool
+preload_app = False
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+# The drain comes out of the graceful shutdown window, so add it on top
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30")) + math.ceil(float(os.getenv("DRAIN_SECONDS", "5")))
+keepalive = int(os.getenv("KEEPALIVE_SECONDS", "5"))
+# Recycle workers now and then so slow leaks cannot build up; jitter avoids restarting them all at once
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
+
+# Requests are already logged with their correlation ids by the app
+accesslog = None
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
+# Only these peers may set the client address with X-Forwarded-For (the rate limiter keys on it)
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
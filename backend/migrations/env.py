@@ -0,0 +1,84 @@
+"""
+Alembic environment.
+
+Runs against ``app.database.engine`` (so ``DATABASE_URL`` and the
+``search_path`` listener apply) unless a connection is handed in through
+``config.attributes["connection"]``, which is how the tests drive it. Each
+migration commits on its own so ``CREATE INDEX CONCURRENTLY`` can run in an
+autocommit block.
+"""
+import os
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import text
+
+from app.database import Base, DATABASE_SCHEMA
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+# Give up on a lock instead of queueing behind long transactions, which would
+# stall every query queued behind the DDL
+LOCK_TIMEOUT = os.getenv("MIGRATION_LOCK_TIMEOUT", "5s")
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    # Expression, GIN and partial indexes are declared only in migrations;
+    # don't let --autogenerate propose dropping them
+    return not (type_ == "index" and reflected and compare_to is None)
+
+
+def _configure(**kwargs):
+    context.configure(
+        target_metadata=Base.metadata,
+        include_object=include_object,
+        transaction_per_migration=True,
+        compare_type=True,
+        **kwargs,
+    )
+
+
+def run_migrations_offline():
+    """``alembic upgrade head --sql``: print the DDL for review instead of running it."""
+    _configure(
+        url=os.getenv("DATABASE_URL"),
+        literal_binds=True,
+        version_table_schema=DATABASE_SCHEMA,
+    )
+    with context.begin_transaction():
+        context.execute(f'CREATE SCHEMA IF NOT EXISTS "{DATABASE_SCHEMA}"')
+        context.execute(f'SET search_path TO "{DATABASE_SCHEMA}"')
+        context.run_migrations()
+
+
+def _run(connection):
+    is_postgres = connection.dialect.name == "postgresql"
+    if is_postgres:
+        connection.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{DATABASE_SCHEMA}"'))
+        connection.execute(text(f"SET lock_timeout = '{LOCK_TIMEOUT}'"))
+        connection.commit()
+    _configure(connection=connection, version_table_schema=DATABASE_SCHEMA if is_postgres else None)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run(connection)
+        return
+
+    from app.database import engine
+
+    with engine.connect() as connection:
+        _run(connection)
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,152 @@
+"""Baseline: the schema created by the original pg_database/setup_db.sql
+
+Databases that were built from setup_db.sql already have all of this; mark
+them with ``alembic stamp 0001_baseline`` instead of upgrading through it.
+Everything added since (chat sessions, API usage, the user timeline index)
+comes in later revisions, so a stamped database gets it from the upgrade.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+JSONType = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+UPDATED_AT_TABLES = ("users", "journal_entries", "user_profiles")
+READ_ONLY_TABLES = ("emotion_categories", "sub_emotions")
+
+
+def _timestamps(nullable=True):
+    return [
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=nullable, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=nullable, server_default=sa.func.now()),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("email", sa.String(255), nullable=False, unique=True),
+        sa.Column("username", sa.String(50), nullable=False, unique=True),
+        sa.Column("hashed_password", sa.String(255), nullable=False),
+        *_timestamps(),
+    )
+    op.create_table(
+        "emotion_categories",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("name", sa.String(50), nullable=False),
+        sa.Column("description", sa.Text),
+        sa.Column("color", sa.String(7)),
+        sa.Column("icon", sa.String(50)),
+    )
+    op.create_table(
+        "sub_emotions",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("category_id", sa.Integer, sa.ForeignKey("emotion_categories.id")),
+        sa.Column("name", sa.String(50), nullable=False),
+        sa.Column("description", sa.Text),
+        sa.Column("intensity", sa.Integer),
+        sa.CheckConstraint("intensity BETWEEN 1 AND 10", name="sub_emotions_intensity_check"),
+    )
+    op.create_table(
+        "prompts",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("category_id", sa.Integer, sa.ForeignKey("emotion_categories.id")),
+        sa.Column("text", sa.Text, nullable=False),
+        sa.Column("is_active", sa.Boolean, server_default=sa.true()),
+    )
+    op.create_table(
+        "journal_entries",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("user_id", sa.String(36), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("category_id", sa.Integer, sa.ForeignKey("emotion_categories.id")),
+        sa.Column("sub_emotion_id", sa.Integer, sa.ForeignKey("sub_emotions.id")),
+        sa.Column("text", sa.Text, nullable=False),
+        sa.Column("photo_url", sa.Text),
+        sa.Column("reflections", JSONType, nullable=False, server_default="[]"),
+        *_timestamps(nullable=False),
+    )
+    op.create_table(
+        "user_profiles",
+        sa.Column("user_id", sa.String(36), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("name", sa.String(100)),
+        sa.Column("avatar_url", sa.Text),
+        sa.Column("stats", JSONType, nullable=False, server_default="{}"),
+        *_timestamps(),
+    )
+    op.create_table(
+        "analytics",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("user_id", sa.String(36), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("date", sa.Date, nullable=False),
+        sa.Column("current_streak", sa.Integer, server_default="0"),
+        sa.Column("longest_streak", sa.Integer, server_default="0"),
+        sa.Column("last_check_in_date", sa.DateTime(timezone=True)),
+        sa.Column("mood_distribution", JSONType, nullable=False, server_default="{}"),
+        sa.Column("sub_emotion_counts", JSONType, nullable=False, server_default="{}"),
+        sa.Column("timeline", JSONType, nullable=False, server_default="[]"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+    op.create_index("idx_journal_entries_user_id", "journal_entries", ["user_id"])
+    op.create_index("idx_journal_entries_category_id", "journal_entries", ["category_id"])
+    op.create_index("idx_journal_entries_created_at", "journal_entries", ["created_at"])
+    op.create_index("idx_analytics_user_date", "analytics", ["user_id", "date"])
+    op.create_index("idx_user_profiles_user_id", "user_profiles", ["user_id"])
+
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_updated_at_column()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            NEW.updated_at = CURRENT_TIMESTAMP;
+            RETURN NEW;
+        END;
+        $$ language 'plpgsql'
+    """)
+    for table in UPDATED_AT_TABLES:
+        op.execute(
+            f"CREATE TRIGGER update_{table}_updated_at BEFORE UPDATE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION update_updated_at_column()"
+        )
+
+    for table in READ_ONLY_TABLES:
+        op.execute(f"COMMENT ON TABLE {table} IS 'Read-only table containing predefined taxonomy rows. Do not modify.'")
+        op.execute(f"""
+            CREATE OR REPLACE FUNCTION prevent_{table}_update()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                RAISE EXCEPTION '{table} table is read-only. Do not modify.';
+            END;
+            $$ language 'plpgsql'
+        """)
+        op.execute(
+            f"CREATE TRIGGER prevent_{table}_update_trigger BEFORE UPDATE OR DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION prevent_{table}_update()"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        for table in READ_ONLY_TABLES:
+            op.execute(f"DROP TRIGGER IF EXISTS prevent_{table}_update_trigger ON {table}")
+            op.execute(f"DROP FUNCTION IF EXISTS prevent_{table}_update()")
+        for table in UPDATED_AT_TABLES:
+            op.execute(f"DROP TRIGGER IF EXISTS update_{table}_updated_at ON {table}")
+        op.execute("DROP FUNCTION IF EXISTS update_updated_at_column()")
+
+    for table in (
+        "analytics", "user_profiles", "journal_entries", "prompts", "sub_emotions", "emotion_categories", "users",
+    ):
+        op.drop_table(table)
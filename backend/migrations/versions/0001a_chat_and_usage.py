@@ -0,0 +1,71 @@
+"""Chat sessions, chat messages and API usage counters
+
+Interim copies of pg_database/setup_db.sql already created these tables, so
+each one is only created when it is missing: such databases are stamped at
+0001_baseline like any other and upgrade through here unchanged.
+
+Revision ID: 0001a_chat_and_usage
+Revises: 0001_baseline
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001a_chat_and_usage"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+BigIntegerType = sa.BigInteger().with_variant(sa.Integer(), "sqlite")
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "chat_sessions" not in existing:
+        op.create_table(
+            "chat_sessions",
+            sa.Column("id", sa.String(36), primary_key=True),
+            sa.Column("user_id", sa.String(36), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("summary", sa.Text),
+            sa.Column("summarized_through", sa.Integer, nullable=False, server_default="0"),
+            sa.Column("message_count", sa.Integer, nullable=False, server_default="0"),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        )
+    if "chat_messages" not in existing:
+        op.create_table(
+            "chat_messages",
+            sa.Column("id", BigIntegerType, primary_key=True, autoincrement=True),
+            sa.Column("session_id", sa.String(36), sa.ForeignKey("chat_sessions.id"), nullable=False),
+            sa.Column("seq", sa.Integer, nullable=False),
+            sa.Column("role", sa.String(16), nullable=False),
+            sa.Column("content", sa.Text, nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+            sa.UniqueConstraint("session_id", "seq", name="uq_chat_messages_session_seq"),
+        )
+    if "api_usage" not in existing:
+        op.create_table(
+            "api_usage",
+            sa.Column("user_key", sa.String(100), primary_key=True),
+            sa.Column("route", sa.String(50), primary_key=True),
+            sa.Column("day", sa.Date, primary_key=True),
+            sa.Column("request_count", sa.Integer, nullable=False, server_default="0"),
+            sa.Column("rejected_count", sa.Integer, nullable=False, server_default="0"),
+        )
+    op.create_index("idx_chat_sessions_user_id", "chat_sessions", ["user_id"], if_not_exists=True)
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS update_chat_sessions_updated_at ON chat_sessions")
+        op.execute(
+            "CREATE TRIGGER update_chat_sessions_updated_at BEFORE UPDATE ON chat_sessions "
+            "FOR EACH ROW EXECUTE FUNCTION update_updated_at_column()"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS update_chat_sessions_updated_at ON chat_sessions")
+    op.drop_index("idx_chat_sessions_user_id", "chat_sessions")
+    for table in ("api_usage", "chat_messages", "chat_sessions"):
+        op.drop_table(table)
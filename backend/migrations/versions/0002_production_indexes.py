@@ -0,0 +1,67 @@
+"""Index plan for production data sizes
+
+Every index here is built with CREATE INDEX CONCURRENTLY, so journal_entries
+stays writable while it builds. PostgreSQL cannot run that inside a
+transaction, hence the autocommit blocks. A concurrent build that fails
+(lock_timeout, deadlock) leaves an INVALID index behind: drop it and re-run
+the upgrade.
+
+Revision ID: 0002_production_indexes
+Revises: 0001a_chat_and_usage
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002_production_indexes"
+down_revision = "0001a_chat_and_usage"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        # SQLite has no concurrent builds, GIN or tsvector; the partial index still applies
+        op.create_index("idx_journal_entries_user_created", "journal_entries",
+                        ["user_id", sa.text("created_at DESC")], if_not_exists=True)
+        op.drop_index("idx_journal_entries_user_id", "journal_entries")
+        op.create_index("idx_prompts_active_category", "prompts", ["category_id"],
+                        sqlite_where=sa.text("is_active"))
+        return
+
+    with op.get_context().autocommit_block():
+        # A user's timeline, newest first: WHERE user_id = :id ORDER BY created_at DESC.
+        # Built before the user_id index goes, so user_id lookups always have one
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_journal_entries_user_created "
+            "ON journal_entries (user_id, created_at DESC)"
+        )
+        # Journal search: WHERE to_tsvector('english', text) @@ plainto_tsquery('english', :q)
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_journal_entries_text_search "
+            "ON journal_entries USING GIN (to_tsvector('english', text))"
+        )
+        # The prompt index only ever loads active prompts
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_prompts_active_category "
+            "ON prompts (category_id) WHERE is_active"
+        )
+        # Prefix of idx_journal_entries_user_created; costs a write per insert and serves nothing extra
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_journal_entries_user_id")
+        # Duplicates the user_profiles primary key
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_user_profiles_user_id")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        op.drop_index("idx_prompts_active_category", "prompts")
+        op.create_index("idx_journal_entries_user_id", "journal_entries", ["user_id"])
+        op.drop_index("idx_journal_entries_user_created", "journal_entries")
+        return
+
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_profiles_user_id ON user_profiles (user_id)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_journal_entries_user_id ON journal_entries (user_id)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_prompts_active_category")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_journal_entries_text_search")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_journal_entries_user_created")
@@ -0,0 +1,39 @@
+"""Per-user streak state
+
+Rows are created on a user's next entry (or streak read) by rebuilding from
+journal_entries, so no backfill is needed here.
+
+Revision ID: 0003_user_streaks
+Revises: 0002_production_indexes
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003_user_streaks"
+down_revision = "0002_production_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_streaks",
+        sa.Column("user_id", sa.String(36), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("timezone", sa.String(64), nullable=False, server_default="UTC"),
+        sa.Column("current_streak", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("longest_streak", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("active_days", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("last_active_day", sa.Date),
+        sa.Column("recent_days", sa.LargeBinary, nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            "CREATE TRIGGER update_user_streaks_updated_at BEFORE UPDATE ON user_streaks "
+            "FOR EACH ROW EXECUTE FUNCTION update_updated_at_column()"
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("user_streaks")
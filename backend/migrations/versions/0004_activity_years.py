@@ -0,0 +1,32 @@
+"""Per-user-year activity bitmaps
+
+Bitmaps are written alongside user_streaks rows, which are rebuilt from
+journal_entries on a user's next entry (or streak read). Existing
+user_streaks rows are cleared so every user gets both on that rebuild;
+both are derived data, so nothing is lost.
+
+Revision ID: 0004_activity_years
+Revises: 0003_user_streaks
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004_activity_years"
+down_revision = "0003_user_streaks"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "activity_years",
+        sa.Column("user_id", sa.String(36), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("year", sa.Integer, primary_key=True),
+        sa.Column("days", sa.LargeBinary, nullable=False),
+    )
+    op.execute("DELETE FROM user_streaks")
+
+
+def downgrade() -> None:
+    op.drop_table("activity_years")
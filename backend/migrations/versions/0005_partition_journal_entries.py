@@ -0,0 +1,112 @@
+"""Partition journal_entries by month of created_at
+
+PostgreSQL only; SQLite keeps the single table. The existing table is not
+copied: it is renamed to journal_entries_legacy and attached as the partition
+for everything before next month, so the swap only touches the catalog.
+
+- The primary key becomes (id, created_at), since every unique constraint on
+  a partitioned table must include the partition key. The legacy partition
+  keeps its unique id index. The matching (id, created_at) index is built
+  CONCURRENTLY first, and the bound CHECK is validated without blocking
+  writes, so ATTACH neither builds indexes nor scans under lock.
+- Parent indexes match the legacy ones, which ATTACH adopts as-is.
+- Monthly partitions start with next month; app.services.partition_service
+  keeps them created ahead. A default partition takes anything outside them.
+- Rows still in the legacy partition can be moved into monthly partitions
+  offline, or the partition can be archived as a whole with
+  ``python -m app.services.partition_service archive``.
+
+Needs PostgreSQL 13+ (row triggers on partitioned tables).
+
+Revision ID: 0005_partition_journal_entries
+Revises: 0004_activity_years
+Create Date: 2026-10-19
+"""
+from datetime import datetime, timezone
+
+from alembic import op
+
+from app.services.partition_service import (
+    DEFAULT, LEGACY, MONTHS_AHEAD, add_months, bound_literal, month_start, partition_ddl,
+)
+
+revision = "0005_partition_journal_entries"
+down_revision = "0004_activity_years"
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    "idx_journal_entries_user_created": "(user_id, created_at DESC)",
+    "idx_journal_entries_category_id": "(category_id)",
+    "idx_journal_entries_created_at": "(created_at)",
+    "idx_journal_entries_text_search": "USING GIN (to_tsvector('english', text))",
+}
+FOREIGN_KEYS = {
+    "journal_entries_user_id_fkey": "(user_id) REFERENCES users (id)",
+    "journal_entries_category_id_fkey": "(category_id) REFERENCES emotion_categories (id)",
+    "journal_entries_sub_emotion_id_fkey": "(sub_emotion_id) REFERENCES sub_emotions (id)",
+}
+TRIGGER = (
+    "CREATE TRIGGER update_journal_entries_updated_at BEFORE UPDATE ON journal_entries "
+    "FOR EACH ROW EXECUTE FUNCTION update_updated_at_column()"
+)
+
+
+def _create_keys_and_indexes() -> None:
+    for name, definition in FOREIGN_KEYS.items():
+        op.execute(f"ALTER TABLE journal_entries ADD CONSTRAINT {name} FOREIGN KEY {definition}")
+    for name, definition in INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON journal_entries {definition}")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    boundary = add_months(month_start(datetime.now(timezone.utc).date()), 1)
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS journal_entries_legacy_id_created "
+            "ON journal_entries (id, created_at)"
+        )
+        op.execute(
+            f"ALTER TABLE journal_entries ADD CONSTRAINT journal_entries_legacy_bound "
+            f"CHECK (created_at < {bound_literal(boundary)}) NOT VALID"
+        )
+        op.execute("ALTER TABLE journal_entries VALIDATE CONSTRAINT journal_entries_legacy_bound")
+
+    # Catalog-only swap in one transaction
+    op.execute(f"ALTER TABLE journal_entries RENAME TO {LEGACY}")
+    op.execute(f"ALTER TABLE {LEGACY} RENAME CONSTRAINT journal_entries_pkey TO {LEGACY}_pkey")
+    for name in INDEXES:
+        op.execute(f"ALTER INDEX IF EXISTS {name} RENAME TO {name}_legacy")
+    # The parent's trigger is cloned onto every partition, this one included
+    op.execute(f"DROP TRIGGER IF EXISTS update_journal_entries_updated_at ON {LEGACY}")
+
+    op.execute(
+        f"CREATE TABLE journal_entries (LIKE {LEGACY} INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)"
+    )
+    op.execute("ALTER TABLE journal_entries ADD PRIMARY KEY (id, created_at)")
+    _create_keys_and_indexes()
+    op.execute(
+        f"ALTER TABLE journal_entries ATTACH PARTITION {LEGACY} "
+        f"FOR VALUES FROM (MINVALUE) TO ({bound_literal(boundary)})"
+    )
+    for offset in range(MONTHS_AHEAD + 1):
+        op.execute(partition_ddl(add_months(boundary, offset)))
+    op.execute(f"CREATE TABLE {DEFAULT} PARTITION OF journal_entries DEFAULT")
+    op.execute(TRIGGER)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    # Copies every row back into one table; journal_entries is locked throughout
+    op.execute("CREATE TABLE journal_entries_flat (LIKE journal_entries INCLUDING DEFAULTS)")
+    op.execute("INSERT INTO journal_entries_flat SELECT * FROM journal_entries")
+    op.execute("DROP TABLE journal_entries")
+    op.execute("ALTER TABLE journal_entries_flat RENAME TO journal_entries")
+    op.execute("ALTER TABLE journal_entries ADD CONSTRAINT journal_entries_pkey PRIMARY KEY (id)")
+    _create_keys_and_indexes()
+    op.execute(TRIGGER)
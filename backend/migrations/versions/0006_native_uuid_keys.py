@@ -0,0 +1,137 @@
+"""Native uuid keys for users, journal entries and chat sessions
+
+VARCHAR(36) ids become PostgreSQL ``uuid`` (16 bytes instead of 37), which
+shrinks primary- and foreign-key indexes by more than half. Values that are
+not UUIDs (seed data such as ``user-1``) become ``md5(id)::uuid``;
+app.core.ids.to_uuid maps them the same way at the API boundary. The
+original values go into ``legacy_ids``, which the app uses to serve them
+unchanged and the downgrade uses to restore them.
+
+Foreign keys are dropped and recreated around the type change, and each
+table is rewritten once under an exclusive lock, so run this in a
+maintenance window on large databases.
+
+On SQLite the columns become CHAR(32) (SQLAlchemy's Uuid) and values are
+converted in Python.
+
+Revision ID: 0006_native_uuid_keys
+Revises: 0005_partition_journal_entries
+Create Date: 2026-10-19
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.ids import UUID_PATTERN, to_uuid
+
+revision = "0006_native_uuid_keys"
+down_revision = "0005_partition_journal_entries"
+branch_labels = None
+depends_on = None
+
+# Referenced tables first; the SQLite path converts in this order
+COLUMNS = {
+    "users": ("id",),
+    "chat_sessions": ("id", "user_id"),
+    "journal_entries": ("id", "user_id"),
+    "user_profiles": ("user_id",),
+    "analytics": ("user_id",),
+    "user_streaks": ("user_id",),
+    "activity_years": ("user_id",),
+    "chat_messages": ("session_id",),
+}
+FOREIGN_KEYS = [
+    ("chat_sessions", "user_id", "users", "id"),
+    ("journal_entries", "user_id", "users", "id"),
+    ("user_profiles", "user_id", "users", "id"),
+    ("analytics", "user_id", "users", "id"),
+    ("user_streaks", "user_id", "users", "id"),
+    ("activity_years", "user_id", "users", "id"),
+    ("chat_messages", "session_id", "chat_sessions", "id"),
+]
+
+
+def _fkey(table: str, column: str) -> str:
+    # PostgreSQL's default constraint name, which every earlier revision used
+    return f"{table}_{column}_fkey"
+
+
+def _alter_types(type_sql: str, using: str, fixup: str = "") -> None:
+    """
+    Change every id column to ``type_sql``, casting with ``using``, then run
+    ``fixup`` on each column while the foreign keys are off (``{table}`` and
+    ``{column}`` are substituted in both).
+    """
+    for table, column, _, _ in FOREIGN_KEYS:
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT {_fkey(table, column)}")
+    for table, columns in COLUMNS.items():
+        changes = ", ".join(
+            f"ALTER COLUMN {column} TYPE {type_sql} USING {using.replace('{column}', column)}" for column in columns
+        )
+        op.execute(f"ALTER TABLE {table} {changes}")
+        for column in columns if fixup else ():
+            op.execute(fixup.replace("{table}", table).replace("{column}", column))
+    for table, column, target, target_column in FOREIGN_KEYS:
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {_fkey(table, column)} "
+            f"FOREIGN KEY ({column}) REFERENCES {target} ({target_column})"
+        )
+
+
+def _convert_sqlite(new_type, convert) -> None:
+    bind = op.get_bind()
+    for table, columns in COLUMNS.items():
+        for column in columns:
+            values = [value for (value,) in bind.exec_driver_sql(f"SELECT DISTINCT {column} FROM {table}")]
+            for value in values:
+                bind.exec_driver_sql(
+                    f"UPDATE {table} SET {column} = ? WHERE {column} = ?", (convert(value), value)
+                )
+        with op.batch_alter_table(table) as batch:
+            for column in columns:
+                batch.alter_column(column, type_=new_type)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    op.create_table("legacy_ids", sa.Column("legacy_id", sa.String(36), primary_key=True))
+
+    if bind.dialect.name != "postgresql":
+        legacy = set()
+        for table, columns in COLUMNS.items():
+            for column in columns:
+                legacy.update(
+                    value for (value,) in bind.exec_driver_sql(f"SELECT DISTINCT {column} FROM {table}")
+                    if value and not re.fullmatch(UUID_PATTERN, value)
+                )
+        for value in sorted(legacy):
+            bind.exec_driver_sql("INSERT INTO legacy_ids (legacy_id) VALUES (?)", (value,))
+        _convert_sqlite(sa.Uuid(), lambda value: value and to_uuid(value).hex)
+        return
+
+    # UNION drops duplicates; NULLs fail the regex test and are skipped
+    op.execute("INSERT INTO legacy_ids (legacy_id) " + " UNION ".join(
+        f"SELECT {column} FROM {table} WHERE {column} !~ '{UUID_PATTERN}'"
+        for table, columns in COLUMNS.items() for column in columns
+    ))
+    _alter_types(
+        "uuid",
+        "CASE WHEN {column} ~ '" + UUID_PATTERN + "' THEN {column}::uuid ELSE md5({column})::uuid END",
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        originals = {
+            to_uuid(value).hex: value for (value,) in bind.exec_driver_sql("SELECT legacy_id FROM legacy_ids")
+        }
+        _convert_sqlite(sa.String(36), lambda value: value and (originals.get(value) or str(to_uuid(value))))
+    else:
+        _alter_types(
+            "varchar(36)",
+            "{column}::text",
+            "UPDATE {table} SET {column} = legacy_id FROM legacy_ids WHERE {column} = md5(legacy_id)::uuid::text",
+        )
+    op.drop_table("legacy_ids")
@@ -0,0 +1,39 @@
+"""Progress of batched account erasures
+
+One row per requested erasure (app.services.erasure_service). It has no
+foreign key to users because it records the deletion of that row.
+
+Revision ID: 0007_user_erasures
+Revises: 0006_native_uuid_keys
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0007_user_erasures"
+down_revision = "0006_native_uuid_keys"
+branch_labels = None
+depends_on = None
+
+JSONType = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_erasures",
+        sa.Column("user_id", sa.Uuid(), primary_key=True),
+        sa.Column("status", sa.String(16), nullable=False, server_default="pending"),
+        sa.Column("deleted", JSONType, nullable=False, server_default="{}"),
+        sa.Column("images_removed", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("error", sa.Text, nullable=True),
+        sa.Column("lease_owner", sa.String(36), nullable=True),
+        sa.Column("lease_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("requested_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_erasures")
@@ -1,4 +1,3 @@
-import os
 import sys
 from pathlib import Path
 
@@ -9,3 +8,88 @@ sys.path.insert(0, backend_dir)
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.ids import legacy_ids
+from app.database import Base, get_db
+from app.models.db_models import EmotionCategory, LegacyId, SubEmotion, User
+
+
+@pytest.fixture(autouse=True)
+def clear_result_cache():
+    """Tests reuse user ids across databases, so cached results must not carry over."""
+    from app.core.result_cache import result_cache
+
+    result_cache.clear()
+    yield
+    result_cache.clear()
+
+
+@pytest.fixture(autouse=True, scope="module")
+def reload_legacy_ids():
+    """Each module database has its own ``legacy_ids`` rows."""
+    legacy_ids.invalidate()
+    yield
+    legacy_ids.invalidate()
+
+
+@pytest.fixture(scope="module")
+def engine():
+    """An in-memory SQLite database per test module; StaticPool shares its one connection."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def session_factory(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="module")
+def client(request, session_factory):
+    """A TestClient for the test module's ``app``, with ``get_db`` on the module database."""
+    app = request.module.app
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture(scope="module")
+def base_rows(session_factory):
+    """``user-1`` and the ``happy``/``Joyful`` emotion that most modules' entries point at."""
+    with session_factory() as db:
+        db.add_all([
+            # A seed id, kept in legacy_ids as migration 0006 does
+            User(id="user-1", email="one@example.com", username="one", hashed_password="x"),
+            LegacyId(legacy_id="user-1"),
+            EmotionCategory(id=1, name="happy", color="#FFD700"),
+            SubEmotion(id=1, category_id=1, name="Joyful", intensity=5),
+        ])
+        db.commit()
+        # What the startup warm-up does
+        legacy_ids.ensure_loaded(db)
+
+
+@pytest.fixture
+def statements(engine):
+    """SQL statements the module database runs during the test."""
+    captured = []
+    listener = lambda *args: captured.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    yield captured
+    event.remove(engine, "before_cursor_execute", listener)
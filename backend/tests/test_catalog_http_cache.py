@@ -0,0 +1,73 @@
+import pytest
+from fastapi import FastAPI
+
+from app.api import emotions, prompts
+from app.core.catalog import taxonomy_catalog
+from app.models.db_models import EmotionCategory, Prompt, SubEmotion
+
+app = FastAPI()
+app.include_router(emotions.router, prefix="/api/emotions")
+app.include_router(prompts.router, prefix="/api/prompts")
+
+
+@pytest.fixture(autouse=True, scope="module")
+def seed(session_factory, base_rows):
+    with session_factory() as db:
+        db.add_all([
+            EmotionCategory(id=2, name="sad", color="#4169E1"),
+            SubEmotion(id=2, category_id=2, name="Lonely", intensity=4),
+            Prompt(id=1, category_id=1, text="What brought you this joy today?"),
+            Prompt(id=2, category_id=2, text="What triggered this sadness?"),
+        ])
+        db.commit()
+    taxonomy_catalog.invalidate()
+    yield
+    taxonomy_catalog.invalidate()
+
+
+@pytest.mark.parametrize("path", [
+    "/api/emotions/categories",
+    "/api/emotions/sub-emotions?category=happy",
+    "/api/prompts",
+    "/api/emotions/catalog",
+])
+def test_conditional_get_returns_304_without_db_access(client, path, statements):
+    first = client.get(path)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert "max-age" in first.headers["cache-control"]
+
+    statements.clear()
+    second = client.get(path, headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+    assert statements == []
+
+
+def test_etags_differ_per_representation(client):
+    happy = client.get("/api/emotions/sub-emotions?category=happy")
+    sad = client.get("/api/emotions/sub-emotions?category=sad")
+    assert [e["name"] for e in happy.json()] == ["Joyful"]
+    assert happy.headers["etag"] != sad.headers["etag"]
+    assert client.get("/api/emotions/sub-emotions?category=sad", headers={"If-None-Match": happy.headers["etag"]}).status_code == 200
+
+
+def test_catalog_bundles_everything(client):
+    catalog = client.get("/api/emotions/catalog").json()
+    assert [c["name"] for c in catalog["categories"]] == ["happy", "sad"]
+    assert len(catalog["subEmotions"]) == 2
+    assert len(catalog["prompts"]) == 2
+    assert catalog["version"] == taxonomy_catalog.version
+
+
+def test_reload_of_unchanged_taxonomy_keeps_etag(client):
+    etag = client.get("/api/emotions/categories").headers["etag"]
+    taxonomy_catalog.invalidate()
+    assert client.get("/api/emotions/categories", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_unknown_category_is_empty_list(client):
+    response = client.get("/api/prompts?category=bored")
+    assert response.status_code == 200
+    assert response.json() == []
@@ -0,0 +1,155 @@
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import event
+
+from app.api import bot
+from app.core import conversation
+from app.models.db_models import User, ChatMessage, ChatSession
+
+app = FastAPI()
+app.include_router(bot.router, prefix="/api/bot")
+
+
+@pytest.fixture
+def user_id(session_factory):
+    with session_factory() as db:
+        user = db.query(User).filter(User.id == "chat-user").first()
+        if user is None:
+            db.add(User(id="chat-user", email="chat@example.com", username="chat_user", hashed_password="x"))
+            db.commit()
+    return "chat-user"
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    prompts = []
+
+    async def chat(messages, **kwargs):
+        prompts.append(messages)
+        if messages[0]["content"] == conversation.SUMMARY_SYSTEM_PROMPT:
+            return "summary of earlier turns"
+        return "x" * 200
+
+    monkeypatch.setattr(bot.llm_client, "chat", chat)
+    monkeypatch.setattr(conversation.llm_client, "chat", chat)
+    return prompts
+
+
+def test_messages_are_appended_and_paged(client, user_id, fake_llm):
+    session = client.post("/api/bot/sessions", json={"userId": user_id}).json()
+    reply = client.post(f"/api/bot/sessions/{session['id']}/messages?user_id={user_id}", json={"content": "hello"}).json()
+    assert reply["message"]["seq"] == 2
+    assert reply["message"]["role"] == "assistant"
+
+    messages = client.get(f"/api/bot/sessions/{session['id']}/messages?user_id={user_id}").json()
+    assert [(m["seq"], m["role"]) for m in messages] == [(1, "user"), (2, "assistant")]
+    assert client.get(f"/api/bot/sessions/{session['id']}/messages?user_id={user_id}&before=2").json()[0]["content"] == "hello"
+
+
+def test_unknown_user_and_session_return_404(client, user_id):
+    assert client.post("/api/bot/sessions", json={"userId": "nobody"}).status_code == 404
+    assert client.post(f"/api/bot/sessions/missing/messages?user_id={user_id}", json={"content": "hi"}).status_code == 404
+
+
+def test_long_session_keeps_prompt_size_constant(client, session_factory, user_id, fake_llm, monkeypatch):
+    monkeypatch.setattr(conversation, "HISTORY_TOKEN_WINDOW", 300)
+    session_id = client.post("/api/bot/sessions", json={"userId": user_id}).json()["id"]
+
+    sizes = []
+    for i in range(20):
+        client.post(f"/api/bot/sessions/{session_id}/messages?user_id={user_id}", json={"content": f"turn {i} " + "y" * 200})
+        chat_prompt = [p for p in fake_llm if p[0]["content"] == conversation.FEELORA_SYSTEM_PROMPT][-1]
+        sizes.append(sum(len(m["content"]) for m in chat_prompt))
+
+    with session_factory() as db:
+        stored = db.query(ChatSession).filter(ChatSession.id == session_id).one()
+        assert stored.message_count == 40
+        assert stored.summarized_through > 0
+        assert stored.summary == "summary of earlier turns"
+    # Prompt size plateaus instead of growing with the session
+    assert max(sizes[10:]) <= max(sizes[:10]) + len("summary of earlier turns") + 50
+
+
+def test_history_loads_with_constant_query_count(client, user_id, fake_llm, statements):
+    session_id = client.post("/api/bot/sessions", json={"userId": user_id}).json()["id"]
+    counts = []
+    for i in range(3):
+        statements.clear()
+        client.post(f"/api/bot/sessions/{session_id}/messages?user_id={user_id}", json={"content": f"turn {i}"})
+        counts.append(len(statements))
+    assert counts[0] == counts[1] == counts[2]
+
+
+def test_sessions_are_only_visible_to_their_user(client, user_id, fake_llm):
+    session_id = client.post("/api/bot/sessions", json={"userId": user_id}).json()["id"]
+    assert client.get(f"/api/bot/sessions/{session_id}?user_id={user_id}").status_code == 200
+    client.post(f"/api/bot/sessions/{session_id}/messages?user_id={user_id}", json={"content": "private"})
+    fake_llm.clear()
+    assert client.get(f"/api/bot/sessions/{session_id}?user_id=someone-else").status_code == 404
+    assert client.get(f"/api/bot/sessions/{session_id}/messages?user_id=someone-else").json() == []
+    response = client.post(f"/api/bot/sessions/{session_id}/messages?user_id=someone-else", json={"content": "hi"})
+    assert response.status_code == 404
+    assert fake_llm == []
+
+
+def test_no_connection_is_held_while_the_llm_answers(client, engine, user_id, monkeypatch):
+    checked_out = {"n": 0}
+    held = []
+
+    def checkout(*args):
+        checked_out["n"] += 1
+
+    def checkin(*args):
+        checked_out["n"] -= 1
+
+    async def chat(messages, **kwargs):
+        held.append(checked_out["n"])
+        return "x" * 200
+
+    monkeypatch.setattr(bot.llm_client, "chat", chat)
+    monkeypatch.setattr(conversation.llm_client, "chat", chat)
+    monkeypatch.setattr(conversation, "HISTORY_TOKEN_WINDOW", 100)
+    event.listen(engine, "checkout", checkout)
+    event.listen(engine, "checkin", checkin)
+    try:
+        session_id = client.post("/api/bot/sessions", json={"userId": user_id}).json()["id"]
+        for i in range(3):
+            client.post(f"/api/bot/sessions/{session_id}/messages?user_id={user_id}", json={"content": "y" * 200})
+    finally:
+        event.remove(engine, "checkout", checkout)
+        event.remove(engine, "checkin", checkin)
+    # Reply and summary calls alike
+    assert len(held) > 3 and set(held) == {0}
+
+
+def test_fold_covers_messages_sent_concurrently(client, session_factory, user_id, fake_llm, monkeypatch):
+    monkeypatch.setattr(conversation, "HISTORY_TOKEN_WINDOW", 200)
+    session_id = client.post("/api/bot/sessions", json={"userId": user_id}).json()["id"]
+    url = f"/api/bot/sessions/{session_id}/messages?user_id={user_id}"
+    client.post(url, json={"content": "first " + "y" * 200})
+
+    reply = bot.llm_client.chat
+
+    async def chat_while_another_send_lands(messages, **kwargs):
+        # Another send to the session commits seqs 3 and 4 while this one waits for its reply
+        if messages[0]["content"] == conversation.FEELORA_SYSTEM_PROMPT:
+            with session_factory() as db:
+                session = db.query(ChatSession).filter(ChatSession.id == session_id).one()
+                db.add_all([
+                    ChatMessage(session_id=session_id, seq=3, role="user", content="concurrent " + "z" * 200),
+                    ChatMessage(session_id=session_id, seq=4, role="assistant", content="x" * 200),
+                ])
+                session.message_count = 4
+                db.commit()
+        return await reply(messages, **kwargs)
+
+    monkeypatch.setattr(bot.llm_client, "chat", chat_while_another_send_lands)
+    client.post(url, json={"content": "second " + "y" * 200})
+
+    summarized = [p for p in fake_llm if p[0]["content"] == conversation.SUMMARY_SYSTEM_PROMPT]
+    with session_factory() as db:
+        through = db.query(ChatSession).filter(ChatSession.id == session_id).one().summarized_through
+        folded = db.query(ChatMessage).filter(ChatMessage.session_id == session_id, ChatMessage.seq <= through).all()
+    assert through >= 4 and len(summarized) == 1
+    # Nothing below summarized_through was skipped
+    assert all(m.content in summarized[0][1]["content"] for m in folded)
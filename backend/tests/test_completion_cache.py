@@ -0,0 +1,157 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import completion
+from app.core.cache import TTLCache
+from app.core.conversation import (
+    ConversationStore,
+    completion_cache,
+    completion_cache_key,
+    create_conversation_backend,
+    estimate_tokens,
+    trim_to_token_window
+)
+from app.core.result_cache import InMemoryCacheBackend
+
+app = FastAPI()
+app.include_router(completion.router, prefix="/api")
+client = TestClient(app)
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    calls = []
+
+    async def chat(messages, **kwargs):
+        calls.append(messages)
+        return f"reply {len(calls)}"
+
+    monkeypatch.setattr(completion.llm_client, "chat", chat)
+    completion_cache.clear()
+    yield calls
+    completion_cache.clear()
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_entries=2, ttl=None)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.evictions == 1
+
+
+def test_ttl_cache_respects_byte_bound_and_ttl():
+    cache = TTLCache(max_entries=100, max_bytes=200, ttl=0.05)
+    for i in range(10):
+        cache.set(f"k{i}", "x" * 50)
+    assert cache.current_bytes <= 200
+    assert cache.get("k9") == "x" * 50
+    time.sleep(0.06)
+    assert cache.get("k9") is None
+
+
+def test_trim_keeps_newest_messages_within_window():
+    messages = [{"role": "user", "content": "x" * 400} for _ in range(10)]
+    trimmed = trim_to_token_window(messages, max_tokens=250)
+    assert trimmed == messages[-2:]
+    assert sum(estimate_tokens(m) for m in trimmed) <= 250
+
+
+def test_cache_key_ignores_whitespace_and_role_case():
+    a = [{"role": "User", "content": "I feel  anxious\n"}]
+    b = [{"role": "user", "content": "I feel anxious"}]
+    assert completion_cache_key(a, "gpt-4o", 0.7, 100) == completion_cache_key(b, "gpt-4o", 0.7, 100)
+
+
+def test_repeated_conversation_is_served_from_cache(fake_llm):
+    body = {"messages": [{"role": "user", "content": "I feel anxious"}]}
+    first = client.post("/api/completion", json=body).json()
+    second = client.post("/api/completion", json=body).json()
+    assert first["message"] == second["message"] == "reply 1"
+    assert len(fake_llm) == 1
+
+
+def test_server_keeps_history_for_conversation(fake_llm):
+    first = client.post("/api/completion", json={"messages": [{"role": "user", "content": "hello"}]}).json()
+    client.post("/api/completion", json={
+        "messages": [{"role": "user", "content": "still here"}],
+        "conversationId": first["conversationId"]
+    })
+    sent = fake_llm[-1]
+    assert sent[0]["role"] == "system"
+    assert [m["content"] for m in sent[1:]] == ["hello", "reply 1", "still here"]
+
+
+def test_unknown_conversation_id_is_not_adopted(fake_llm):
+    body = {"messages": [{"role": "user", "content": "hello"}], "conversationId": "guessable-1"}
+    first = client.post("/api/completion", json=body).json()
+    assert first["conversationId"] != "guessable-1"
+
+    # A second caller using the same made-up id does not see the first one's history
+    client.post("/api/completion", json={**body, "messages": [{"role": "user", "content": "hi there"}]})
+    assert [m["content"] for m in fake_llm[-1][1:]] == ["hi there"]
+
+
+def test_workers_sharing_a_backend_see_each_others_conversations():
+    shared = InMemoryCacheBackend(max_entries=10, max_bytes=1024 * 1024)
+    worker_a, worker_b = ConversationStore(shared), ConversationStore(shared)
+    conversation_id, _ = worker_a.load(None)
+    worker_a.save(conversation_id, [{"role": "user", "content": "hello"}])
+    assert worker_b.load(conversation_id) == (conversation_id, [{"role": "user", "content": "hello"}])
+
+
+def test_store_is_disabled_across_processes_without_redis(monkeypatch):
+    monkeypatch.delenv("CONVERSATION_REDIS_URL", raising=False)
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+    assert create_conversation_backend() is None
+    monkeypatch.setenv("WEB_CONCURRENCY", "1")
+    assert isinstance(create_conversation_backend(), InMemoryCacheBackend)
+
+
+def test_disabled_store_hands_out_no_conversation_id(fake_llm, monkeypatch):
+    monkeypatch.setattr(completion, "conversation_store", ConversationStore(None))
+    first = client.post("/api/completion", json={"messages": [{"role": "user", "content": "hello"}]}).json()
+    assert first["conversationId"] is None
+
+    # The client keeps the history and sends all of it
+    client.post("/api/completion", json={"messages": [
+        {"role": "user", "content": "hello"},
+        {"role": "assistant", "content": first["message"]},
+        {"role": "user", "content": "still here"},
+    ]})
+    assert [m["content"] for m in fake_llm[-1][1:]] == ["hello", "reply 1", "still here"]
+
+
+def test_shared_store_is_not_called_on_the_event_loop(fake_llm, monkeypatch):
+    class BlockingBackend(InMemoryCacheBackend):
+        blocking = True
+        calls = []
+
+        def get(self, key):
+            self.calls.append(on_event_loop())
+            return super().get(key)
+
+        def set(self, key, value, ttl):
+            self.calls.append(on_event_loop())
+            super().set(key, value, ttl)
+
+    def on_event_loop():
+        try:
+            asyncio.get_running_loop()
+            return True
+        except RuntimeError:
+            return False
+
+    monkeypatch.setattr(completion, "conversation_store", ConversationStore(BlockingBackend(10, 1024 * 1024)))
+    first = client.post("/api/completion", json={"messages": [{"role": "user", "content": "hello"}]}).json()
+    client.post("/api/completion", json={
+        "conversationId": first["conversationId"], "messages": [{"role": "user", "content": "again"}],
+    })
+    assert BlockingBackend.calls and not any(BlockingBackend.calls)
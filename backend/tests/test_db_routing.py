@@ -0,0 +1,108 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api import journal
+from app.core.db_routing import PRIMARY_COOKIE, ReadYourWritesMiddleware, RecentWrites, ReplicaRouter, install_write_tracking
+from app.core.result_cache import result_cache
+from app.database import Base, get_db, get_read_db, read_db_dependency
+from app.models.db_models import EmotionCategory, SubEmotion, User
+
+
+@pytest.fixture(autouse=True)
+def no_result_cache(monkeypatch):
+    # Which session serves a read is only observable when repeat reads are not cached
+    monkeypatch.setattr(result_cache, "ttl", 0)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_sessions(path):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with factory() as db:
+        db.add_all([
+            User(id="user-1", email="one@example.com", username="one", hashed_password="x"),
+            User(id="user-2", email="two@example.com", username="two", hashed_password="x"),
+            EmotionCategory(id=1, name="happy"),
+            SubEmotion(id=1, category_id=1, name="Joyful", intensity=5),
+        ])
+        db.commit()
+    return factory
+
+
+def build(tmp_path):
+    """App on a primary plus one replica that never receives the primary's writes (infinite lag)."""
+    primary = make_sessions(tmp_path / "primary.db")
+    replica = make_sessions(tmp_path / "replica.db")
+    clock = Clock()
+    recent_writes = RecentWrites(5.0, clock=clock)
+    install_write_tracking(primary, recent_writes)
+
+    app = FastAPI()
+    app.include_router(journal.router, prefix="/api/journal")
+    app.add_middleware(ReadYourWritesMiddleware, window=5.0)
+
+    def override_get_db():
+        db = primary()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = read_db_dependency(ReplicaRouter([replica], recent_writes))
+    return app, clock
+
+
+def post_entry(client, user_id):
+    response = client.post("/api/journal/", json={"user_id": user_id, "category_id": 1, "sub_emotion_id": 1, "text": "hi"})
+    assert response.status_code == 200
+    return response
+
+
+def test_recent_writes_expire():
+    clock = Clock()
+    writes = RecentWrites(5.0, clock=clock)
+    writes.mark(["user-1"])
+    assert writes.wrote_recently("user-1") and not writes.wrote_recently("user-2")
+    clock.now += 6
+    assert not writes.wrote_recently("user-1")
+
+
+def test_no_replicas_always_uses_primary():
+    assert ReplicaRouter([], RecentWrites(5.0)).use_primary(None)
+
+
+def test_writer_reads_own_write_then_moves_to_replica(tmp_path):
+    app, clock = build(tmp_path)
+    writer = TestClient(app)
+    response = post_entry(writer, "user-1")
+    assert PRIMARY_COOKIE in response.headers["set-cookie"]
+
+    # Another client without the cookie: pinned by user id only
+    other = TestClient(app)
+    assert len(other.get("/api/journal/user/user-1").json()) == 1
+    assert other.get("/api/journal/user/user-2").json() == []
+
+    clock.now += 6
+    # The replica has not caught up, so once the pin expires the entry is not visible
+    assert other.get("/api/journal/user/user-1").json() == []
+
+
+def test_cookie_pins_the_writing_client(tmp_path):
+    app, _ = build(tmp_path)
+    writer = TestClient(app)
+    post_entry(writer, "user-1")
+    # Every read from the writing client goes to the primary while its cookie lasts
+    assert len(writer.get("/api/journal/").json()) == 1
+    assert TestClient(app).get("/api/journal/").json() == []
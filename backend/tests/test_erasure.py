@@ -0,0 +1,216 @@
+import asyncio
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, func, select, update
+from sqlalchemy.orm import sessionmaker
+
+from app.api import users
+from app.core.ids import new_id
+from app.database import Base, get_db
+from app.models.db_models import (
+    ActivityYear, Analytics, ApiUsage, ChatMessage, ChatSession, JournalEntry, User, UserErasure, UserProfile,
+    UserStreak,
+)
+from app.services import erasure_service
+from app.services.erasure_service import claim, claimable, erase_user, request_erasure
+
+USER = "user-1"
+OTHER = "user-2"
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    # A file database, so the job and the requests polling it use separate connections
+    engine = create_engine(f"sqlite:///{tmp_path / 'erasure.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+def seed(session_factory, user_id: str, entries: int, photos=()):
+    """A user with ``entries`` journal entries (the first ones carrying ``photos``) and a row in every other table."""
+    started = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    with session_factory() as db:
+        db.add(User(id=user_id, email=f"{user_id}@example.com", username=user_id, hashed_password="x"))
+        db.flush()
+        db.add_all([
+            UserProfile(user_id=user_id, name=user_id),
+            UserStreak(user_id=user_id, recent_days=b"\x01"),
+            ActivityYear(user_id=user_id, year=2026, days=b"\x00" * 46),
+            ApiUsage(user_key=f"user:{user_id}", route="completion", day=date(2026, 1, 1)),
+            Analytics(user_id=user_id, date=date(2026, 1, 1)),
+        ])
+        for _ in range(2):
+            session_id = new_id()
+            db.add(ChatSession(id=session_id, user_id=user_id, message_count=3))
+            db.flush()
+            db.add_all([ChatMessage(session_id=session_id, seq=seq, role="user", content="hi") for seq in (1, 2, 3)])
+        db.commit()
+        rows = [
+            {"id": new_id(), "user_id": user_id, "text": "Benchmark entry", "reflections": [],
+             "photo_url": photos[i] if i < len(photos) else None,
+             "created_at": started + timedelta(minutes=i), "updated_at": started + timedelta(minutes=i)}
+            for i in range(entries)
+        ]
+        db.execute(JournalEntry.__table__.insert(), rows)
+        db.commit()
+
+
+def count(session_factory, model, **filters) -> int:
+    with session_factory() as db:
+        return db.scalar(select(func.count()).select_from(model).filter_by(**filters))
+
+
+def test_erases_a_100k_entry_user_in_bounded_batches(session_factory):
+    seed(session_factory, USER, 100_000, photos=["/api/images/a", "https://example.com/b.jpg", "/api/images/c"])
+    seed(session_factory, OTHER, 10)
+    deletes, removed = [], []
+
+    @event.listens_for(session_factory.kw["bind"], "after_cursor_execute")
+    def record_deletes(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("DELETE FROM journal_entries"):
+            deletes.append(cursor.rowcount)
+
+    with session_factory() as db:
+        request_erasure(db, USER)
+    deleted = erase_user(session_factory, USER, batch_size=5000, remove_images=lambda ids: removed.extend(ids) or len(ids))
+
+    assert deleted["journal_entries"] == 100_000
+    assert deleted["chat_messages"] == 6 and deleted["chat_sessions"] == 2
+    assert deleted["users"] == 1 and deleted["api_usage"] == 1
+    # One transaction per batch, none larger than the batch size
+    assert len(deletes) == 20 and max(deletes) == 5000
+    assert sorted(removed) == ["a", "c"]
+
+    for model in (JournalEntry, ChatSession, Analytics, UserProfile, UserStreak, ActivityYear):
+        assert count(session_factory, model, user_id=USER) == 0
+    # Only the other user's messages are left
+    assert count(session_factory, ChatMessage) == 6
+    assert count(session_factory, User, id=USER) == 0
+    assert count(session_factory, JournalEntry, user_id=OTHER) == 10
+    assert count(session_factory, User, id=OTHER) == 1
+
+    with session_factory() as db:
+        erasure = db.get(UserErasure, USER)
+        assert erasure.status == "done" and erasure.finished_at is not None
+        assert erasure.deleted == deleted and erasure.images_removed == 2
+        assert erasure.lease_owner is None
+
+
+class WorkerDied(BaseException):
+    pass
+
+
+def test_resumes_after_the_worker_dies(session_factory):
+    seed(session_factory, USER, 25, photos=[f"/api/images/{i}" for i in range(25)])
+    with session_factory() as db:
+        request_erasure(db, USER)
+
+    def die(ids):
+        raise WorkerDied()
+
+    with pytest.raises(WorkerDied):
+        erase_user(session_factory, USER, batch_size=10, remove_images=die)
+    with session_factory() as db:
+        erasure = db.get(UserErasure, USER)
+        assert erasure.status == "running" and erasure.deleted["journal_entries"] == 10
+        # The lease is still held, so nobody else takes the job over yet
+        assert claimable(db) == []
+        assert erase_user(session_factory, USER, batch_size=10) is None
+        db.execute(update(UserErasure).values(lease_until=datetime.now(timezone.utc) - timedelta(seconds=1)))
+        db.commit()
+        # Stored in uuid form, listed as the id clients know
+        assert claimable(db) == [USER]
+
+    deleted = erase_user(session_factory, USER, batch_size=10, remove_images=len)
+    assert deleted["journal_entries"] == 25
+    assert count(session_factory, JournalEntry) == 0
+    with session_factory() as db:
+        assert db.get(UserErasure, USER).images_removed == 15
+
+
+def test_failure_is_recorded_and_retried_on_request(session_factory):
+    seed(session_factory, USER, 5, photos=["/api/images/a"])
+    with session_factory() as db:
+        request_erasure(db, USER)
+
+    def fail(ids):
+        raise RuntimeError("storage unavailable")
+
+    with pytest.raises(RuntimeError):
+        erase_user(session_factory, USER, remove_images=fail)
+    with session_factory() as db:
+        erasure = db.get(UserErasure, USER)
+        assert (erasure.status, erasure.error) == ("failed", "storage unavailable")
+        assert claimable(db) == []
+        assert request_erasure(db, USER).status == "pending"
+
+    assert erase_user(session_factory, USER)["users"] == 1
+
+
+def test_only_one_worker_holds_the_lease(session_factory):
+    seed(session_factory, USER, 1)
+    with session_factory() as db:
+        request_erasure(db, USER)
+        assert claim(db, USER, "worker-a")
+        assert not claim(db, USER, "worker-b")
+        assert claim(db, USER, "worker-a")
+
+
+@pytest.fixture
+def client(session_factory):
+    app = FastAPI()
+    app.include_router(users.router, prefix="/api/users")
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    # One event loop for all requests, so the erasure job outlives the DELETE
+    with TestClient(app) as client:
+        yield client
+
+
+def test_delete_queues_the_erasure_and_reports_progress(client, session_factory):
+    seed(session_factory, USER, 50)
+
+    response = client.delete(f"/api/users/{USER}")
+    assert response.status_code == 202
+    body = response.json()
+    assert body["userId"] == USER and body["status"] in ("pending", "running", "done")
+    assert body["statusUrl"] == f"/api/users/{USER}/erasure"
+
+    deadline = time.monotonic() + 10
+    while (status := client.get(body["statusUrl"]).json())["status"] != "done":
+        assert time.monotonic() < deadline and status["status"] != "failed"
+        time.sleep(0.01)
+    assert status["deleted"]["journal_entries"] == 50 and status["finishedAt"] is not None
+    assert count(session_factory, User, id=USER) == 0
+
+    # Repeating the request reports the finished erasure
+    assert client.delete(f"/api/users/{USER}").json()["status"] == "done"
+    assert client.delete("/api/users/nobody").status_code == 404
+    assert client.get("/api/users/nobody/erasure").status_code == 404
+
+
+def test_start_erasure_keeps_a_reference_to_the_job(session_factory):
+    seed(session_factory, USER, 3)
+    with session_factory() as db:
+        request_erasure(db, USER)
+
+    async def run():
+        task = erasure_service.start_erasure(session_factory, USER)
+        assert task in erasure_service._jobs
+        await task
+
+    asyncio.run(run())
+    assert count(session_factory, User, id=USER) == 0
+    assert not erasure_service._jobs
@@ -0,0 +1,41 @@
+import time
+import uuid
+
+from fastapi import FastAPI
+
+from app.api import journal, users
+from app.core.ids import new_id, to_uuid, uuid7
+
+app = FastAPI()
+app.include_router(journal.router, prefix="/api/journal")
+app.include_router(users.router, prefix="/api/users")
+
+
+def test_uuid7_is_versioned_and_time_ordered():
+    first = uuid7()
+    time.sleep(0.002)
+    second = uuid7()
+    assert (first.version, first.variant) == (7, uuid.RFC_4122)
+    assert first < second
+    assert uuid.UUID(new_id()).version == 7
+
+
+def test_to_uuid_passes_uuids_through_and_hashes_the_rest():
+    value = "0B7F4F4E-8F5A-4C1E-9D6B-2F4F0C9A1E11"
+    assert to_uuid(value) == uuid.UUID(value)
+    # Same as PostgreSQL's md5('user-1')::uuid, which migration 0006 applied
+    assert to_uuid("user-1") == uuid.UUID("d6d77053-92bc-7af6-3332-8bea8c4c6904")
+    assert to_uuid("user-1\n") != to_uuid("user-1")
+
+
+def test_legacy_ids_round_trip_through_the_api(client, base_rows):
+    created = client.post("/api/journal/", json={
+        "user_id": "user-1", "category_id": 1, "sub_emotion_id": 1, "text": "Hello",
+    })
+    assert created.status_code == 200
+    assert created.json()["userId"] == "user-1"
+
+    assert client.get("/api/users/user-1").json()["id"] == "user-1"
+    entries = client.get("/api/journal/user/user-1").json()
+    assert [e["userId"] for e in entries] == ["user-1"]
+    assert client.get(f"/api/journal/{created.json()['id']}").json()["userId"] == "user-1"
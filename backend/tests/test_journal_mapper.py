@@ -0,0 +1,114 @@
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.api import journal
+from app.core.journal_mapper import row_to_dict, rows_to_json
+from app.models.db_models import JournalEntry, User
+from app.schemas.journal import JournalEntryResponse
+from app.services import summary_service
+
+app = FastAPI()
+app.include_router(journal.router, prefix="/api/journal")
+
+
+START = datetime(2024, 3, 1, 9, 0)
+
+
+@pytest.fixture(autouse=True, scope="module")
+def seed(session_factory, base_rows):
+    with session_factory() as db:
+        db.add(User(id="user-2", email="two@example.com", username="two", hashed_password="x"))
+        db.flush()
+        for i in range(5):
+            db.add(JournalEntry(
+                id=str(uuid.UUID(int=i + 1)), user_id="user-1", category_id=1, sub_emotion_id=1,
+                text=f"Entry {i}", reflections=[{"prompt": "Why?", "response": "Because"}] if i % 2 else [],
+                created_at=START + timedelta(days=i), updated_at=START + timedelta(days=i),
+            ))
+        # Orphaned sub-emotion: dropped from lists, as before
+        db.add(JournalEntry(
+            id=str(uuid.UUID(int=99)), user_id="user-2", category_id=1, sub_emotion_id=42,
+            text="Orphan", created_at=START, updated_at=START,
+        ))
+        db.commit()
+
+
+def pydantic_path(rows):
+    """What FastAPI produced before: model per entry, response_model validation, stdlib json."""
+    adapter = TypeAdapter(List[JournalEntryResponse])
+    models = [JournalEntryResponse(**row_to_dict(row)) for row in rows]
+    content = jsonable_encoder(adapter.dump_python(adapter.validate_python(models), by_alias=True, mode="json"))
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+@pytest.mark.parametrize("created_at", [
+    datetime(2024, 3, 20, 10, 30),
+    datetime(2024, 3, 20, 10, 30, 5, 123456, tzinfo=timezone.utc),
+    datetime(2024, 3, 20, 10, 30, tzinfo=timezone(timedelta(hours=5, minutes=30))),
+])
+def test_mapper_output_matches_pydantic_path(created_at):
+    rows = [
+        ("id-1", "user-1", "happy", "Joyful", "Ünïcode ✨ \"quoted\"", None, [{"prompt": "p", "response": "r"}], created_at, created_at),
+        ("id-2", "user-1", "sad", "Lonely", "Plain", "https://example.com/a.png", None, created_at, created_at),
+    ]
+    assert rows_to_json(rows) == pydantic_path(rows)
+
+
+def test_user_entries_in_one_query_newest_first(client, statements):
+    response = client.get("/api/journal/user/user-1?limit=3")
+    assert response.status_code == 200
+    body = response.json()
+    assert [e["text"] for e in body] == ["Entry 4", "Entry 3", "Entry 2"]
+    assert body[0]["category"] == "happy" and body[0]["subEmotion"] == "Joyful"
+    assert body[1]["reflections"] == [{"prompt": "Why?", "response": "Because"}]
+    assert set(body[0]) == {"id", "userId", "category", "subEmotion", "text", "photoUrl", "reflections", "createdAt", "updatedAt"}
+    assert len(statements) == 1
+
+
+def test_entries_with_missing_sub_emotion_are_skipped(client):
+    assert client.get("/api/journal/user/user-2").json() == []
+    texts = [e["text"] for e in client.get("/api/journal/").json()]
+    assert "Orphan" not in texts
+    assert len(texts) == 5
+
+
+def test_single_entry_endpoints_share_the_mapper(client):
+    created = client.post("/api/journal/", json={
+        "user_id": "user-1", "category_id": 1, "sub_emotion_id": 1, "text": "New entry",
+    })
+    assert created.status_code == 200
+    entry = created.json()
+    assert (entry["category"], entry["subEmotion"], entry["reflections"]) == ("happy", "Joyful", [])
+
+    patched = client.patch(f"/api/journal/{entry['id']}", json={"prompt": "Why?", "response": "Sunshine"})
+    assert patched.json()["reflections"][0]["response"] == "Sunshine"
+
+    fetched = client.get(f"/api/journal/{entry['id']}").json()
+    assert fetched["text"] == "New entry"
+    assert fetched["reflections"] == patched.json()["reflections"]
+
+
+def test_missing_entry_returns_placeholder_quote(client):
+    body = client.get(f"/api/journal/{uuid.UUID(int=12345)}").json()
+    assert body["id"] == "" and body["category"] == ""
+    assert body["text"]
+
+
+def test_static_routes_are_not_shadowed_by_entry_id(client, monkeypatch, statements):
+    async def fake_insights(patterns, mood_changes, entries_text=None):
+        return "Insights"
+    monkeypatch.setattr(summary_service, "generate_insights", fake_insights)
+
+    summary = client.get("/api/journal/weekly-summary?user_id=user-1")
+    assert summary.status_code == 200
+    assert set(summary.json()) >= {"emotionalPatterns", "moodChanges", "personalizedInsights"}
+    assert len(statements) == 1
+
+    assert isinstance(client.get("/api/journal/debug/entries").json(), list)
@@ -0,0 +1,187 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.core.llm import CircuitBreaker, LLMClient, LLMError, LLMUnavailableError
+
+
+class FakeOpenAIServer:
+    """Local stand-in for the OpenAI chat endpoint with scripted latency and errors."""
+
+    def __init__(self):
+        self.script = []  # list of (delay_seconds, status_code)
+        self.requests = 0
+        self.concurrent = 0
+        self.max_concurrent = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                self.rfile.read(length)
+                with server._lock:
+                    server.requests += 1
+                    server.concurrent += 1
+                    server.max_concurrent = max(server.max_concurrent, server.concurrent)
+                    delay, status = server.script.pop(0) if server.script else (0, 200)
+                try:
+                    time.sleep(delay)
+                    if status == 200:
+                        body = {
+                            "id": "chatcmpl-test",
+                            "object": "chat.completion",
+                            "choices": [{"index": 0, "message": {"role": "assistant", "content": " Hello there "}}],
+                        }
+                    else:
+                        body = {"error": {"message": "upstream failure", "type": "server_error"}}
+                    payload = json.dumps(body).encode()
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    with server._lock:
+                        server.concurrent -= 1
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def api_base(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def fake_server():
+    with FakeOpenAIServer() as server:
+        yield server
+
+
+def make_client(server, **kwargs):
+    kwargs.setdefault("timeout", 0.5)
+    kwargs.setdefault("max_retries", 2)
+    kwargs.setdefault("backoff_base", 0.01)
+    return LLMClient(api_key="test-key", api_base=server.api_base, **kwargs)
+
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+@pytest.mark.asyncio
+async def test_successful_completion(fake_server):
+    client = make_client(fake_server)
+    assert await client.chat(MESSAGES) == "Hello there"
+    assert client.metrics.successes == 1
+    assert client.metrics.retries == 0
+
+
+@pytest.mark.asyncio
+async def test_retries_server_errors(fake_server):
+    fake_server.script = [(0, 500), (0, 503)]
+    client = make_client(fake_server)
+    assert await client.chat(MESSAGES) == "Hello there"
+    assert fake_server.requests == 3
+    assert client.metrics.retries == 2
+
+
+@pytest.mark.asyncio
+async def test_deadline_turns_slow_upstream_into_error(fake_server):
+    fake_server.script = [(1.0, 200)] * 3
+    client = make_client(fake_server, timeout=0.2, max_retries=1)
+    started = time.perf_counter()
+    with pytest.raises(LLMError):
+        await client.chat(MESSAGES)
+    assert time.perf_counter() - started < 1.0
+    assert client.metrics.timeouts == 2
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_and_fails_fast(fake_server):
+    fake_server.script = [(0, 500)] * 10
+    client = make_client(fake_server, max_retries=0, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+    for _ in range(2):
+        with pytest.raises(LLMError):
+            await client.chat(MESSAGES)
+    requests_before = fake_server.requests
+    with pytest.raises(LLMUnavailableError):
+        await client.chat(MESSAGES)
+    assert fake_server.requests == requests_before
+    assert client.metrics.short_circuits == 1
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_closes_circuit(fake_server):
+    fake_server.script = [(0, 500)]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    client = make_client(fake_server, max_retries=0, breaker=breaker)
+    with pytest.raises(LLMError):
+        await client.chat(MESSAGES)
+    assert breaker.state == CircuitBreaker.OPEN
+    await asyncio.sleep(0.06)
+    assert await client.chat(MESSAGES) == "Hello there"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.parametrize("while_waiting_for", ["upstream", "the concurrency cap"])
+@pytest.mark.asyncio
+async def test_cancelled_probe_does_not_keep_circuit_open(fake_server, while_waiting_for):
+    fake_server.script = [(0, 500), (1.0, 200)]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    client = make_client(fake_server, max_retries=0, timeout=2, max_concurrency=1, acquire_timeout=5, breaker=breaker)
+    with pytest.raises(LLMError):
+        await client.chat(MESSAGES)
+    await asyncio.sleep(0.06)
+
+    if while_waiting_for == "the concurrency cap":
+        semaphore = client._get_semaphore()
+        await semaphore.acquire()
+    probe = asyncio.ensure_future(client.chat(MESSAGES))
+    await asyncio.sleep(0.05)
+    assert breaker.state == CircuitBreaker.HALF_OPEN and not breaker.allow_request()
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    if while_waiting_for == "the concurrency cap":
+        semaphore.release()
+
+    # The next call is let through as the probe and closes the circuit
+    fake_server.script = []
+    assert await client.chat(MESSAGES) == "Hello there"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped(fake_server):
+    fake_server.script = [(0.1, 200)] * 6
+    client = make_client(fake_server, max_concurrency=2, acquire_timeout=5)
+    results = await asyncio.gather(*(client.chat(MESSAGES) for _ in range(6)))
+    assert results == ["Hello there"] * 6
+    assert fake_server.max_concurrent <= 2
+
+
+@pytest.mark.asyncio
+async def test_missing_api_key_fails_without_calling_upstream(fake_server):
+    client = LLMClient(api_key=None, api_base=fake_server.api_base)
+    with pytest.raises(LLMError):
+        await client.chat(MESSAGES)
+    assert fake_server.requests == 0
@@ -0,0 +1,98 @@
+import io
+import json
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import logging_config
+from app.core.logging_config import (
+    CorrelationIdMiddleware,
+    JSONFormatter,
+    RequestIdFilter,
+    configure_logging,
+    debug_sampled,
+    request_id_var,
+)
+
+logger = logging.getLogger("tests.logging")
+
+app = FastAPI()
+app.add_middleware(CorrelationIdMiddleware)
+
+
+@app.get("/echo")
+def echo():
+    logger.warning("handled %s", "echo", extra={"user_id": "user-1"})
+    return {"request_id": request_id_var.get()}
+
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def captured():
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.addFilter(RequestIdFilter())
+    handler.setFormatter(JSONFormatter())
+    logger.addHandler(handler)
+    yield stream
+    logger.removeHandler(handler)
+
+
+def test_json_lines_carry_request_id_and_extra_fields(captured):
+    response = client.get("/echo", headers={"X-Request-ID": "abc-123"})
+    assert response.headers["x-request-id"] == "abc-123"
+    assert response.json() == {"request_id": "abc-123"}
+
+    line = json.loads(captured.getvalue().splitlines()[-1])
+    assert line["message"] == "handled echo"
+    assert line["request_id"] == "abc-123"
+    assert line["user_id"] == "user-1"
+    assert line["level"] == "WARNING"
+
+
+def test_request_id_is_generated_and_truncated():
+    generated = client.get("/echo").headers["x-request-id"]
+    assert len(generated) == 32
+    assert client.get("/echo").headers["x-request-id"] != generated
+    assert len(client.get("/echo", headers={"X-Request-ID": "x" * 500}).headers["x-request-id"]) == 64
+    assert request_id_var.get() == "-"
+
+
+def test_exceptions_are_serialized(captured):
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.error("failed", exc_info=True)
+    line = json.loads(captured.getvalue())
+    assert "ValueError: boom" in line["exc_info"]
+
+
+def test_debug_sampling_respects_level_and_rate():
+    logger.setLevel(logging.INFO)
+    assert not debug_sampled(logger, rate=1.0)
+    logger.setLevel(logging.DEBUG)
+    try:
+        assert debug_sampled(logger, rate=1.0)
+        assert not debug_sampled(logger, rate=0.0)
+    finally:
+        logger.setLevel(logging.NOTSET)
+
+
+def test_configure_logging_replaces_its_handler():
+    root = logging.getLogger()
+    before_handlers, before_level = list(root.handlers), root.level
+    try:
+        configure_logging(level="warning", fmt="json")
+        configure_logging(level="debug", fmt="text")
+        ours = [h for h in root.handlers if h not in before_handlers]
+        assert len(ours) == 1
+        assert root.level == logging.DEBUG
+        assert not isinstance(ours[0].formatter, JSONFormatter)
+    finally:
+        root.handlers = before_handlers
+        root.setLevel(before_level)
+        logging_config._handler = None
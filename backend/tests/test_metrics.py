@@ -0,0 +1,68 @@
+import re
+import uuid
+
+import pytest
+from fastapi import FastAPI
+
+from app.api import journal, metrics
+from app.core.metrics import Histogram, MetricsRegistry, TimingMiddleware, metrics_registry
+from app.database import install_query_hooks
+from app.models.db_models import JournalEntry, User
+
+app = FastAPI()
+app.add_middleware(TimingMiddleware)
+app.include_router(journal.router, prefix="/api/journal")
+app.include_router(metrics.router)
+
+ENTRY_ID = str(uuid.UUID(int=1))
+
+
+@pytest.fixture(autouse=True, scope="module")
+def seed(engine, session_factory, base_rows):
+    install_query_hooks(engine)
+    with session_factory() as db:
+        db.add(JournalEntry(id=ENTRY_ID, user_id="user-1", category_id=1, sub_emotion_id=1, text="Hello"))
+        db.commit()
+    metrics_registry.reset()
+    yield
+    metrics_registry.reset()
+
+
+def test_server_timing_reports_queries_and_durations(client):
+    response = client.get("/api/journal/user/user-1")
+    timing = response.headers["server-timing"]
+    assert re.fullmatch(r'db;dur=[\d.]+;desc="1 queries", app;dur=[\d.]+, total;dur=[\d.]+', timing)
+
+    response = client.get(f"/api/journal/{ENTRY_ID}")
+    assert 'desc="2 queries"' in response.headers["server-timing"]
+
+
+def test_metrics_endpoint_renders_route_histograms(client):
+    client.get("/api/journal/user/user-1")
+    client.get("/nowhere")
+    body = client.get("/metrics").text
+
+    assert re.search(r'http_request_db_queries_bucket\{method="GET",route="/api/journal/user/\{user_id\}",le="1"\} [1-9]', body)
+    assert re.search(r'http_request_duration_seconds_count\{method="GET",route="/api/journal/user/\{user_id\}"\} [1-9]', body)
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"} 1' in body
+    assert "# TYPE llm_calls counter" in body
+    assert "completion_cache_hit_ratio" in body
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("queries", "Queries.", (1, 5))
+    for value in (0, 1, 3, 7):
+        histogram.observe(value, route="/r")
+    lines = histogram.render()
+    assert 'queries_bucket{route="/r",le="1"} 2' in lines
+    assert 'queries_bucket{route="/r",le="5"} 3' in lines
+    assert 'queries_bucket{route="/r",le="+Inf"} 4' in lines
+    assert 'queries_sum{route="/r"} 11' in lines
+    assert 'queries_count{route="/r"} 4' in lines
+
+
+def test_queries_outside_requests_are_ignored(session_factory):
+    registry = MetricsRegistry()
+    with session_factory() as db:
+        db.query(User).all()
+    assert "http_request_db_queries_count" not in registry.render()
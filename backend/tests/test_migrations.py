@@ -0,0 +1,126 @@
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect
+
+from app.database import Base
+import app.models  # noqa: F401
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+# Differences that mean the models and the migrations disagree on the schema
+SCHEMA_DIFFS = {"add_table", "remove_table", "add_column", "remove_column", "modify_nullable", "modify_type"}
+
+
+def alembic_config(connection) -> Config:
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    config.attributes["connection"] = connection
+    config.attributes["configure_logger"] = False
+    return config
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+def _diff_kind(diff):
+    # Column-level changes come back as a list of tuples
+    return diff[0][0] if isinstance(diff, list) else diff[0]
+
+
+def test_single_head():
+    script = ScriptDirectory.from_config(alembic_config(None))
+    assert len(script.get_heads()) == 1
+
+
+def test_upgrade_head_matches_models(engine):
+    with engine.begin() as connection:
+        command.upgrade(alembic_config(connection), "head")
+
+    with engine.connect() as connection:
+        diffs = compare_metadata(MigrationContext.configure(connection, opts={"compare_type": True}), Base.metadata)
+    assert [d for d in diffs if _diff_kind(d) in SCHEMA_DIFFS] == []
+
+
+def test_upgrade_creates_read_path_indexes(engine):
+    with engine.begin() as connection:
+        command.upgrade(alembic_config(connection), "head")
+
+    indexes = {i["name"]: i["column_names"] for i in inspect(engine).get_indexes("journal_entries")}
+    assert indexes["idx_journal_entries_user_created"] == ["user_id", "created_at"]
+    assert "idx_prompts_active_category" in {i["name"] for i in inspect(engine).get_indexes("prompts")}
+
+
+def test_baseline_matches_setup_script(engine):
+    with engine.begin() as connection:
+        command.upgrade(alembic_config(connection), "0001_baseline")
+
+    assert not {"chat_sessions", "chat_messages", "api_usage"} & set(inspect(engine).get_table_names())
+    indexes = {i["name"] for i in inspect(engine).get_indexes("journal_entries")}
+    assert "idx_journal_entries_user_id" in indexes
+    assert "idx_journal_entries_user_created" not in indexes
+
+
+def test_stamped_database_with_chat_tables_upgrades(engine):
+    # Interim copies of setup_db.sql already created the chat and usage tables
+    with engine.begin() as connection:
+        config = alembic_config(connection)
+        command.upgrade(config, "0001a_chat_and_usage")
+        command.stamp(config, "0001_baseline")
+        command.upgrade(config, "head")
+
+    indexes = {i["name"] for i in inspect(engine).get_indexes("journal_entries")}
+    assert "idx_journal_entries_user_created" in indexes
+    assert "idx_journal_entries_user_id" not in indexes
+
+
+def test_downgrade_to_base_drops_everything(engine):
+    with engine.begin() as connection:
+        config = alembic_config(connection)
+        command.upgrade(config, "head")
+        command.downgrade(config, "base")
+
+    assert set(inspect(engine).get_table_names()) == {"alembic_version"}
+
+
+def test_uuid_migration_keeps_legacy_ids_reachable(engine):
+    from sqlalchemy.orm import Session
+
+    from app.core.ids import legacy_ids
+    from app.models.db_models import JournalEntry, User
+
+    entry_id = "0b7f4f4e-8f5a-4c1e-9d6b-2f4f0c9a1e11"
+    with engine.begin() as connection:
+        config = alembic_config(connection)
+        command.upgrade(config, "0005_partition_journal_entries")
+        connection.exec_driver_sql(
+            "INSERT INTO users (id, email, username, hashed_password) VALUES ('user-1', 'a@example.com', 'a', 'x')"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO journal_entries (id, user_id, text, reflections) VALUES (?, 'user-1', 'hello', '[]')",
+            (entry_id,),
+        )
+        command.upgrade(config, "head")
+
+    with Session(engine) as db:
+        # Seed ids keep working at the API boundary; real UUIDs come back unchanged
+        legacy_ids.ensure_loaded(db)
+        entry = db.query(JournalEntry).filter(JournalEntry.user_id == "user-1").one()
+        assert (entry.id, entry.user_id) == (entry_id, "user-1")
+        assert db.get(User, entry.user_id).username == "a"
+
+    with engine.begin() as connection:
+        command.downgrade(alembic_config(connection), "0005_partition_journal_entries")
+    with engine.connect() as connection:
+        # The downgrade puts the original values back
+        assert connection.exec_driver_sql("SELECT id FROM users").all() == [("user-1",)]
+        assert connection.exec_driver_sql("SELECT id, user_id FROM journal_entries").all() == [(entry_id, "user-1")]
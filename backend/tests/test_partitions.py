@@ -0,0 +1,41 @@
+from datetime import date
+
+from sqlalchemy import create_engine
+
+from app.services.partition_service import (
+    add_months, detach_before, ensure_partitions, missing_months, parse_bound, partition_ddl,
+)
+
+
+def test_add_months_rolls_over_years():
+    assert add_months(date(2024, 11, 1), 3) == date(2025, 2, 1)
+    assert add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+
+
+def test_partition_ddl_covers_one_utc_month():
+    assert partition_ddl(date(2024, 12, 1)) == (
+        "CREATE TABLE IF NOT EXISTS journal_entries_p2024_12 PARTITION OF journal_entries "
+        "FOR VALUES FROM ('2024-12-01 00:00:00+00') TO ('2025-01-01 00:00:00+00')"
+    )
+
+
+def test_parse_bound():
+    legacy = parse_bound("FOR VALUES FROM (MINVALUE) TO ('2024-03-01 00:00:00+00')")
+    assert legacy[0] is None and legacy[1].isoformat() == "2024-03-01T00:00:00+00:00"
+    monthly = parse_bound("FOR VALUES FROM ('2024-03-01 00:00:00+00') TO ('2024-04-01 00:00:00+00')")
+    assert (monthly[0].month, monthly[1].month) == (3, 4)
+    assert parse_bound("DEFAULT") is None
+
+
+def test_missing_months_skips_covered_months():
+    existing = [
+        ("journal_entries_legacy", *parse_bound("FOR VALUES FROM (MINVALUE) TO ('2024-04-01 00:00:00+00')")),
+        ("journal_entries_p2024_05", *parse_bound("FOR VALUES FROM ('2024-05-01 00:00:00+00') TO ('2024-06-01 00:00:00+00')")),
+    ]
+    assert missing_months(existing, date(2024, 3, 1), 3) == [date(2024, 4, 1), date(2024, 6, 1)]
+
+
+def test_maintenance_is_a_no_op_on_sqlite():
+    engine = create_engine("sqlite://")
+    assert ensure_partitions(engine) == []
+    assert detach_before(engine, date(2024, 1, 1)) == []
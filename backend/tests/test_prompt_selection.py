@@ -0,0 +1,74 @@
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+
+from app.api import prompts
+from app.core.catalog import taxonomy_catalog
+from app.models.db_models import EmotionCategory, JournalEntry, Prompt
+
+app = FastAPI()
+app.include_router(prompts.router, prefix="/api/prompts")
+
+HAPPY_PROMPTS = ["What brought you this joy today?", "What are you grateful for?", "What inspires you?"]
+
+
+@pytest.fixture(autouse=True, scope="module")
+def seed(session_factory, base_rows):
+    with session_factory() as db:
+        db.add(EmotionCategory(id=2, name="sad"))
+        db.add_all([Prompt(category_id=1, text=text) for text in HAPPY_PROMPTS])
+        db.add(Prompt(category_id=1, text="Retired prompt", is_active=False))
+        db.add(Prompt(category_id=2, text="What triggered this sadness?"))
+        now = datetime.utcnow()
+        db.add(JournalEntry(
+            id="e1", user_id="user-1", category_id=1, sub_emotion_id=1, text="t",
+            reflections=[{"prompt": HAPPY_PROMPTS[0], "response": "r", "timestamp": now.isoformat()}],
+            created_at=now, updated_at=now
+        ))
+        db.add(JournalEntry(
+            id="e0", user_id="user-1", category_id=1, sub_emotion_id=1, text="old",
+            reflections=[{"prompt": HAPPY_PROMPTS[1], "response": "r", "timestamp": now.isoformat()}],
+            created_at=now - timedelta(days=30), updated_at=now - timedelta(days=30)
+        ))
+        db.commit()
+    taxonomy_catalog.invalidate()
+    yield
+    taxonomy_catalog.invalidate()
+
+
+def test_list_excludes_inactive_prompts(client):
+    texts = [p["text"] for p in client.get("/api/prompts?category=happy").json()]
+    assert sorted(texts) == sorted(HAPPY_PROMPTS)
+
+
+def test_next_prompt_is_active_and_in_category(client):
+    for _ in range(20):
+        prompt = client.get("/api/prompts/next?category=happy").json()
+        assert prompt["text"] in HAPPY_PROMPTS
+
+
+def test_next_prompt_avoids_recently_answered(client, monkeypatch):
+    import app.core.prompt_index as module
+    monkeypatch.setattr(module, "RECENT_PROMPT_WEIGHT", 0.0)
+    monkeypatch.setattr(module, "RECENT_ENTRY_WINDOW", 1)
+    seen = Counter(
+        client.get("/api/prompts/next?category=happy&user_id=user-1").json()["text"]
+        for _ in range(60)
+    )
+    assert HAPPY_PROMPTS[0] not in seen
+    # Only the latest entry counts as recent
+    assert seen[HAPPY_PROMPTS[1]] > 0
+
+
+def test_unknown_category_returns_404(client):
+    assert client.get("/api/prompts/next?category=bored").status_code == 404
+
+
+def test_index_is_reused_between_requests(client, statements):
+    client.get("/api/prompts/next?category=happy")
+    statements.clear()
+    client.get("/api/prompts/next?category=happy")
+    client.get("/api/prompts?category=sad")
+    assert statements == []
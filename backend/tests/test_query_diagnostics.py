@@ -0,0 +1,100 @@
+import pytest
+from fastapi import FastAPI
+
+from app.api import admin
+from app.core.query_diagnostics import SlowQueryLog, capture_parameters, explain_pending, is_explainable, slow_query_log
+from app.database import install_query_hooks
+from app.models.db_models import JournalEntry, User
+
+app = FastAPI()
+app.include_router(admin.router, prefix="/api/admin")
+
+
+@pytest.fixture(autouse=True, scope="module")
+def seed(engine, session_factory, base_rows):
+    install_query_hooks(engine)
+    with session_factory() as db:
+        db.add(JournalEntry(id="entry-1", user_id="user-1", category_id=1, sub_emotion_id=1, text="Hello"))
+        db.commit()
+
+
+@pytest.fixture
+def capture_everything(monkeypatch):
+    monkeypatch.setattr(slow_query_log, "threshold_ms", 0.0)
+    monkeypatch.setattr(slow_query_log, "sample_rate", 1.0)
+    slow_query_log.clear()
+    yield slow_query_log
+    slow_query_log.clear()
+
+
+def test_slow_select_is_captured_and_explained(session_factory, engine, capture_everything):
+    with session_factory() as db:
+        db.query(JournalEntry).filter(JournalEntry.text == "Hello").all()
+        db.query(JournalEntry).filter(JournalEntry.id == "entry-1").all()
+
+    assert explain_pending(slow_query_log, engine) == 2
+    statements = slow_query_log.statements()
+    full_scan = next(s for s in statements if "WHERE journal_entries.text =" in s["statement"])
+    by_pk = next(s for s in statements if "WHERE journal_entries.id =" in s["statement"])
+    assert full_scan["seqScans"] == ["journal_entries"]
+    assert full_scan["lastParameters"] == ["Hello"]
+    assert full_scan["plan"] and full_scan["explainError"] is None
+    assert by_pk["seqScans"] == []
+
+
+def test_writes_are_captured_but_never_explained(session_factory, engine, capture_everything):
+    with session_factory() as db:
+        db.query(JournalEntry).filter(JournalEntry.id == "entry-1").update({"text": "Hello"})
+        db.commit()
+    statements = slow_query_log.statements()
+    update = next(s for s in statements if s["statement"].startswith("UPDATE journal_entries"))
+    # Row contents of writes are not kept
+    assert update["lastParameters"] is None
+    assert explain_pending(slow_query_log, engine) == 0
+
+
+def test_slow_query_log_line_has_no_parameters(session_factory, capture_everything, caplog):
+    with caplog.at_level("WARNING", logger="app.core.query_diagnostics"):
+        with session_factory() as db:
+            db.add(User(id="user-2", email="two@example.com", username="two", hashed_password="secret-hash"))
+            db.commit()
+            db.query(JournalEntry).filter(JournalEntry.text == "private words").all()
+    records = [r for r in caplog.records if r.getMessage().startswith("Slow query")]
+    assert records
+    for record in records:
+        assert not hasattr(record, "parameters")
+        assert "secret-hash" not in record.getMessage() and "private words" not in record.getMessage()
+
+
+def test_fast_queries_are_ignored():
+    log = SlowQueryLog(threshold_ms=100, sample_rate=1.0)
+    log.observe("SELECT 1", (), 0.01)
+    log.observe("SELECT 1", (), 0.5)
+    assert [s["count"] for s in log.statements()] == [1]
+    assert log.recent_queries()[0]["duration_ms"] == 500.0
+
+
+def test_statement_classification_and_parameter_capture():
+    assert is_explainable("  WITH x AS (SELECT 1) SELECT * FROM x")
+    assert not is_explainable("SELECT * FROM chat_sessions WHERE id = ? FOR UPDATE")
+    assert not is_explainable("DELETE FROM journal_entries")
+    captured = capture_parameters({"text": "x" * 500, "limit": 10})
+    assert captured["limit"] == 10 and len(captured["text"]) == 203
+    assert capture_parameters([("a", 1), ("b", 2)]) == ["a", 1]
+
+
+def test_admin_endpoint_requires_token(client, session_factory, monkeypatch, capture_everything):
+    monkeypatch.delenv("ADMIN_API_TOKEN", raising=False)
+    assert client.get("/api/admin/slow-queries").status_code == 404
+
+    monkeypatch.setenv("ADMIN_API_TOKEN", "secret")
+    assert client.get("/api/admin/slow-queries", headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+    with session_factory() as db:
+        db.query(User).all()
+    body = client.get("/api/admin/slow-queries", headers={"X-Admin-Token": "secret"}).json()
+    assert body["thresholdMs"] == 0.0
+    assert any("FROM users" in s["statement"] for s in body["statements"])
+
+    assert client.delete("/api/admin/slow-queries", headers={"X-Admin-Token": "secret"}).status_code == 200
+    assert slow_query_log.statements() == []
@@ -0,0 +1,143 @@
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.rate_limit import (
+    InMemoryBackend,
+    RateLimiter,
+    RateLimitMiddleware,
+    RateLimitRule,
+    TrustedProxies,
+    UsageRecorder,
+    client_address
+)
+from app.database import Base
+from app.models.db_models import ApiUsage
+
+
+PEER = "192.0.2.1"
+
+
+def make_client(capacity=2, period=60, trusted=(), backend=None):
+    limiter = RateLimiter(
+        [RateLimitRule("completion", "/api/completion", capacity=capacity, period=period, methods=("POST",))],
+        backend=backend or InMemoryBackend(),
+        recorder=UsageRecorder(),
+        trusted_proxies=TrustedProxies(trusted)
+    )
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, limiter=limiter)
+
+    @app.post("/api/completion")
+    async def completion():
+        return {"message": "ok", "thread": threading.get_ident()}
+
+    @app.get("/api/prompts")
+    async def prompts():
+        return []
+
+    async def from_peer(scope, receive, send):
+        # This TestClient leaves the peer address unset; a server always fills it in
+        await app({**scope, "client": (PEER, 50000)}, receive, send)
+
+    return TestClient(from_peer), limiter
+
+
+def test_requests_over_capacity_get_429_with_retry_after():
+    client, _ = make_client(capacity=2, period=60)
+    headers = {"X-User-Id": "user-1"}
+    assert client.post("/api/completion", headers=headers).status_code == 200
+    second = client.post("/api/completion", headers=headers)
+    assert second.status_code == 200
+    assert second.headers["x-ratelimit-remaining"] == "0"
+
+    rejected = client.post("/api/completion", headers=headers)
+    assert rejected.status_code == 429
+    assert 1 <= int(rejected.headers["retry-after"]) <= 30
+
+
+def test_limits_are_per_client_and_per_route():
+    # Trusting the peer lets X-Forwarded-For pick the address
+    client, _ = make_client(capacity=1, trusted=[PEER])
+    assert client.post("/api/completion", headers={"X-Forwarded-For": "10.0.0.1"}).status_code == 200
+    assert client.post("/api/completion", headers={"X-Forwarded-For": "10.0.0.1"}).status_code == 429
+    assert client.post("/api/completion", headers={"X-Forwarded-For": "10.0.0.2"}).status_code == 200
+    # Unlimited routes are untouched
+    for _ in range(5):
+        assert client.get("/api/prompts", headers={"X-Forwarded-For": "10.0.0.1"}).status_code == 200
+
+
+def test_rotating_user_ids_still_hits_the_address_limit():
+    client, limiter = make_client(capacity=2)
+    statuses = [client.post("/api/completion", headers={"X-User-Id": f"user-{i}"}).status_code for i in range(5)]
+    assert statuses == [200, 200, 429, 429, 429]
+    # Rejected requests never created buckets for their made-up ids
+    assert limiter.backend._buckets.get("completion:user:user-4") is None
+
+
+def test_claimed_user_is_limited_across_addresses():
+    client, _ = make_client(capacity=1, trusted=[PEER])
+    headers = {"X-User-Id": "a", "X-Forwarded-For": "10.0.0.1"}
+    assert client.post("/api/completion", headers=headers).status_code == 200
+    assert client.post("/api/completion", headers={**headers, "X-Forwarded-For": "10.0.0.2"}).status_code == 429
+
+
+def test_forwarded_for_is_ignored_from_untrusted_peers():
+    client, _ = make_client(capacity=1)
+    assert client.post("/api/completion", headers={"X-Forwarded-For": "10.0.0.1"}).status_code == 200
+    assert client.post("/api/completion", headers={"X-Forwarded-For": "10.0.0.2"}).status_code == 429
+
+
+def test_client_address_skips_trusted_hops():
+    trusted = TrustedProxies(["10.0.0.0/8", "127.0.0.1"])
+    scope = {"client": ("127.0.0.1", 1), "headers": [(b"x-forwarded-for", b"6.6.6.6, 203.0.113.9, 10.1.2.3")]}
+    # The spoofed leftmost entry is not trusted; the first untrusted hop from the right is the client
+    assert client_address(scope, trusted) == "203.0.113.9"
+    assert client_address({**scope, "client": ("198.51.100.7", 1)}, trusted) == "198.51.100.7"
+    assert client_address({"client": ("127.0.0.1", 1), "headers": []}, trusted) == "127.0.0.1"
+
+
+def test_bucket_refills_over_time():
+    client, _ = make_client(capacity=1, period=0.05)
+    assert client.post("/api/completion?user_id=u").status_code == 200
+    assert client.post("/api/completion?user_id=u").status_code == 429
+    time.sleep(0.06)
+    assert client.post("/api/completion?user_id=u").status_code == 200
+
+
+def test_usage_is_flushed_as_daily_counters():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine, tables=[ApiUsage.__table__])
+    SessionLocal = sessionmaker(bind=engine)
+
+    client, limiter = make_client(capacity=1)
+    for _ in range(3):
+        client.post("/api/completion", headers={"X-User-Id": "u"})
+    with SessionLocal() as db:
+        assert limiter.recorder.flush(db) == 1
+    client.post("/api/completion", headers={"X-User-Id": "u"})
+    with SessionLocal() as db:
+        limiter.recorder.flush(db)
+        usage = db.query(ApiUsage).one()
+        assert (usage.user_key, usage.route) == ("user:u", "completion")
+        assert usage.request_count == 1
+        assert usage.rejected_count == 3
+
+
+def test_backend_is_not_called_on_the_event_loop():
+    class RecordingBackend(InMemoryBackend):
+        threads = []
+
+        def take(self, key, rule, cost=1.0):
+            self.threads.append(threading.get_ident())
+            return super().take(key, rule, cost)
+
+    client, _ = make_client(backend=RecordingBackend())
+    # The async endpoint runs on the event loop thread
+    loop_thread = client.post("/api/completion").json()["thread"]
+    assert RecordingBackend.threads and loop_thread not in RecordingBackend.threads
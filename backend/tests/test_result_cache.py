@@ -0,0 +1,279 @@
+import asyncio
+import fnmatch
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+
+from app.api import journal, user
+from app.core.events import EventBus
+from app.core.result_cache import InMemoryCacheBackend, RedisCacheBackend, ResultCache, result_cache
+from app.models.db_models import User
+from app.services import erasure_service, summary_service
+
+
+class FakeRedis:
+    """The slice of redis-py the cache uses, with real expiry and NX semantics."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        value, expires = self.data.get(key, (None, 0))
+        return value if expires > time.monotonic() else None
+
+    def set(self, key, value, px, nx=False):
+        if nx and self.get(key) is not None:
+            return None
+        self.data[key] = (value, time.monotonic() + px / 1000)
+        return True
+
+    def scan_iter(self, pattern):
+        return [key for key in list(self.data) if fnmatch.fnmatch(key, pattern)]
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+def memory_cache(**kwargs) -> ResultCache:
+    return ResultCache(InMemoryCacheBackend(max_entries=kwargs.get("entries", 100), max_bytes=kwargs.get("bytes", 1 << 20)), ttl=60)
+
+
+def compute(value: bytes):
+    calls = []
+
+    async def run():
+        calls.append(1)
+        return value
+
+    return run, calls
+
+
+def test_hits_after_first_read_and_misses_after_invalidation():
+    cache = memory_cache()
+    run, calls = compute(b"[1]")
+
+    assert asyncio.run(cache.cached("user-1", "entries", run)) == b"[1]"
+    assert asyncio.run(cache.cached("user-1", "entries", run)) == b"[1]"
+    assert len(calls) == 1
+
+    cache.invalidate_user("user-1")
+    asyncio.run(cache.cached("user-1", "entries", run))
+    assert len(calls) == 2
+    assert cache.stats()["hit_ratio"] == round(1 / 3, 4)
+
+
+def test_invalidation_is_per_user_and_matches_uuid_form():
+    from app.core.ids import to_uuid
+
+    cache = memory_cache()
+    _, slot_1 = cache.lookup("user-1", "entries")
+    cache.store(slot_1, b"one")
+    _, slot_2 = cache.lookup("user-2", "entries")
+    cache.store(slot_2, b"two")
+
+    cache.invalidate_user(str(to_uuid("user-1")))
+
+    assert cache.lookup("user-1", "entries")[0] is None
+    assert cache.lookup("user-2", "entries")[0] == b"two"
+
+
+def test_read_racing_a_write_is_never_served():
+    cache = memory_cache()
+    # The read captures its slot, then a write commits before it stores
+    _, slot = cache.lookup("user-1", "entries")
+    cache.invalidate_user("user-1")
+    cache.store(slot, b"before the write")
+
+    assert cache.lookup("user-1", "entries")[0] is None
+
+
+def test_evicted_version_does_not_resurrect_old_entries():
+    cache = memory_cache()
+    _, slot = cache.lookup("user-1", "entries")
+    cache.store(slot, b"old")
+    cache.invalidate_user("user-1")
+    # Losing the version entry (LRU or expiry) must not bring back an earlier one
+    cache.backend.entries.delete(f"v:{cache._user('user-1')}")
+
+    assert cache.lookup("user-1", "entries")[0] is None
+
+
+def test_memory_backend_is_bounded_by_bytes():
+    cache = memory_cache(bytes=4096)
+    for i in range(20):
+        _, slot = cache.lookup(f"user-{i}", "entries")
+        cache.store(slot, b"x" * 500)
+
+    assert cache.backend.entries.current_bytes <= 4096
+    assert cache.backend.entries.evictions > 0
+
+
+def test_disabled_cache_always_computes():
+    cache = ResultCache(None, ttl=60)
+    run, calls = compute(b"[]")
+    asyncio.run(cache.cached("user-1", "entries", run))
+    asyncio.run(cache.cached("user-1", "entries", run))
+    assert len(calls) == 2
+    # A no-op without a backend
+    cache.invalidate_user("user-1")
+
+
+def test_failing_backend_degrades_to_computing(caplog):
+    class Down(InMemoryCacheBackend):
+        def get(self, key):
+            raise ConnectionError("down")
+
+        def add(self, key, value, ttl):
+            raise ConnectionError("down")
+
+    cache = ResultCache(Down(10, 1024), ttl=60)
+    run, calls = compute(b"[]")
+    assert asyncio.run(cache.cached("user-1", "entries", run)) == b"[]"
+    assert cache.stats()["errors"] == 1
+    assert "Result cache version failed" in caplog.text
+
+
+def test_shared_backend_invalidates_every_worker():
+    redis = FakeRedis()
+    worker_a, worker_b = ResultCache(RedisCacheBackend(redis), ttl=60), ResultCache(RedisCacheBackend(redis), ttl=60)
+    run, calls = compute(b"[1]")
+    asyncio.run(worker_a.cached("user-1", "entries", run))
+    asyncio.run(worker_b.cached("user-1", "entries", run))
+    assert len(calls) == 1
+
+    worker_a.invalidate_user("user-1")
+    asyncio.run(worker_b.cached("user-1", "entries", run))
+    assert len(calls) == 2
+
+    worker_b.clear()
+    assert redis.data == {}
+
+
+def test_shared_backend_is_not_called_on_the_event_loop():
+    class RecordingRedis(FakeRedis):
+        threads = set()
+
+        def get(self, key):
+            self.threads.add(threading.get_ident())
+            return super().get(key)
+
+        def set(self, key, value, px, nx=False):
+            self.threads.add(threading.get_ident())
+            return super().set(key, value, px, nx)
+
+    cache = ResultCache(RedisCacheBackend(RecordingRedis()), ttl=60)
+    run, calls = compute(b"[1]")
+
+    async def read_twice():
+        await cache.cached("user-1", "entries", run)
+        await cache.cached("user-1", "entries", run)
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(read_twice())
+    assert len(calls) == 1
+    assert RecordingRedis.threads and loop_thread not in RecordingRedis.threads
+
+
+def test_event_bus_isolates_failing_handlers(caplog):
+    bus = EventBus()
+    seen = []
+
+    def broken(**payload):
+        raise RuntimeError("boom")
+
+    bus.subscribe("entry.created", broken)
+    bus.subscribe("entry.created", lambda **payload: seen.append(payload))
+    bus.publish("entry.created", user_id="user-1")
+    bus.unsubscribe("entry.created", broken)
+    bus.publish("entry.created", user_id="user-2")
+
+    assert seen == [{"user_id": "user-1"}, {"user_id": "user-2"}]
+    assert caplog.text.count("failed") == 1
+
+
+app = FastAPI()
+app.include_router(journal.router, prefix="/api/journal")
+app.include_router(user.router, prefix="/api/user")
+
+
+@pytest.fixture(autouse=True, scope="module")
+def seed(session_factory, base_rows):
+    with session_factory() as db:
+        db.add(User(id="user-2", email="two@example.com", username="two", hashed_password="x"))
+        db.commit()
+
+
+@pytest.fixture(autouse=True)
+def fixed_insights(monkeypatch):
+    async def insights(patterns, mood_changes, entries_text=None):
+        return f"{len(entries_text or [])} entries"
+
+    monkeypatch.setattr(summary_service, "generate_insights", insights)
+
+
+def post_entry(client, user_id: str, text: str) -> dict:
+    response = client.post("/api/journal/", json={"user_id": user_id, "category_id": 1, "sub_emotion_id": 1, "text": text})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_entry_list_is_cached_until_the_user_writes(client, statements):
+    post_entry(client, "user-1", "first")
+    assert [e["text"] for e in client.get("/api/journal/user/user-1").json()] == ["first"]
+    statements.clear()
+    assert [e["text"] for e in client.get("/api/journal/user/user-1").json()] == ["first"]
+    assert statements == []
+
+    post_entry(client, "user-1", "second")
+    assert [e["text"] for e in client.get("/api/journal/user/user-1").json()] == ["second", "first"]
+
+
+def test_another_users_write_keeps_the_cache(client, statements):
+    post_entry(client, "user-1", "mine")
+    client.get("/api/journal/user/user-1")
+    post_entry(client, "user-2", "theirs")
+    statements.clear()
+    client.get("/api/journal/user/user-1")
+    assert statements == []
+
+
+def test_entry_detail_reflects_a_new_reflection(client, statements):
+    entry = post_entry(client, "user-1", "detail")
+    path = f"/api/journal/{entry['id']}"
+    client.get(path)
+    client.get(path)
+    statements.clear()
+    assert client.get(path).json()["reflections"] == []
+    assert statements == []
+
+    response = client.patch(path, json={"prompt": "Why?", "response": "Because"})
+    assert response.status_code == 200
+    assert client.get(path).json()["reflections"][0]["response"] == "Because"
+
+
+def test_weekly_summary_is_cached_until_the_user_writes(client, statements):
+    path = "/api/user/weekly-summary?user_id=user-2"
+    first = client.get(path).json()
+    statements.clear()
+    assert client.get(path).json() == first
+    assert statements == []
+
+    post_entry(client, "user-2", "new entry")
+    assert client.get(path).json()["personalizedInsights"] != first["personalizedInsights"]
+
+
+def test_user_deletion_invalidates_the_users_results(client, session_factory):
+    with session_factory() as db:
+        db.add(User(id="user-9", email="nine@example.com", username="nine", hashed_password="x"))
+        db.commit()
+    _, slot = result_cache.lookup("user-9", "entries:0:100")
+    result_cache.store(slot, b'[{"text": "stale"}]')
+    assert client.get("/api/journal/user/user-9").json() == [{"text": "stale"}]
+
+    with session_factory() as db:
+        erasure_service.request_erasure(db, "user-9")
+    # The erasure job publishes the deletion when it finishes
+    erasure_service.erase_user(session_factory, "user-9")
+    assert client.get("/api/journal/user/user-9").json() == []
@@ -0,0 +1,120 @@
+import gzip
+from datetime import datetime
+
+import brotli
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+from app.core.http_cache import StaticPayload, cached_json_response
+from app.core.serialization import (
+    COMPRESSION_MIN_SIZE,
+    CompressionMiddleware,
+    ORJSONResponse,
+    choose_encoding,
+    dumps,
+)
+
+LARGE = [{"id": i, "text": "How did this moment make you feel?"} for i in range(100)]
+STATIC = StaticPayload('"v1-prompts-all"', dumps(LARGE))
+
+app = FastAPI(default_response_class=ORJSONResponse)
+app.add_middleware(CompressionMiddleware)
+
+
+@app.get("/large")
+def large():
+    return LARGE
+
+
+@app.get("/small")
+def small():
+    return {"ok": True}
+
+
+@app.get("/text")
+def text():
+    return PlainTextResponse("x" * 4096, headers={"Vary": "Origin"})
+
+
+@app.get("/static")
+def static(request: Request):
+    return cached_json_response(request, STATIC)
+
+
+client = TestClient(app)
+
+
+def raw_get(path, **headers):
+    # Bypass httpx's transparent decompression to inspect the bytes on the wire
+    with client.stream("GET", path, headers=headers) as response:
+        return response, b"".join(response.iter_raw())
+
+
+@pytest.mark.parametrize("header,expected", [
+    (None, None),
+    ("identity", None),
+    ("gzip, deflate", "gzip"),
+    ("gzip, deflate, br", "br"),
+    ("br;q=0, gzip", "gzip"),
+    ("*", "gzip"),
+])
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header) == expected
+
+
+def test_dumps_handles_datetimes():
+    assert dumps({"at": datetime(2024, 3, 20, 10, 30)}) == b'{"at":"2024-03-20T10:30:00"}'
+
+
+def test_large_json_is_compressed_with_preferred_encoding():
+    response, body = raw_get("/large", **{"Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) == len(body)
+    assert brotli.decompress(body) == dumps(LARGE)
+
+    response, body = raw_get("/large", **{"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body) == dumps(LARGE)
+
+
+def test_small_and_unaccepted_responses_are_left_alone():
+    response, body = raw_get("/small", **{"Accept-Encoding": "gzip, br"})
+    assert "content-encoding" not in response.headers
+    assert len(body) < COMPRESSION_MIN_SIZE
+
+    response, body = raw_get("/large", **{"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert body == dumps(LARGE)
+
+
+def test_existing_vary_is_extended():
+    response, _ = raw_get("/text", **{"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Origin, Accept-Encoding"
+
+
+def test_static_payload_serves_precompressed_variant():
+    response, body = raw_get("/static", **{"Accept-Encoding": "br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["etag"] == '"v1-prompts-all-br"'
+    assert body == STATIC.variants["br"]
+
+    response, body = raw_get("/static", **{"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"v1-prompts-all"'
+    assert body == STATIC.body
+
+
+def test_revalidation_accepts_any_variant_etag():
+    for etag in ('"v1-prompts-all"', '"v1-prompts-all-gzip"', 'W/"v1-prompts-all-br"'):
+        response = client.get("/static", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+        assert response.status_code == 304
+    assert client.get("/static", headers={"If-None-Match": '"v0-prompts-all"'}).status_code == 200
+
+
+def test_small_static_payload_has_no_compressed_variants():
+    payload = StaticPayload('"v1-categories-all"', b"[]")
+    assert set(payload.variants) == {"identity"}
@@ -0,0 +1,162 @@
+import asyncio
+import http.client
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from app.api import health
+from app.core import server
+from app.core.server import available_cpus, pool_limits, worker_count
+from app.core.startup import readiness
+
+
+def test_pool_limits_unlimited_without_max_connections():
+    assert pool_limits(5, 10, None, 8) == (5, 10)
+
+
+def test_pool_limits_split_max_connections_across_processes():
+    # 4 workers on 2 hosts share 40 connections: 5 each, all of them pooled
+    assert pool_limits(5, 10, 40, 8) == (5, 0)
+    assert pool_limits(5, 10, 100, 8) == (5, 7)
+    assert pool_limits(20, 10, 90, 4) == (20, 2)
+    # Never below one connection per worker
+    assert pool_limits(5, 10, 3, 8) == (1, 0)
+
+
+def test_worker_count_prefers_configured_value():
+    assert worker_count("3") == 3
+    assert worker_count("0") == 1
+    assert worker_count(None) == available_cpus()
+
+
+def test_available_cpus_respects_cgroup_quota(tmp_path, monkeypatch):
+    cpu_max = tmp_path / "cpu.max"
+    monkeypatch.setattr(server, "CGROUP_V2_CPU_MAX", cpu_max)
+    monkeypatch.setattr(server.os, "sched_getaffinity", lambda pid: set(range(8)))
+
+    cpu_max.write_text("max 100000\n")
+    assert available_cpus() == 8
+    cpu_max.write_text("150000 100000\n")
+    assert available_cpus() == 2
+    cpu_max.write_text("50000 100000\n")
+    assert available_cpus() == 1
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'ready.db'}", connect_args={"check_same_thread": False})
+    monkeypatch.setattr(health, "engine", engine)
+    monkeypatch.setattr(readiness, "started", True)
+    monkeypatch.setattr(readiness, "draining", False)
+    app = FastAPI()
+    app.include_router(health.router)
+    yield TestClient(app)
+    engine.dispose()
+
+
+def test_health_does_not_depend_on_readiness(client):
+    readiness.started = False
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+
+def test_ready_reports_database_and_pool(client):
+    response = client.get("/ready")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "ready"
+    assert body["database"]["ok"] is True
+    assert "checkedout" in body["database"]["pool"]
+
+
+def test_ready_fails_before_startup_and_while_draining(client):
+    readiness.started = False
+    assert client.get("/ready").json() == {"status": "starting"}
+    readiness.started = True
+    readiness.draining = True
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json() == {"status": "draining"}
+
+
+def test_ready_fails_when_database_is_down(client, monkeypatch):
+    def unreachable(engine):
+        raise ConnectionError("connection refused")
+
+    monkeypatch.setattr(health, "ping", unreachable)
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["database"]["ok"] is False
+
+
+def test_ready_times_out_on_hung_database(monkeypatch):
+    def hung(engine):
+        time.sleep(0.5)
+
+    monkeypatch.setattr(health, "ping", hung)
+    result = asyncio.run(health.check_database(create_engine("sqlite://"), timeout=0.05))
+    assert result["ok"] is False
+    assert "TimeoutError" in result["error"]
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def get_ready(port: int):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+    try:
+        conn.request("GET", "/ready")
+        return conn.getresponse().status
+    finally:
+        conn.close()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs POSIX signals")
+def test_sigterm_fails_ready_before_the_worker_stops_serving(tmp_path):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    env = {
+        **os.environ, "DATABASE_URL": f"sqlite:///{tmp_path / 'drain.db'}?check_same_thread=false",
+        "WEB_CONCURRENCY": "1", "DRAIN_SECONDS": "1.5", "GRACEFUL_TIMEOUT": "5", "LOG_LEVEL": "WARNING",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app.main:app", "-c", "gunicorn.conf.py", "--bind", f"127.0.0.1:{port}"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            assert time.monotonic() < deadline and server.poll() is None, "server never became ready"
+            try:
+                if get_ready(port) == 200:
+                    break
+            except OSError:
+                pass
+            time.sleep(0.1)
+
+        server.send_signal(signal.SIGTERM)
+        signalled = time.monotonic()
+        # Still listening, but telling the load balancer to go away
+        statuses = []
+        while time.monotonic() - signalled < 1.0:
+            statuses.append(get_ready(port))
+            time.sleep(0.05)
+        assert statuses[-1] == 503 and statuses.count(200) <= 2
+
+        assert server.wait(timeout=15) == 0
+        assert time.monotonic() - signalled >= 1.5
+    finally:
+        if server.poll() is None:
+            server.kill()
+            server.wait()
@@ -0,0 +1,185 @@
+import asyncio
+import time
+from datetime import datetime
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api import journal
+from app.core.db_routing import RecentWrites, install_write_tracking
+from app.core.metrics import MetricsRegistry
+from app.core.single_flight import SingleFlight
+from app.database import Base, get_db, get_read_db
+from app.models.db_models import EmotionCategory, JournalEntry, SubEmotion, User
+from app.services.journal_repository import JournalRepository
+
+
+def coalesced(registry: MetricsRegistry, route: str, result: str) -> float:
+    return registry.single_flight._series.get((("result", result), ("route", route)), 0)
+
+
+class SlowCompute:
+    def __init__(self, result="done", error=None):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.result = result
+        self.error = error
+
+    async def __call__(self):
+        self.calls += 1
+        call = self.calls
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return f"{self.result}-{call}"
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_calls_share_one_computation():
+    registry = MetricsRegistry()
+    flights = SingleFlight(registry)
+    compute = SlowCompute()
+
+    waiters = [asyncio.ensure_future(flights.run("entries", ("user-1", 0), compute)) for _ in range(5)]
+    await asyncio.sleep(0)
+    compute.release.set()
+
+    assert await asyncio.gather(*waiters) == ["done-1"] * 5
+    assert compute.calls == 1
+    assert coalesced(registry, "entries", "leader") == 1
+    assert coalesced(registry, "entries", "coalesced") == 4
+    assert len(flights) == 0
+
+
+@pytest.mark.asyncio
+async def test_different_keys_and_later_calls_compute_again():
+    flights = SingleFlight(MetricsRegistry())
+    compute = SlowCompute()
+    compute.release.set()
+
+    first, other = await asyncio.gather(
+        flights.run("entries", ("user-1", 0), compute), flights.run("entries", ("user-1", 100), compute)
+    )
+    later = await flights.run("entries", ("user-1", 0), compute)
+
+    assert (first, other, later) == ("done-1", "done-2", "done-3")
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared():
+    flights = SingleFlight(MetricsRegistry())
+    compute = SlowCompute(error=ValueError("boom"))
+
+    waiters = [asyncio.ensure_future(flights.run("summary", "user-1", compute)) for _ in range(3)]
+    await asyncio.sleep(0)
+    compute.release.set()
+
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert all(isinstance(r, ValueError) for r in results)
+    assert compute.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_forget_users_starts_a_fresh_flight():
+    flights = SingleFlight(MetricsRegistry())
+    compute = SlowCompute()
+
+    before = asyncio.ensure_future(flights.run("summary", "user-1", compute, user_id="user-1"))
+    await asyncio.sleep(0)
+    flights.forget_users(["user-1"])
+    after = asyncio.ensure_future(flights.run("summary", "user-1", compute, user_id="user-1"))
+    await asyncio.sleep(0)
+    compute.release.set()
+
+    assert await before == "done-1"
+    assert await after == "done-2"
+
+
+@pytest.mark.asyncio
+async def test_follower_recomputes_when_leader_is_cancelled():
+    flights = SingleFlight(MetricsRegistry())
+    compute = SlowCompute()
+
+    leader = asyncio.ensure_future(flights.run("summary", "user-1", compute))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(flights.run("summary", "user-1", compute))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    compute.release.set()
+
+    assert await follower == "done-2"
+    assert leader.cancelled()
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with SessionLocal() as db:
+        db.add_all([
+            User(id="user-1", email="one@example.com", username="one", hashed_password="x"),
+            EmotionCategory(id=1, name="happy"),
+            SubEmotion(id=1, category_id=1, name="Joyful", intensity=5),
+        ])
+        db.flush()
+        db.add(JournalEntry(id="entry-1", user_id="user-1", category_id=1, sub_emotion_id=1, text="First",
+                            created_at=datetime(2024, 3, 20), updated_at=datetime(2024, 3, 20)))
+        db.commit()
+    yield SessionLocal
+    engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_user_entries_route_coalesces_concurrent_requests(session_factory, monkeypatch):
+    queries = []
+    list_rows = JournalRepository.list_rows
+
+    def slow_list_rows(self, **kwargs):
+        queries.append(kwargs)
+        time.sleep(0.1)
+        return list_rows(self, **kwargs)
+
+    monkeypatch.setattr(JournalRepository, "list_rows", slow_list_rows)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(journal.router, prefix="/api/journal")
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        responses = await asyncio.gather(*[client.get("/api/journal/user/user-1") for _ in range(4)])
+
+    assert [r.status_code for r in responses] == [200] * 4
+    assert all(r.json()[0]["text"] == "First" for r in responses)
+    assert len(queries) == 1
+
+
+@pytest.mark.asyncio
+async def test_committed_writes_detach_the_writers_flights(session_factory):
+    flights = SingleFlight(MetricsRegistry())
+    install_write_tracking(session_factory, RecentWrites(5), on_commit=flights.forget_users)
+    compute = SlowCompute()
+
+    before = asyncio.ensure_future(flights.run("summary", "user-1", compute, user_id="user-1"))
+    await asyncio.sleep(0)
+    with session_factory() as db:
+        db.get(JournalEntry, "entry-1").text = "Edited"
+        db.commit()
+    after = asyncio.ensure_future(flights.run("summary", "user-1", compute, user_id="user-1"))
+    await asyncio.sleep(0)
+    compute.release.set()
+
+    assert (await before, await after) == ("done-1", "done-2")
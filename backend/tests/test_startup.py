@@ -0,0 +1,59 @@
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.catalog import taxonomy_catalog
+from app.core.startup import warm_pool, warm_up
+from app.database import Base
+from app.models.db_models import EmotionCategory
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'startup.db'}", connect_args={"check_same_thread": False})
+    yield engine
+    engine.dispose()
+
+
+def test_warm_pool_leaves_connections_checked_in(engine):
+    assert warm_pool(engine, 3) == 3
+    assert engine.pool.checkedin() == 3
+    assert engine.pool.checkedout() == 0
+
+
+def test_warm_up_preloads_taxonomy(engine):
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine)
+    with SessionLocal() as db:
+        db.add(EmotionCategory(id=1, name="happy"))
+        db.commit()
+    taxonomy_catalog.invalidate()
+
+    asyncio.run(warm_up(engine, SessionLocal, connections=2))
+
+    assert taxonomy_catalog.is_loaded
+    assert b'"happy"' in taxonomy_catalog.payload("categories").body
+    taxonomy_catalog.invalidate()
+
+
+def test_warm_up_survives_missing_schema(engine, caplog):
+    taxonomy_catalog.invalidate()
+    asyncio.run(warm_up(engine, sessionmaker(bind=engine), connections=1))
+    assert "Startup warm-up step taxonomy failed" in caplog.text
+    assert not taxonomy_catalog.is_loaded
+
+
+def test_ai_modules_do_not_import_openai():
+    code = "import sys, app.core.llm, app.api.bot, app.api.completion, app.core.security; print('openai' in sys.modules, 'passlib' in sys.modules)"
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        env={"DATABASE_URL": "sqlite://", "PATH": ""},
+    ).stdout
+    assert out.split() == ["False", "False"]
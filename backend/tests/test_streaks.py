@@ -0,0 +1,233 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+
+from app.api import journal, user
+from app.core.activity import active_count, active_dates, longest_run, year_bitmaps
+from app.core.streaks import WINDOW_DAYS, StreakState, local_day, parse_timezone, rebuild
+from app.models.db_models import ActivityYear, JournalEntry, User, UserStreak
+
+app = FastAPI()
+app.include_router(journal.router, prefix="/api/journal")
+app.include_router(user.router, prefix="/api/user")
+
+D = date(2024, 3, 10)
+
+
+def days(*offsets):
+    return [D + timedelta(days=o) for o in offsets]
+
+
+def brute_force(active):
+    """Longest run and the run ending at the latest day, by scanning."""
+    active = sorted(set(active))
+    longest = run = 0
+    previous = None
+    for day in active:
+        run = run + 1 if previous and (day - previous).days == 1 else 1
+        longest = max(longest, run)
+        previous = day
+    return run, longest
+
+
+@pytest.fixture(autouse=True, scope="module")
+def seed(session_factory, base_rows):
+    with session_factory() as db:
+        db.add_all([
+            User(id="user-2", email="two@example.com", username="two", hashed_password="x"),
+            User(id="legacy", email="legacy@example.com", username="legacy", hashed_password="x"),
+            User(id="user-3", email="three@example.com", username="three", hashed_password="x"),
+            User(id="user-4", email="four@example.com", username="four", hashed_password="x"),
+        ])
+        db.commit()
+
+
+def test_consecutive_days_and_gaps():
+    state = StreakState()
+    for day in days(0, 1, 2, 4, 5):
+        state.record(day)
+    assert (state.current, state.longest, state.active_days) == (2, 3, 5)
+    assert state.record(D + timedelta(days=5)) is False
+    assert state.current_as_of(D + timedelta(days=6)) == 2
+    assert state.current_as_of(D + timedelta(days=7)) == 0
+
+
+def test_back_dated_day_joins_runs():
+    state = StreakState()
+    for day in days(0, 1, 3, 4, 5):
+        state.record(day)
+    assert (state.current, state.longest) == (3, 3)
+    state.record(D + timedelta(days=2))
+    assert (state.current, state.longest, state.active_days) == (6, 6, 6)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_any_order_matches_rebuild(seed):
+    import random
+
+    rng = random.Random(seed)
+    active = [D + timedelta(days=rng.randrange(60)) for _ in range(40)]
+    state = StreakState()
+    for day in rng.sample(active, len(active)):
+        state.record(day)
+    expected = rebuild(active)
+    assert (state.current, state.longest, state.active_days, state.last_day) == \
+        (expected.current, expected.longest, expected.active_days, expected.last_day)
+    assert (state.current, state.longest) == brute_force(active)
+
+
+def test_back_dated_beyond_window_uses_bounded_lookup():
+    old = D - timedelta(days=WINDOW_DAYS + 10)
+    older_days = {old - timedelta(days=1), old - timedelta(days=2), old + timedelta(days=1)}
+    lookups = []
+
+    def lookup(start, end):
+        lookups.append((start, end))
+        return older_days
+
+    state = StreakState()
+    state.record(D)
+    state.record(old, lookup)
+    assert state.longest == 4
+    assert len(lookups) == 1
+    assert state.current == 1
+
+
+def test_repeated_day_beyond_window_is_counted_once():
+    old = D - timedelta(days=WINDOW_DAYS + 134)
+    recorded = set()
+
+    def lookup(start, end):
+        return {day for day in recorded if start <= day <= end}
+
+    state = StreakState()
+    for day in [D, old, old, old]:
+        if state.record(day, lookup):
+            recorded.add(day)
+    assert (state.active_days, state.longest, state.current) == (2, 1, 1)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_any_order_with_repeats_beyond_window_matches_rebuild(seed):
+    import random
+
+    rng = random.Random(seed)
+    pool = [D + timedelta(days=rng.randrange(900)) for _ in range(30)]
+    active = [rng.choice(pool) for _ in range(80)]
+    recorded = set()
+
+    def lookup(start, end):
+        # What the year bitmaps hold: every day recorded so far
+        return {day for day in recorded if start <= day <= end}
+
+    state = StreakState()
+    for day in active:
+        if state.record(day, lookup):
+            recorded.add(day)
+    expected = rebuild(active)
+    assert (state.current, state.longest, state.active_days, state.last_day) == \
+        (expected.current, expected.longest, expected.active_days, expected.last_day)
+
+
+def test_year_bitmap_counts_and_runs():
+    active = days(0, 1, 2, 4, 5) + [date(2024, 12, 31), date(2024, 1, 1)]
+    bits = year_bitmaps(active)[2024]
+    assert active_count(bits) == 7
+    assert longest_run(bits) == brute_force(active)[1] == 3
+    # Leap day 366 is the last bit
+    assert active_dates(2024, bits) == sorted(active)
+
+
+def test_local_day_uses_timezone():
+    moment = datetime(2024, 3, 10, 2, 30, tzinfo=timezone.utc)
+    assert local_day(moment, parse_timezone("America/New_York")) == date(2024, 3, 9)
+    assert local_day(moment, parse_timezone("Asia/Tokyo")) == date(2024, 3, 10)
+    with pytest.raises(ValueError):
+        parse_timezone("Mars/Olympus_Mons")
+
+
+def post_entry(client, user_id, created_at=None, tz=None):
+    body = {"user_id": user_id, "category_id": 1, "sub_emotion_id": 1, "text": "entry"}
+    if created_at:
+        body["created_at"] = created_at.isoformat()
+    if tz:
+        body["timezone"] = tz
+    return client.post("/api/journal/", json=body)
+
+
+def test_streak_endpoint_follows_entries(client):
+    now = datetime.now(timezone.utc)
+    for offset in (3, 2, 0):
+        assert post_entry(client, "user-1", now - timedelta(days=offset)).status_code == 200
+    # Back-dated import fills the gap
+    assert post_entry(client, "user-1", now - timedelta(days=1)).status_code == 200
+
+    body = client.get("/api/user/streak", params={"user_id": "user-1", "days": 5}).json()
+    assert body["currentStreak"] == 4
+    assert body["longestStreak"] == 4
+    assert body["streakDays"] == 4
+    assert [d["hasEntry"] for d in body["streakHistory"]] == [False, True, True, True, True]
+    assert body["streakHistory"][-1]["date"] == now.date().isoformat()
+
+
+def test_repeated_old_day_counts_once_in_streak_days(client):
+    now = datetime.now(timezone.utc)
+    assert post_entry(client, "user-4", now).status_code == 200
+    for _ in range(3):
+        assert post_entry(client, "user-4", now - timedelta(days=500)).status_code == 200
+
+    body = client.get("/api/user/streak", params={"user_id": "user-4"}).json()
+    assert (body["streakDays"], body["currentStreak"], body["longestStreak"]) == (2, 1, 1)
+
+
+def test_timezone_is_stored_and_validated(client):
+    assert post_entry(client, "user-2", tz="Pacific/Kiritimati").status_code == 200
+    assert client.get("/api/user/streak", params={"user_id": "user-2"}).json()["timezone"] == "Pacific/Kiritimati"
+    assert post_entry(client, "user-2", tz="Nowhere/Special").status_code == 400
+
+
+def test_users_without_state_are_rebuilt_once(client, session_factory):
+    now = datetime.now(timezone.utc)
+    with session_factory() as db:
+        for i, offset in enumerate((0, 1, 2, 5)):
+            db.add(JournalEntry(id=f"legacy-{i}", user_id="legacy", category_id=1, sub_emotion_id=1,
+                                text="old", created_at=now - timedelta(days=offset)))
+        db.commit()
+
+    body = client.get("/api/user/streak", params={"user_id": "legacy"}).json()
+    assert (body["currentStreak"], body["longestStreak"], body["streakDays"]) == (3, 3, 4)
+    with session_factory() as db:
+        assert db.query(UserStreak).filter(UserStreak.user_id == "legacy").one().active_days == 4
+        assert sum(active_count(int.from_bytes(row.days, "little"))
+                   for row in db.query(ActivityYear).filter(ActivityYear.user_id == "legacy")) == 4
+
+
+def test_activity_year_follows_entries(client):
+    now = datetime.now(timezone.utc)
+    year = now.year
+    # Older than the streak window, so joining them reads the year bitmaps
+    entries = [datetime(year - 2, 12, 30, 12, tzinfo=timezone.utc), datetime(year - 2, 12, 31, 12, tzinfo=timezone.utc),
+               datetime(year - 1, 1, 1, 12, tzinfo=timezone.utc)]
+    for created_at in [now] + entries:
+        assert post_entry(client, "user-3", created_at).status_code == 200
+
+    body = client.get("/api/user/activity", params={"user_id": "user-3", "year": year - 2}).json()
+    assert body["activeDates"] == [f"{year - 2}-12-30", f"{year - 2}-12-31"]
+    assert (body["activeDays"], body["longestStreak"], body["timezone"]) == (2, 2, "UTC")
+
+    body = client.get("/api/user/activity", params={"user_id": "user-3"}).json()
+    assert (body["year"], body["activeDates"]) == (year, [now.date().isoformat()])
+    streak = client.get("/api/user/streak", params={"user_id": "user-3"}).json()
+    assert (streak["longestStreak"], streak["streakDays"]) == (3, 4)
+
+
+def test_activity_year_for_unknown_user_is_empty(client):
+    body = client.get("/api/user/activity", params={"user_id": "nobody", "year": 2024}).json()
+    assert (body["activeDays"], body["longestStreak"], body["activeDates"]) == (0, 0, [])
+
+
+def test_unknown_user_has_empty_streak(client):
+    body = client.get("/api/user/streak", params={"user_id": "nobody"}).json()
+    assert body["currentStreak"] == 0
+    assert body["lastCheckInDate"] is None
@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.models.db_models import EmotionCategory, JournalEntry, SubEmotion
+from app.services import insight_service, summary_service
+from app.services.journal_repository import JournalRepository
+
+NOW = datetime(2024, 3, 20, 12, 0)
+
+
+@pytest.fixture(autouse=True, scope="module")
+def seed(session_factory, base_rows):
+    with session_factory() as db:
+        db.add_all([
+            EmotionCategory(id=2, name="sad"),
+            SubEmotion(id=2, category_id=2, name="Lonely", intensity=4),
+        ])
+        db.flush()
+        entries = [
+            (1, 1, "Great walk in the park", 1),
+            (2, 2, "Missed my friends today", 2),
+            (3, 1, "Finished the project", 3),
+            (4, 99, "Category was deleted", 4),
+            (5, 1, "Too old to count", 10),
+        ]
+        for i, category_id, text, days_ago in entries:
+            db.add(JournalEntry(
+                id=f"entry-{i}", user_id="user-1", category_id=category_id, sub_emotion_id=1, text=text,
+                created_at=NOW - timedelta(days=days_ago), updated_at=NOW - timedelta(days=days_ago),
+            ))
+        db.commit()
+
+
+@pytest.fixture
+def db(session_factory):
+    with session_factory() as session:
+        yield session
+
+
+def test_summary_rows_is_one_joined_query(db, statements):
+    rows = JournalRepository(db).summary_rows("user-1", NOW - timedelta(days=7), NOW)
+    assert [(text, category) for _, text, category in rows] == [
+        ("Category was deleted", None),
+        ("Finished the project", "happy"),
+        ("Missed my friends today", "sad"),
+        ("Great walk in the park", "happy"),
+    ]
+    assert len(statements) == 1
+
+
+def test_analyze_entries_counts_uncategorized_in_denominator(db):
+    rows = JournalRepository(db).summary_rows("user-1", NOW - timedelta(days=7), NOW)
+    patterns, themes, mood_changes, texts = summary_service.analyze_entries(rows)
+    assert {(p.emotion, p.count, p.percentage) for p in patterns} == {("happy", 2, 50.0), ("sad", 1, 25.0)}
+    assert [c.emotion for c in mood_changes] == ["happy", "sad", "happy"]
+    assert len(texts) == 3
+    assert len(themes) <= 5
+
+
+@pytest.mark.asyncio
+async def test_weekly_summary_uses_insights(db, monkeypatch):
+    async def fake_insights(patterns, mood_changes, entries_text=None):
+        return f"{len(entries_text)} entries"
+    monkeypatch.setattr(summary_service, "generate_insights", fake_insights)
+
+    summary = await summary_service.build_weekly_summary(db, "user-1", end_date=NOW)
+    assert summary.isAI is True
+    assert summary.personalizedInsights == "3 entries"
+    assert summary.startDate == NOW - timedelta(days=7)
+
+
+@pytest.mark.asyncio
+async def test_no_connection_is_held_while_insights_are_generated(engine, db, monkeypatch):
+    checked_out = {"n": 0}
+    held = []
+
+    def checkout(*args):
+        checked_out["n"] += 1
+
+    def checkin(*args):
+        checked_out["n"] -= 1
+
+    async def fake_insights(patterns, mood_changes, entries_text=None):
+        held.append(checked_out["n"])
+        return "insights"
+
+    monkeypatch.setattr(summary_service, "generate_insights", fake_insights)
+    event.listen(engine, "checkout", checkout)
+    event.listen(engine, "checkin", checkin)
+    try:
+        await summary_service.build_weekly_summary(db, "user-1", end_date=NOW)
+    finally:
+        event.remove(engine, "checkout", checkout)
+        event.remove(engine, "checkin", checkin)
+    assert held == [0]
+
+
+@pytest.mark.asyncio
+async def test_weekly_summary_without_entries_returns_quote(db):
+    summary = await summary_service.build_weekly_summary(db, "nobody", end_date=NOW)
+    assert summary.isAI is False
+    assert summary.emotionalPatterns == []
+    assert any(summary.personalizedInsights.startswith(q) for q in summary_service.POSITIVE_QUOTES)
+
+
+def test_basic_insights_fallback():
+    patterns, _, mood_changes, _ = summary_service.analyze_entries([
+        (NOW, "a", "happy"), (NOW, "b", "happy"), (NOW, "c", "sad"),
+    ])
+    insights = insight_service.generate_basic_insights(patterns, mood_changes)
+    assert insights.startswith("Your dominant emotion this week was happy, appearing in 66.7%")
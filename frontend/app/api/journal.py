@@ -1,68 +1,70 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
-from app.models.journal import JournalEntry, JournalEntryCreate, JournalEntryUpdate
-from app.schemas.journal import JournalEntry as JournalEntryDB
-import uuid
-from datetime import datetime
+"""
+Journal routes, forwarded to the backend's ``/api/journal`` as they are.
+
+Request bodies and responses pass through untouched, so the backend's
+schemas (``userId``, ``categoryId``/``subEmotionId``, ...) are the only ones.
+"""
+from fastapi import APIRouter, Request, Response
+
+from app.services.backend_client import BackendResponse, backend, forwarded_headers
 
 router = APIRouter()
 
-@router.get("/", response_model=List[JournalEntry])
-async def get_journal_entries(
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100
-):
-    entries = db.query(JournalEntryDB).offset(skip).limit(limit).all()
-    return entries
-
-@router.get("/{entry_id}", response_model=JournalEntry)
-async def get_journal_entry(
-    entry_id: str,
-    db: Session = Depends(get_db)
-):
-    entry = db.query(JournalEntryDB).filter(JournalEntryDB.id == entry_id).first()
-    if entry is None:
-        raise HTTPException(status_code=404, detail="Journal entry not found")
-    return entry
-
-@router.post("/", response_model=JournalEntry)
-async def create_journal_entry(
-    entry: JournalEntryCreate,
-    db: Session = Depends(get_db)
-):
-    db_entry = JournalEntryDB(
-        id=str(uuid.uuid4()),
-        userId="user1",  # TODO: Get from auth
-        **entry.model_dump()
+BACKEND_PREFIX = "/api/journal"
+
+
+def to_response(result: BackendResponse) -> Response:
+    response = Response(content=result.content, status_code=result.status_code)
+    for name, value in result.headers:
+        # append, not set: the backend may send several Set-Cookie headers
+        response.headers.append(name, value)
+    return response
+
+
+def client_host(request: Request):
+    return request.client.host if request.client else None
+
+
+async def forward_get(request: Request, path: str) -> Response:
+    result = await backend.get(
+        BACKEND_PREFIX + path, params=dict(request.query_params),
+        headers=forwarded_headers(request.headers, client_host(request)),
     )
-    db.add(db_entry)
-    db.commit()
-    db.refresh(db_entry)
-    return db_entry
-
-@router.patch("/{entry_id}", response_model=JournalEntry)
-async def update_journal_entry(
-    entry_id: str,
-    update: JournalEntryUpdate,
-    db: Session = Depends(get_db)
-):
-    db_entry = db.query(JournalEntryDB).filter(JournalEntryDB.id == entry_id).first()
-    if db_entry is None:
-        raise HTTPException(status_code=404, detail="Journal entry not found")
-
-    # Add the new reflection
-    new_reflection = {
-        "prompt": update.promptText,
-        "response": update.reflectionText,
-        "timestamp": datetime.utcnow()
-    }
-    if not db_entry.reflections:
-        db_entry.reflections = []
-    db_entry.reflections.append(new_reflection)
-
-    db.commit()
-    db.refresh(db_entry)
-    return db_entry
+    return to_response(result)
+
+
+async def forward_write(request: Request, path: str) -> Response:
+    headers = forwarded_headers(request.headers, client_host(request))
+    headers["content-type"] = request.headers.get("content-type", "application/json")
+    result = await backend.write(request.method, BACKEND_PREFIX + path, await request.body(), headers=headers)
+    return to_response(result)
+
+
+@router.get("/")
+async def get_journal_entries(request: Request):
+    return await forward_get(request, "/")
+
+
+@router.post("/")
+async def create_journal_entry(request: Request):
+    return await forward_write(request, "/")
+
+
+@router.get("/weekly-summary")
+async def get_weekly_summary(request: Request):
+    return await forward_get(request, "/weekly-summary")
+
+
+@router.get("/user/{user_id}")
+async def get_user_journal_entries(user_id: str, request: Request):
+    return await forward_get(request, f"/user/{user_id}")
+
+
+@router.get("/{entry_id}")
+async def get_journal_entry(entry_id: str, request: Request):
+    return await forward_get(request, f"/{entry_id}")
+
+
+@router.patch("/{entry_id}")
+async def update_journal_entry(entry_id: str, request: Request):
+    return await forward_write(request, f"/{entry_id}")
@@ -1,9 +1,23 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.api import journal
+from app.services.backend_client import backend
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One keep-alive pool to the backend per process; no database connections here
+    await backend.start()
+    try:
+        yield
+    finally:
+        await backend.close()
+
 
 app = FastAPI(
+    lifespan=lifespan,
     title="Feelora API",
     description="Backend API for Feelora emotion tracking application",
     version="1.0.0"
@@ -0,0 +1,178 @@
+"""
+Pooled async client for the backend API.
+
+This service keeps no database of its own: every read and write goes to the
+backend, which owns the schema, the connection pool and the caches. One
+``httpx.AsyncClient`` per process keeps connections to the backend alive.
+Identical GETs that arrive while one is in flight share its response
+(request coalescing), and successful GETs are answered from memory for
+``BACKEND_CACHE_TTL_SECONDS``. Any write clears that cache, so a client
+never reads its own write back stale from here.
+
+Cookies go through both ways, so the backend's read-your-writes pin
+(``db_primary_until``) reaches the browser and comes back on later reads.
+The caller's address is appended to ``X-Forwarded-For`` for the backend's
+rate limiter. A backend that cannot be reached answers 502, one that does not
+answer in time 504.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Tuple
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Request headers passed through to the backend; they are also part of the cache key
+FORWARDED_HEADERS = ("authorization", "x-user-id", "x-request-id", "if-none-match", "cookie", "x-forwarded-for")
+# Caller-specific but not response-shaping, so left out of the cache key
+UNKEYED_HEADERS = ("x-request-id", "x-forwarded-for")
+# Response headers passed back to the caller
+RETURNED_HEADERS = ("content-type", "etag", "cache-control", "retry-after", "set-cookie")
+
+
+@dataclass(frozen=True)
+class BackendResponse:
+    status_code: int
+    content: bytes
+    headers: Tuple[Tuple[str, str], ...]
+
+
+def forwarded_headers(headers: Mapping[str, str], client_host: Optional[str] = None) -> Dict[str, str]:
+    """Headers for the backend request, with ``client_host`` appended to ``X-Forwarded-For``."""
+    forwarded = {name: headers[name] for name in FORWARDED_HEADERS if name in headers}
+    if client_host:
+        chain = forwarded.get("x-forwarded-for")
+        forwarded["x-forwarded-for"] = f"{chain}, {client_host}" if chain else client_host
+    return forwarded
+
+
+def error_response(status_code: int, detail: str) -> BackendResponse:
+    return BackendResponse(
+        status_code=status_code,
+        content=b'{"detail":"%s"}' % detail.encode(),
+        headers=(("content-type", "application/json"),),
+    )
+
+
+class BackendClient:
+    def __init__(self, base_url: str, timeout: float, max_connections: int,
+                 cache_ttl: float, cache_entries: int,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.cache_ttl = cache_ttl
+        self.cache_entries = cache_entries
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._cache: "OrderedDict[tuple, Tuple[float, BackendResponse]]" = OrderedDict()
+        self._in_flight: Dict[tuple, asyncio.Task] = {}
+        # Bumped by every write; a GET that started before a write must not repopulate the cache
+        self._generation = 0
+
+    async def start(self):
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.max_connections,
+                                max_keepalive_connections=self.max_connections),
+            transport=self.transport,
+        )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._cache.clear()
+
+    async def _send(self, method: str, path: str, params=None, content: Optional[bytes] = None,
+                    headers: Optional[Dict[str, str]] = None) -> BackendResponse:
+        try:
+            response = await self._client.request(method, path, params=params, content=content, headers=headers)
+        except httpx.TimeoutException as e:
+            logger.warning("Backend %s %s timed out: %r", method, path, e)
+            return error_response(504, "Backend timed out")
+        except httpx.TransportError as e:
+            logger.warning("Backend %s %s unreachable: %r", method, path, e)
+            return error_response(502, "Backend unavailable")
+        return BackendResponse(
+            status_code=response.status_code,
+            content=response.content,
+            # multi_items keeps repeated headers (several Set-Cookie) apart
+            headers=tuple((name, value) for name, value in response.headers.multi_items() if name in RETURNED_HEADERS),
+        )
+
+    def _cached(self, key: tuple) -> Optional[BackendResponse]:
+        hit = self._cache.get(key)
+        if hit is None:
+            return None
+        expires, response = hit
+        if expires <= time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return response
+
+    def _store(self, key: tuple, generation: int, response: BackendResponse):
+        if self.cache_ttl <= 0 or response.status_code != 200 or generation != self._generation:
+            return
+        # A cookie set for one caller is never replayed to another
+        if any(name == "set-cookie" for name, _ in response.headers):
+            return
+        self._cache[key] = (time.monotonic() + self.cache_ttl, response)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_entries:
+            self._cache.popitem(last=False)
+
+    async def get(self, path: str, params: Optional[Mapping[str, str]] = None,
+                  headers: Optional[Dict[str, str]] = None) -> BackendResponse:
+        headers = headers or {}
+        key = (
+            path,
+            tuple(sorted((params or {}).items())),
+            tuple(sorted((k, v) for k, v in headers.items() if k not in UNKEYED_HEADERS)),
+        )
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._send("GET", path, params=params, headers=headers))
+            self._in_flight[key] = task
+
+            def finished(done: asyncio.Task, key=key, generation=self._generation):
+                if self._in_flight.get(key) is done:
+                    del self._in_flight[key]
+                if not done.cancelled() and done.exception() is None:
+                    self._store(key, generation, done.result())
+
+            task.add_done_callback(finished)
+        # One caller disconnecting must not cancel the request the others are waiting on
+        return await asyncio.shield(task)
+
+    async def write(self, method: str, path: str, content: bytes,
+                    headers: Optional[Dict[str, str]] = None) -> BackendResponse:
+        try:
+            return await self._send(method, path, content=content, headers=headers)
+        finally:
+            # Cached and in-flight reads may predate what was just written; drop them
+            # all rather than work out which ones, the TTL is short anyway
+            self._generation += 1
+            self._cache.clear()
+            self._in_flight.clear()
+
+
+backend = BackendClient(
+    base_url=settings.BACKEND_URL,
+    timeout=settings.BACKEND_TIMEOUT_SECONDS,
+    max_connections=settings.BACKEND_MAX_CONNECTIONS,
+    cache_ttl=settings.BACKEND_CACHE_TTL_SECONDS,
+    cache_entries=settings.BACKEND_CACHE_ENTRIES,
+)
@@ -0,0 +1,166 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import journal
+from app.services.backend_client import BackendClient, forwarded_headers
+
+
+def make_client(handler, cache_ttl: float = 60.0) -> BackendClient:
+    return BackendClient(
+        base_url="http://backend", timeout=1.0, max_connections=10,
+        cache_ttl=cache_ttl, cache_entries=100, transport=httpx.MockTransport(handler),
+    )
+
+
+def run(client: BackendClient, work):
+    async def main():
+        await client.start()
+        try:
+            return await work()
+        finally:
+            await client.close()
+
+    return asyncio.run(main())
+
+
+def test_concurrent_identical_gets_share_one_request():
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=[1])
+
+    client = make_client(handler, cache_ttl=0)
+    results = run(client, lambda: asyncio.gather(*(client.get("/api/journal/", headers={"x-user-id": "u1"}) for _ in range(5))))
+    assert len(calls) == 1
+    assert {r.content for r in results} == {b"[1]"}
+
+
+def test_gets_are_cached_per_caller_until_the_ttl():
+    calls = []
+
+    def handler(request):
+        calls.append(request.headers.get("cookie"))
+        return httpx.Response(200, json=len(calls))
+
+    client = make_client(handler, cache_ttl=0.05)
+
+    async def work():
+        first = await client.get("/api/journal/", headers={"cookie": "a=1"})
+        again = await client.get("/api/journal/", headers={"cookie": "a=1"})
+        # A different cookie (e.g. a fresh db_primary_until pin) is a different entry
+        pinned = await client.get("/api/journal/", headers={"cookie": "db_primary_until=9"})
+        await asyncio.sleep(0.06)
+        expired = await client.get("/api/journal/", headers={"cookie": "a=1"})
+        return first, again, pinned, expired
+
+    first, again, pinned, expired = run(client, work)
+    assert first.content == again.content == b"1"
+    assert pinned.content == b"2" and expired.content == b"3"
+    assert calls == ["a=1", "db_primary_until=9", "a=1"]
+
+
+def test_a_write_keeps_earlier_reads_out_of_the_cache():
+    release = asyncio.Event()
+    calls = []
+
+    async def handler(request):
+        calls.append(request.method)
+        if request.method == "GET" and len(calls) == 1:
+            # This read started before the write below and returns the old state
+            await release.wait()
+            return httpx.Response(200, json="old")
+        return httpx.Response(200, json="new")
+
+    client = make_client(handler)
+
+    async def work():
+        stale = asyncio.ensure_future(client.get("/api/journal/"))
+        await asyncio.sleep(0.01)
+        await client.write("POST", "/api/journal/", b"{}")
+        release.set()
+        await stale
+        return await client.get("/api/journal/")
+
+    assert run(client, work).content == b'"new"'
+    assert calls == ["GET", "POST", "GET"]
+
+
+def test_responses_setting_cookies_are_not_cached():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json=[], headers={"set-cookie": "db_primary_until=1; Path=/"})
+
+    client = make_client(handler)
+
+    async def work():
+        await client.get("/api/journal/")
+        await client.get("/api/journal/")
+
+    run(client, work)
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("error, status", [
+    (httpx.ConnectError("connection refused"), 502),
+    (httpx.ReadTimeout("timed out"), 504),
+    (httpx.ConnectTimeout("timed out"), 504),
+])
+def test_backend_failures_map_to_gateway_errors(error, status):
+    def handler(request):
+        raise error
+
+    client = make_client(handler)
+    read = run(client, lambda: client.get("/api/journal/"))
+    written = run(client, lambda: client.write("POST", "/api/journal/", b"{}"))
+    assert read.status_code == written.status_code == status
+    assert dict(read.headers)["content-type"] == "application/json"
+
+
+def test_client_address_is_appended_to_forwarded_for():
+    assert forwarded_headers({}, "203.0.113.7")["x-forwarded-for"] == "203.0.113.7"
+    headers = forwarded_headers({"x-forwarded-for": "198.51.100.1"}, "203.0.113.7")
+    assert headers["x-forwarded-for"] == "198.51.100.1, 203.0.113.7"
+
+
+def test_cookies_pass_through_both_ways(monkeypatch):
+    seen = []
+
+    def handler(request):
+        seen.append((request.headers.get("cookie"), request.headers.get("x-forwarded-for")))
+        return httpx.Response(201, json={"id": "e1"}, headers=[
+            ("set-cookie", "db_primary_until=123.000; Max-Age=6; Path=/; HttpOnly; SameSite=Lax"),
+            ("set-cookie", "other=1; Path=/"),
+        ])
+
+    client = make_client(handler)
+    monkeypatch.setattr(journal, "backend", client)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        await client.start()
+        yield
+        await client.close()
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(journal.router, prefix="/api/journal")
+
+    async def from_peer(scope, receive, send):
+        await app({**scope, "client": ("203.0.113.7", 50000)}, receive, send)
+
+    with TestClient(from_peer) as http:
+        response = http.post("/api/journal/", json={"text": "hi"}, headers={"cookie": "session=abc"})
+
+    assert response.status_code == 201
+    assert response.headers.get_list("set-cookie") == [
+        "db_primary_until=123.000; Max-Age=6; Path=/; HttpOnly; SameSite=Lax", "other=1; Path=/",
+    ]
+    assert seen == [("session=abc", "203.0.113.7")]
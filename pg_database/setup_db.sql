@@ -1,3 +1,7 @@
+-- Legacy bootstrap script. The schema is now owned by the Alembic migrations
+-- in backend/migrations (`alembic upgrade head`); this file matches revision
+-- 0001_baseline. Databases created from it: `alembic stamp 0001_baseline`.
+
 -- Drop the database if it exists
 DROP DATABASE IF EXISTS journal-ai;
 